@@ -1,80 +1,190 @@
 import ast
 import re
+from source import parse_source, UnitCache
+from records import AnalysisStats
+
+# Bump whenever analysis output changes so cached scans are invalidated
+ANALYZER_VERSION = "15.4.0"
+
+# Structure histogram (node_counts): AST node class name -> category.
+# Names, constants, operators and contexts aren't counted.
+NODE_CATEGORIES = {
+    "Control Flow": ("If", "For", "AsyncFor", "While", "Try", "TryStar", "With", "AsyncWith", "Match",
+                     "Return", "Break", "Continue", "Raise", "Assert", "IfExp"),
+    "Definitions": ("FunctionDef", "AsyncFunctionDef", "ClassDef", "Lambda", "Import", "ImportFrom",
+                    "Global", "Nonlocal"),
+    "Data Ops": ("Assign", "AugAssign", "AnnAssign", "NamedExpr", "Delete", "Subscript", "Slice", "Starred",
+                 "List", "Tuple", "Dict", "Set", "BinOp", "UnaryOp", "BoolOp", "Compare"),
+    "Calls": ("Call",),
+    "Comprehensions": ("ListComp", "SetComp", "DictComp", "GeneratorExp"),
+}
+NODE_CATEGORY = {name: category for category, names in NODE_CATEGORIES.items() for name in names}
+
+def empty_node_counts():
+    return dict.fromkeys(NODE_CATEGORIES, 0)
 
 class StructuralAnalyzer(ast.NodeVisitor):
+    _plans = {}
+
     def __init__(self):
-        self.stats = {
-            "loops": 0,
-            "functions": 0,
-            "max_nesting": 0,
-            "complexity": 1, 
-            "dead_code": 0,
-            "long_functions": [],
-            "issues": [],
-            "big_o": "O(1)" 
-        }
+        self.stats = AnalysisStats(node_counts=empty_node_counts())
         self.current_depth = 0
+        # One [qualified_name, loop_depth] frame per function being visited
+        self.loop_stack = [["<module>", 0]]
+        # Enclosing (qualified_name, is_function) per class/function, for __qualname__-style keys
+        self.scopes = []
+
+    def visit(self, node):
+        # Every node passes through here once, so the histograms ride on the existing traversal.
+        # (handler, category) is resolved once per node class instead of per node.
+        plan = self._plans.get(node.__class__)
+        if plan is None:
+            name = node.__class__.__name__
+            plan = self._plans[node.__class__] = (getattr(type(self), "visit_" + name, None), NODE_CATEGORY.get(name))
+        handler, category = plan
+        if category:
+            self.stats.node_counts[category] += 1
+            scope = self.loop_stack[-1][0]
+            if scope != "<module>":
+                counts = self.stats.function_nodes.get(scope)
+                if counts is None:
+                    counts = self.stats.function_nodes[scope] = empty_node_counts()
+                counts[category] += 1
+        if handler is None:
+            return self.generic_visit(node)
+        return handler(self, node)
+
+    def qualify(self, name):
+        """Python-style qualified name: Class.method, outer.<locals>.inner."""
+        if not self.scopes:
+            return name
+        parent, is_function = self.scopes[-1]
+        return f"{parent}.<locals>.{name}" if is_function else f"{parent}.{name}"
 
     def visit_FunctionDef(self, node):
-        self.stats["functions"] += 1
+        self.stats.functions += 1
         length = node.end_lineno - node.lineno
         if length > 25:
-            self.stats["long_functions"].append(node.name)
-            self.stats["issues"].append(f"Function '{node.name}' is too long ({length} lines).")
+            self.stats.long_functions.append(node.name)
+            self.stats.issues.append(f"Function '{node.name}' is too long ({length} lines).")
+        qualname = self.qualify(node.name)
+        self.scopes.append((qualname, True))
+        self.loop_stack.append([qualname, 0])
+        self.generic_visit(node)
+        self.loop_stack.pop()
+        self.scopes.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        # Class bodies aren't loop scopes; they only prefix the names of their methods
+        self.scopes.append((self.qualify(node.name), False))
         self.generic_visit(node)
+        self.scopes.pop()
 
     def visit_If(self, node):
-        self.stats["complexity"] += 1
+        self.stats.complexity += 1
         self.increment_nesting(node)
 
     def visit_For(self, node):
-        self.stats["loops"] += 1
-        self.stats["complexity"] += 1
+        self.stats.loops += 1
+        self.stats.complexity += 1
         # Anti-pattern check: range(len())
         if isinstance(node.iter, ast.Call):
             if isinstance(node.iter.func, ast.Name) and node.iter.func.id == 'range':
                 if node.iter.args and isinstance(node.iter.args[0], ast.Call):
                     if isinstance(node.iter.args[0].func, ast.Name) and node.iter.args[0].func.id == 'len':
-                        self.stats["issues"].append("Anti-pattern: Use 'enumerate()' instead of 'range(len())'.")
-        self.increment_nesting(node)
+                        self.stats.issues.append("Anti-pattern: Use 'enumerate()' instead of 'range(len())'.")
+        self.enter_loop(node)
+
+    visit_AsyncFor = visit_For
 
     def visit_While(self, node):
-        self.stats["loops"] += 1
-        self.stats["complexity"] += 1
+        self.stats.loops += 1
+        self.stats.complexity += 1
+        self.enter_loop(node)
+
+    def enter_loop(self, node):
+        frame = self.loop_stack[-1]
+        frame[1] += 1
+        depth = frame[1]
+        if depth > self.stats.loop_depths.get(frame[0], 0):
+            self.stats.loop_depths[frame[0]] = depth
+        if depth > self.stats.max_loop_depth:
+            self.stats.max_loop_depth = depth
         self.increment_nesting(node)
+        frame[1] -= 1
 
     def increment_nesting(self, node):
         self.current_depth += 1
-        if self.current_depth > self.stats["max_nesting"]:
-            self.stats["max_nesting"] = self.current_depth
+        if self.current_depth > self.stats.max_nesting:
+            self.stats.max_nesting = self.current_depth
         self.generic_visit(node)
         self.current_depth -= 1
 
+# Per-function/class stats keyed by source fingerprint (see ParsedSource.units)
+_unit_cache = UnitCache()
+
+def unit_stats(node):
+    """Stats contributed by one top-level unit; complexity is the increment, not a base of 1."""
+    analyzer = StructuralAnalyzer()
+    analyzer.stats.complexity = 0
+    analyzer.visit(node)
+    return analyzer.stats
+
+def merge_stats(stats, unit):
+    """Folds a cached unit's stats into the file-level totals without touching the cached record."""
+    stats.loops += unit.loops
+    stats.functions += unit.functions
+    stats.complexity += unit.complexity
+    stats.max_nesting = max(stats.max_nesting, unit.max_nesting)
+    stats.max_loop_depth = max(stats.max_loop_depth, unit.max_loop_depth)
+    stats.long_functions.extend(unit.long_functions)
+    stats.issues.extend(unit.issues)
+    for name, depth in unit.loop_depths.items():
+        if depth > stats.loop_depths.get(name, 0):
+            stats.loop_depths[name] = depth
+    for category, count in unit.node_counts.items():
+        stats.node_counts[category] += count
+    for name, counts in unit.function_nodes.items():
+        merged = stats.function_nodes.setdefault(name, empty_node_counts())
+        for category, count in counts.items():
+            merged[category] += count
+
+def big_o_label(depth):
+    """Maps a loop nesting depth to its polynomial Big-O label."""
+    if depth == 0: return "O(1)"
+    if depth == 1: return "O(n)"
+    if depth == 2: return "O(n²)"
+    if depth == 3: return "O(n³)"
+    return f"O(n^{depth})"
+
 def analyze_logic(code):
+    """Accepts raw code or a ParsedSource (parsed once and shared across layers)."""
+    source = parse_source(code)
+    code = source.code
     try:
-        tree = ast.parse(code)
+        if source.syntax_error:
+            raise source.syntax_error
         
-        # 1. Big O Estimation Logic
-        loops = 0
-        nested_loops = 0
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.For, ast.While)):
-                loops += 1
-                for child in ast.iter_child_nodes(node):
-                    if any(isinstance(n, (ast.For, ast.While)) for n in ast.walk(child)):
-                        nested_loops += 1
-
-        if nested_loops > 0: big_o = "O(n²)"
-        elif loops > 0: big_o = "O(n)"
-        else: big_o = "O(1)"
-
-        # 2. Run the Structural Analyzer
+        # 1. Run the Structural Analyzer (loop depth is tracked in the same pass).
+        # Unchanged functions/classes reuse their cached stats; only edited units are re-visited.
         analyzer = StructuralAnalyzer()
-        analyzer.visit(tree)
-        analyzer.stats["big_o"] = big_o 
+        for node, fingerprint in source.units:
+            if fingerprint is None:
+                analyzer.visit(node)
+            else:
+                merge_stats(analyzer.stats, _unit_cache.get_or_compute(fingerprint, lambda: unit_stats(node)))
+
+        # 2. Big O Estimation Logic
+        analyzer.stats.big_o = big_o_label(analyzer.stats.max_loop_depth)
+        analyzer.stats.deepest_functions = sorted(
+            name for name, depth in analyzer.stats.loop_depths.items()
+            if depth == analyzer.stats.max_loop_depth and depth > 0
+        )
 
         # 3. Dead Code Detection
-        lines = code.splitlines()
+        lines = source.lines
         for i, line in enumerate(lines):
             stripped = line.strip()
             if stripped.startswith(("return", "continue", "break")):
@@ -82,8 +192,8 @@ def analyze_logic(code):
                     current_indent = len(line) - len(line.lstrip())
                     next_indent = len(lines[i+1]) - len(lines[i+1].lstrip())
                     if current_indent == next_indent:
-                        analyzer.stats["dead_code"] += 1
-                        analyzer.stats["issues"].append(f"Potential dead code detected near line {i+2}.")
+                        analyzer.stats.dead_code += 1
+                        analyzer.stats.issues.append(f"Potential dead code detected near line {i+2}.")
 
         # 4. Neural Origin Detection (AI vs Human)
         ai_score = 0
@@ -94,29 +204,29 @@ def analyze_logic(code):
         if "result =" in code or "data =" in code:
             ai_score += 15
             origin_reasons.append("Standardized variable naming")
-        if analyzer.stats["functions"] > 0 and len(lines) / analyzer.stats["functions"] < 15:
+        if analyzer.stats.functions > 0 and len(lines) / analyzer.stats.functions < 15:
             ai_score += 25
             origin_reasons.append("High modularity (AI Pattern)")
 
-        analyzer.stats["ai_probability"] = min(ai_score, 95)
-        analyzer.stats["human_probability"] = 100 - analyzer.stats["ai_probability"]
-        analyzer.stats["origin_reasons"] = origin_reasons
+        analyzer.stats.ai_probability = min(ai_score, 95)
+        analyzer.stats.human_probability = 100 - analyzer.stats.ai_probability
+        analyzer.stats.origin_reasons = origin_reasons
 
         # 5. Final Health & Labels
         health = 100
-        health -= (analyzer.stats["max_nesting"] * 5)
-        health -= (len(analyzer.stats["long_functions"]) * 10)
-        health -= (analyzer.stats["dead_code"] * 15)
-        analyzer.stats["health"] = max(0, min(100, health))
+        health -= (analyzer.stats.max_nesting * 5)
+        health -= (len(analyzer.stats.long_functions) * 10)
+        health -= (analyzer.stats.dead_code * 15)
+        analyzer.stats.health = max(0, min(100, health))
         
-        comp = analyzer.stats["complexity"]
-        if comp < 5: analyzer.stats["complexity_label"] = "Low"
-        elif comp < 10: analyzer.stats["complexity_label"] = "Moderate"
-        else: analyzer.stats["complexity_label"] = "High"
+        comp = analyzer.stats.complexity
+        if comp < 5: analyzer.stats.complexity_label = "Low"
+        elif comp < 10: analyzer.stats.complexity_label = "Moderate"
+        else: analyzer.stats.complexity_label = "High"
 
         return analyzer.stats 
 
     except SyntaxError as e:
-        return {"error": f"Syntax Error at line {e.lineno}: {e.msg}", "health": 0}
+        return AnalysisStats(error=f"Syntax Error at line {e.lineno}: {e.msg}", health=0)
     except Exception as e:
-        return {"error": str(e), "health": 0}
\ No newline at end of file
+        return AnalysisStats(error=str(e), health=0)
\ No newline at end of file
@@ -0,0 +1,225 @@
+"""
+Hot-loop performance anti-patterns, registered into the shared rule traversal (rules.py).
+Every finding is pinned to a line and carries a cost estimate:
+  impact   "asymptotic" (changes the growth class) or "constant" (same class, slower constant)
+  cost     human-readable estimate, e.g. "O(n) per iteration → O(n²) overall"
+  penalty  efficiency points it costs in calculate_score
+"""
+import ast
+
+from rules import rule, run_rules, LOOP_NODES
+
+CATEGORY = "performance"
+
+# Total efficiency points anti-patterns can cost, and the cap per rule (repeats add up to it)
+MAX_PENALTY = 60
+RULE_PENALTY_CAP = 25
+
+REGEX_FUNCS = ("compile",)
+SEQUENCE_BUILDERS = ("list", "sorted")
+
+def _finding(message, impact, cost, penalty, ctx):
+    # Nested loops multiply the damage of anything in the innermost body
+    scale = max(1, ctx.loop_depth)
+    return {
+        "message": f"⚡ **Performance:** {message} — est. cost: {cost}.",
+        "impact": impact,
+        "cost": cost,
+        "penalty": penalty * scale
+    }
+
+def _call_name(node):
+    """'name' for name(...), 'attr' for obj.attr(...), else None."""
+    if not isinstance(node, ast.Call):
+        return None
+    if isinstance(node.func, ast.Name):
+        return node.func.id
+    if isinstance(node.func, ast.Attribute):
+        return node.func.attr
+    return None
+
+def _is_str_expr(node):
+    return (
+        isinstance(node, ast.JoinedStr)
+        or isinstance(node, ast.Constant) and isinstance(node.value, str)
+        or isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "str"
+        or isinstance(node, ast.BinOp) and (_is_str_expr(node.left) or _is_str_expr(node.right))
+    )
+
+def _is_list_expr(node):
+    return (
+        isinstance(node, (ast.List, ast.ListComp))
+        or isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in SEQUENCE_BUILDERS
+    )
+
+def _known(ctx, kind):
+    return ctx.state.setdefault(kind, set())
+
+# --- Lightweight local type tracking (assignments are visited before the loops that use them) ---
+
+@rule("track-types", (ast.Assign, ast.AnnAssign), priority=0, category=CATEGORY)
+def _track_assignments(node, ctx):
+    targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+    value = node.value
+    for target in targets:
+        if not isinstance(target, ast.Name) or value is None:
+            continue
+        # Self-referencing rebuilds (s = s + x) keep their type
+        if isinstance(value, ast.BinOp) and isinstance(value.left, ast.Name) and value.left.id == target.id:
+            continue
+        for kind, matches in (("lists", _is_list_expr), ("strs", _is_str_expr)):
+            if matches(value):
+                _known(ctx, kind).add(target.id)
+            else:
+                _known(ctx, kind).discard(target.id)
+    return False
+
+@rule("track-params", (ast.FunctionDef, ast.AsyncFunctionDef), priority=0, category=CATEGORY)
+def _track_params(node, ctx):
+    for arg in node.args.posonlyargs + node.args.args + node.args.kwonlyargs:
+        if arg.annotation is None:
+            continue
+        annotation = ast.unparse(arg.annotation).lower()
+        if annotation.startswith("list"):
+            _known(ctx, "lists").add(arg.arg)
+        elif annotation == "str":
+            _known(ctx, "strs").add(arg.arg)
+    return False
+
+# --- Asymptotic anti-patterns ---
+
+@rule("string-concat-loop", ast.AugAssign, priority=85, category=CATEGORY)
+def _string_concat_in_loop(node, ctx):
+    if ctx.loop_depth == 0 or not isinstance(node.op, ast.Add) or not isinstance(node.target, ast.Name):
+        return False
+    if node.target.id in _known(ctx, "strs") or _is_str_expr(node.value):
+        return _finding(f"String `{node.target.id} +=` inside a loop copies the whole string each time; "
+                        "collect parts in a list and `''.join()` them",
+                        "asymptotic", "O(n) per iteration → O(n²) overall", 10, ctx)
+    return False
+
+@rule("quadratic-rebuild", ast.Assign, priority=85, category=CATEGORY)
+def _rebuild_in_loop(node, ctx):
+    # x = x + [...] / s = s + "..." builds a brand-new object every iteration
+    if ctx.loop_depth == 0 or len(node.targets) != 1 or not isinstance(node.targets[0], ast.Name):
+        return False
+    name, value = node.targets[0].id, node.value
+    if not (isinstance(value, ast.BinOp) and isinstance(value.op, ast.Add)
+            and isinstance(value.left, ast.Name) and value.left.id == name):
+        return False
+    if name in _known(ctx, "strs") or _is_str_expr(value.right):
+        fix = "collect parts in a list and `''.join()` them"
+    elif name in _known(ctx, "lists") or _is_list_expr(value.right):
+        fix = f"use `{name}.append()` / `{name}.extend()` (amortized O(1) per item)"
+    else:
+        return False
+    return _finding(f"`{name} = {name} + ...` inside a loop rebuilds the whole sequence; {fix}",
+                    "asymptotic", "O(n) per iteration → O(n²) overall", 10, ctx)
+
+@rule("sum-concat", ast.Call, priority=80, category=CATEGORY)
+def _sum_of_lists(node, ctx):
+    if _call_name(node) == "sum" and len(node.args) == 2 and isinstance(node.args[1], ast.List):
+        return _finding("`sum(lists, [])` concatenates pairwise; use `itertools.chain.from_iterable()`",
+                        "asymptotic", "O(n²) in the total item count", 10, ctx)
+    return False
+
+@rule("list-pop-front", ast.Call, priority=85, category=CATEGORY)
+def _pop_front(node, ctx):
+    if ctx.loop_depth == 0 or not isinstance(node.func, ast.Attribute) or not node.args:
+        return False
+    first = node.args[0]
+    front = isinstance(first, ast.Constant) and first.value == 0
+    if node.func.attr == "pop" and front and len(node.args) == 1:
+        op = "pop(0)"
+    elif node.func.attr == "insert" and front and len(node.args) == 2:
+        op = "insert(0, …)"
+    else:
+        return False
+    return _finding(f"`list.{op}` inside a loop shifts every element; use `collections.deque` "
+                    "(`popleft()` / `appendleft()`)",
+                    "asymptotic", "O(n) per iteration → O(n²) overall", 12, ctx)
+
+@rule("list-membership-loop", ast.Compare, priority=80, category=CATEGORY)
+def _membership_in_loop(node, ctx):
+    if ctx.loop_depth == 0:
+        return False
+    for op, comparator in zip(node.ops, node.comparators):
+        if not isinstance(op, (ast.In, ast.NotIn)):
+            continue
+        named_list = isinstance(comparator, ast.Name) and comparator.id in _known(ctx, "lists")
+        built_list = isinstance(comparator, ast.Call) and _call_name(comparator) in SEQUENCE_BUILDERS
+        if named_list or built_list:
+            target = comparator.id if named_list else f"{_call_name(comparator)}(…)"
+            return _finding(f"`in {target}` inside a loop scans the list every iteration; "
+                            "build a `set()` once before the loop",
+                            "asymptotic", "O(n) per check → O(n·m) overall", 10, ctx)
+    return False
+
+@rule("sort-in-loop", ast.Call, priority=80, category=CATEGORY)
+def _sort_in_loop(node, ctx):
+    if ctx.loop_depth == 0:
+        return False
+    name = _call_name(node)
+    if name == "sorted" and isinstance(node.func, ast.Name) or name == "sort" and isinstance(node.func, ast.Attribute):
+        return _finding(f"`{name}()` inside a loop re-sorts every iteration; sort once outside, "
+                        "or keep order with `bisect.insort` / `heapq`",
+                        "asymptotic", "O(n log n) per iteration → O(m·n log n) overall", 8, ctx)
+    return False
+
+# --- Constant-factor anti-patterns ---
+
+@rule("regex-compile-loop", ast.Call, priority=35, category=CATEGORY)
+def _regex_compile_in_loop(node, ctx):
+    func = node.func
+    if (ctx.loop_depth and isinstance(func, ast.Attribute) and func.attr in REGEX_FUNCS
+            and isinstance(func.value, ast.Name) and func.value.id == "re"):
+        return _finding("`re.compile()` inside a loop re-resolves the pattern each iteration; compile it once at module level",
+                        "constant", "pattern cache lookup (or full compile) per iteration", 3, ctx)
+    return False
+
+@rule("attribute-chain-loop", ast.Attribute, priority=30, category=CATEGORY)
+def _attribute_chain_in_loop(node, ctx):
+    # Only the outermost link of a.b.c is reported (inner links are Attribute values, not Loads of their own)
+    if ctx.loop_depth < 1 or not isinstance(node.ctx, ast.Load) or id(node) in _known(ctx, "chains"):
+        return False
+    depth, inner = 1, node.value
+    while isinstance(inner, ast.Attribute):
+        _known(ctx, "chains").add(id(inner))
+        depth, inner = depth + 1, inner.value
+    if depth < 2:
+        return False
+    return _finding(f"`{ast.unparse(node)}` is looked up on every iteration; bind it to a local before the loop",
+                    "constant", f"{depth} attribute lookups per iteration", 1, ctx)
+
+@rule("module-level-loop", LOOP_NODES, priority=30, category=CATEGORY)
+def _module_level_loop(node, ctx):
+    if ctx.function is None and ctx.loop_depth == 0:
+        return _finding("Loop at module level works on global variables (dict lookups on every access); "
+                        "move it into a function so names become fast locals",
+                        "constant", "global instead of local lookups per iteration", 3, ctx)
+    return False
+
+@rule("needless-copy", ast.Call, priority=30, category=CATEGORY)
+def _needless_copy(node, ctx):
+    if not (isinstance(node.func, ast.Name) and node.func.id == "list" and len(node.args) == 1):
+        return False
+    arg = node.args[0]
+    if isinstance(arg, (ast.List, ast.ListComp)) or _call_name(arg) in ("sorted", "list") and isinstance(arg.func, ast.Name):
+        return _finding("`list()` around a value that is already a fresh list makes a needless copy",
+                        "constant", "O(n) extra copy and allocation", 2, ctx)
+    return False
+
+def detect_antipatterns(code, findings=None):
+    """
+    Performance findings for a submission (ParsedSource or raw code), worst first.
+    Pass the scan's run_rules() output as `findings` to skip a second traversal.
+    """
+    findings = run_rules(code) if findings is None else findings
+    return [f for f in findings if f["category"] == CATEGORY and "penalty" in f]
+
+def efficiency_penalty(findings):
+    """Efficiency points lost to anti-patterns: summed per rule (capped), then overall (capped)."""
+    per_rule = {}
+    for finding in findings:
+        per_rule[finding["rule"]] = per_rule.get(finding["rule"], 0) + finding["penalty"]
+    return min(MAX_PENALTY, sum(min(RULE_PENALTY_CAP, p) for p in per_rule.values()))
@@ -0,0 +1,248 @@
+"""
+Performance benchmark and regression harness for the IntelliCodex engine itself.
+
+    python bench.py                         # run the suite, print a table
+    python bench.py --save baseline.json    # record a baseline
+    python bench.py --baseline baseline.json --threshold 0.25   # fail (exit 1) on regressions
+
+Every stage (parse, analyze_logic, detect_level, get_suggestions, calculate_score,
+run_behavioral_audit, generate_pdf_report) is timed separately per corpus item, cold
+(per-unit caches cleared before each run). Peak memory comes from a separate traced run,
+so tracing overhead never pollutes the timings.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Regressions below these absolute deltas are treated as noise
+MIN_DELTA_MS = 1.0
+MIN_DELTA_KB = 256
+
+SYNTHETIC_UNIT = '''
+def handler_{i}(items, limit={i}):
+    """Filters and scores one batch."""
+    total = 0
+    seen = []
+    for item in items:
+        if item > limit:
+            for other in items:
+                if other in seen:
+                    total += other
+        seen.append(item)
+    return total
+'''
+
+TWO_SUM = '''def two_sum(nums, target):
+    seen = {}
+    for i, n in enumerate(nums):
+        if target - n in seen:
+            return [seen[target - n], i]
+        seen[n] = i
+    return []
+'''
+
+def _synthetic(lines):
+    unit_lines = SYNTHETIC_UNIT.count("\n")
+    return "".join(SYNTHETIC_UNIT.format(i=i) for i in range(max(1, lines // unit_lines)))
+
+def _deeply_nested(depth=18):
+    # Just under CPython's 20 statically nested blocks
+    body = ["def nested(xs):", "    total = 0"]
+    for level in range(depth):
+        body.append("    " * (level + 1) + f"for v{level} in xs:")
+    body.append("    " * (depth + 1) + "total += 1")
+    body.append("    return total")
+    return "\n".join(body) + "\n"
+
+def _long_expression(terms=1500):
+    return "def chain(x):\n    return " + " + ".join("x" for _ in range(terms)) + "\n"
+
+def _many_tiny_functions(count=5000):
+    return "".join(f"def f{i}(x):\n    return x + {i}\n" for i in range(count))
+
+def _long_line(chars=50000):
+    return "def wide():\n    return [" + ", ".join(str(i) for i in range(chars // 7)) + "]\n"
+
+def build_corpus(quick=False):
+    """(name, code, run_behavioral) items from tiny to 50k lines, plus pathological shapes."""
+    corpus = [
+        ("tiny-two-sum", TWO_SUM, True),
+        ("synthetic-1k", _synthetic(1000), True),
+        ("synthetic-10k", _synthetic(10000), False),
+        ("deeply-nested", _deeply_nested(), False),
+        ("long-expression", _long_expression(), False),
+        ("many-tiny-functions", _many_tiny_functions(), False),
+        ("long-line", _long_line(), False),
+    ]
+    if not quick:
+        corpus.append(("synthetic-50k", _synthetic(50000), False))
+    # Real code: the engine's own modules
+    for path in sorted(glob.glob(os.path.join(HERE, "*.py")))[:2 if quick else None]:
+        with open(path, encoding="utf-8") as f:
+            corpus.append((f"real-{os.path.basename(path)}", f.read(), False))
+    return corpus
+
+def _clear_unit_caches():
+    import analyzer
+    import rules
+    analyzer._unit_cache.clear()
+    rules._unit_cache.clear()
+
+def _stages(include_pdf):
+    from source import parse_source
+    from analyzer import analyze_logic
+    from style_detector import detect_level
+    from suggestions import get_suggestions
+    from grader import calculate_score
+    from executor import run_behavioral_audit, generate_dynamic_test_cases
+
+    def prepared(code):
+        source = parse_source(code)
+        return source, analyze_logic(source)
+
+    stages = [
+        ("parse", lambda code, ctx: parse_source(code)),
+        ("analyze_logic", lambda code, ctx: analyze_logic(ctx["source"])),
+        ("detect_level", lambda code, ctx: detect_level(ctx["source"], ctx["analysis"])),
+        ("get_suggestions", lambda code, ctx: get_suggestions(ctx["source"])),
+        ("calculate_score", lambda code, ctx: calculate_score(ctx["source"], ctx["analysis"])),
+        ("run_behavioral_audit", lambda code, ctx: run_behavioral_audit(ctx["source"], ctx["tests"])),
+    ]
+    if include_pdf:
+        from report_gen import generate_pdf_report
+        stages.append(("generate_pdf_report", lambda code, ctx: generate_pdf_report(ctx["report"])))
+
+    def context(code):
+        source, analysis = prepared(code)
+        tests = generate_dynamic_test_cases(source, source.first_function() or "solve", stress=False)
+        report = {"accuracy": 80, "v_str": "MODEST", "complexity": "O(N)", "origin": analysis,
+                  "suggs": get_suggestions(source), "code": code}
+        return {"source": source, "analysis": analysis, "tests": tests, "report": report}
+    return stages, context
+
+def measure(call, repeat):
+    """Cold timings (ms) of `call` plus its traced peak allocation (KB)."""
+    samples = []
+    for _ in range(repeat):
+        _clear_unit_caches()
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    _clear_unit_caches()
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return samples, peak / 1024
+
+def run_suite(quick=False, repeat=None, include_pdf=None, only=None):
+    """Runs every stage over the corpus; returns {"meta": ..., "results": {"item:stage": stats}}."""
+    if include_pdf is None:
+        try:
+            import fpdf  # only probing whether the PDF stage can run
+            include_pdf = True
+        except ImportError:
+            include_pdf = False
+    repeat = repeat or (3 if quick else 5)
+    stages, context = _stages(include_pdf)
+    results = {}
+    for name, code, behavioral in build_corpus(quick):
+        if only and only not in name:
+            continue
+        lines = code.count("\n") + 1
+        ctx = context(code)
+        for stage, fn in stages:
+            if stage == "run_behavioral_audit" and not behavioral:
+                continue
+            try:
+                samples, peak_kb = measure(lambda: fn(code, ctx), repeat)
+            except Exception as e:
+                results[f"{name}:{stage}"] = {"lines": lines, "error": f"{type(e).__name__}: {e}"}
+                continue
+            median = statistics.median(samples)
+            results[f"{name}:{stage}"] = {
+                "lines": lines,
+                "median_ms": round(median, 3),
+                "min_ms": round(min(samples), 3),
+                "lines_per_s": round(lines / (median / 1000)) if median else None,
+                "peak_kb": round(peak_kb, 1)
+            }
+    return {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(),
+                 "platform": platform.platform(), "repeat": repeat, "quick": quick, "pdf": include_pdf},
+        "results": results
+    }
+
+def compare(current, baseline, threshold=0.2):
+    """Regressions where time or peak memory grew past threshold (and past the noise floor)."""
+    regressions = []
+    for key, now in current["results"].items():
+        before = baseline.get("results", {}).get(key)
+        if not before or "median_ms" not in now or "median_ms" not in before:
+            continue
+        if now["median_ms"] > before["median_ms"] * (1 + threshold) and \
+                now["median_ms"] - before["median_ms"] > MIN_DELTA_MS:
+            regressions.append((key, "time", before["median_ms"], now["median_ms"]))
+        if now["peak_kb"] > before["peak_kb"] * (1 + threshold) and now["peak_kb"] - before["peak_kb"] > MIN_DELTA_KB:
+            regressions.append((key, "memory", before["peak_kb"], now["peak_kb"]))
+    return regressions
+
+def print_table(report, baseline=None, out=sys.stdout):
+    rows = [("item:stage", "lines", "median ms", "lines/s", "peak KB", "vs base")]
+    for key, r in report["results"].items():
+        if "error" in r:
+            rows.append((key, str(r["lines"]), "ERROR", r["error"][:40], "", ""))
+            continue
+        before = (baseline or {}).get("results", {}).get(key, {})
+        delta = f"{(r['median_ms'] / before['median_ms'] - 1) * 100:+.0f}%" if before.get("median_ms") else ""
+        rows.append((key, str(r["lines"]), f"{r['median_ms']:.2f}", str(r["lines_per_s"] or ""), f"{r['peak_kb']:.0f}", delta))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        out.write("  ".join(cell.ljust(w) if i == 0 else cell.rjust(w) for i, (cell, w) in enumerate(zip(row, widths))) + "\n")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="bench", description="IntelliCodex engine benchmark and regression check.")
+    parser.add_argument("--quick", action="store_true", help="Smaller corpus (no 50k-line item) and fewer repeats.")
+    parser.add_argument("--repeat", type=int, default=None, help="Timed runs per stage (default 5, 3 with --quick).")
+    parser.add_argument("--only", help="Only corpus items whose name contains this text.")
+    parser.add_argument("--no-pdf", action="store_true", help="Skip the PDF stage even if fpdf is installed.")
+    parser.add_argument("--save", help="Write this run's results as a baseline JSON file.")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown / memory growth ratio (default 0.2 = 20%%).")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, HERE)
+    report = run_suite(quick=args.quick, repeat=args.repeat, include_pdf=False if args.no_pdf else None, only=args.only)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_table(report, baseline)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.save}", file=sys.stderr)
+
+    if baseline:
+        regressions = compare(report, baseline, args.threshold)
+        for key, kind, before, now in regressions:
+            unit = "ms" if kind == "time" else "KB"
+            print(f"REGRESSION {key} {kind}: {before:.2f}{unit} -> {now:.2f}{unit}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}.", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+
+from analyzer import ANALYZER_VERSION
+from records import Record, pack, unpack
+
+def normalize_source(code):
+    """Line endings and trailing whitespace don't change a scan, so they don't change the key."""
+    lines = code.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip("\n")
+
+def source_key(code, version=ANALYZER_VERSION, variant=""):
+    """
+    Content address of a submission: sha256 of normalized source + analyzer version.
+    `variant` separates results of differently configured scans of the same source.
+    """
+    digest = hashlib.sha256()
+    digest.update(version.encode())
+    digest.update(b"\0")
+    digest.update(variant.encode())
+    digest.update(b"\0")
+    digest.update(normalize_source(code).encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+class ScanCache:
+    """
+    Bounded in-memory LRU of full scan results, optionally backed by a sqlite
+    file so results survive restarts. Thread-safe; cached dicts are shared, so
+    callers must copy before mutating.
+    """
+    def __init__(self, max_entries=256, path=None):
+        self.max_entries = max_entries
+        self.path = path
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            # value holds records.pack() blobs (older files may still hold plain JSON text)
+            self._db.execute("CREATE TABLE IF NOT EXISTS scans (key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+            self._db.commit()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return value
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM scans WHERE key = ?", (key,)).fetchone()
+                if row:
+                    value = unpack(row[0])
+                    self._remember(key, value)
+                    self.stats["disk_hits"] += 1
+                    return value
+
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                try:
+                    payload = pack(value)
+                except (TypeError, ValueError):
+                    return
+                self._db.execute("INSERT OR REPLACE INTO scans (key, value) VALUES (?, ?)", (key, payload))
+                self._db.commit()
+
+    def get_or_compute(self, code, compute, variant=""):
+        """Returns the cached result for `code`, running `compute(code)` only on a miss."""
+        key = source_key(code, variant=variant)
+        value = self.get(key)
+        if value is None:
+            value = compute(code)
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM scans")
+                self._db.commit()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remember(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+def get_default_cache():
+    """
+    Process-wide cache shared by every Streamlit session.
+    INTELLICODEX_CACHE_PATH enables the sqlite spill file,
+    INTELLICODEX_CACHE_SIZE bounds the in-memory LRU.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ScanCache(
+                max_entries=int(os.environ.get("INTELLICODEX_CACHE_SIZE", 256)),
+                path=os.environ.get("INTELLICODEX_CACHE_PATH") or None,
+            )
+        return _default_cache
+
+def _sizeof(value, seen=None):
+    """Rough deep size in bytes of a JSON-like value (records, dicts, lists, tuples, scalars)."""
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_sizeof(k, seen) + _sizeof(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(_sizeof(v, seen) for v in value)
+    elif isinstance(value, Record):
+        # Slotted: getsizeof only counts the slot pointers, not what they hold
+        size += sum(_sizeof(getattr(value, name), seen) for name in value.field_names())
+    return size
+
+class ResultStore:
+    """
+    Process-wide store of finished scan results shared by every Streamlit session.
+    Sessions hold only a key: acquire() registers the session as a holder of the
+    entry, release() drops it. Entries plus their attached artifacts (rendered
+    reports) are kept under max_bytes; unheld entries are evicted first (LRU),
+    held ones only when that is not enough, so a session must cope with get()
+    returning None.
+    """
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._entries = OrderedDict()  # key -> {"value", "artifacts", "holders", "size"}
+        self._lock = threading.Lock()
+
+    def put(self, key, value, holder=None):
+        """Stores `value` under key unless an equal-keyed entry exists; returns the stored value."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {"value": value, "artifacts": {}, "holders": set(), "size": _sizeof(value)}
+                self._entries[key] = entry
+                self.bytes += entry["size"]
+            if holder is not None:
+                entry["holders"].add(holder)
+            self._entries.move_to_end(key)
+            self._evict(keep=key)
+            return entry["value"]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry["value"]
+
+    def acquire(self, key, holder):
+        """Marks `holder` (a session id) as using key; False if the entry is gone."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            entry["holders"].add(holder)
+            return True
+
+    def release(self, key, holder):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry["holders"].discard(holder)
+                self._evict()
+
+    def artifact(self, key, name, compute):
+        """
+        Per-entry derived data (e.g. a rendered PDF), computed once for all sessions.
+        compute(value) runs outside the lock; returns None if the entry is gone.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if name in entry["artifacts"]:
+                return entry["artifacts"][name]
+            value = entry["value"]
+        data = compute(value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and name not in entry["artifacts"]:
+                entry["artifacts"][name] = data
+                size = _sizeof(data)
+                entry["size"] += size
+                self.bytes += size
+                self._evict(keep=key)
+        return data
+
+    def holders(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return len(entry["holders"]) if entry else 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict(self, keep=None):
+        # Lock held. Oldest unheld entries go first, then oldest held ones.
+        for held in (False, True):
+            if self.bytes <= self.max_bytes:
+                return
+            for key in [k for k, e in self._entries.items() if bool(e["holders"]) == held and k != keep]:
+                entry = self._entries.pop(key)
+                self.bytes -= entry["size"]
+                self.stats["evictions"] += 1
+                if self.bytes <= self.max_bytes:
+                    return
+
+_default_store = None
+
+def get_default_store():
+    """
+    Process-wide result store shared by every Streamlit session.
+    INTELLICODEX_STORE_MB bounds its memory (default 256 MB).
+    """
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = ResultStore(max_bytes=int(os.environ.get("INTELLICODEX_STORE_MB", 256)) * 1024 * 1024)
+        return _default_store
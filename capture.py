@@ -0,0 +1,100 @@
+"""
+Thread-safe stdout capture for submission code.
+
+Swapping sys.stdout per execution breaks as soon as two scans run on different
+threads of one process (Streamlit sessions, the job queue, the HTTP service):
+each steals the other's prints and the last to finish can restore a dead buffer.
+Instead sys.stdout is replaced once by a proxy that routes each write to the
+buffer of the current context (contextvars: per thread and per asyncio task),
+and to the real stream everywhere else. Buffers are capped so a print flood
+cannot grow without bound.
+"""
+import contextvars
+import sys
+import threading
+from contextlib import contextmanager
+
+# Enough for any realistic debug output; floods beyond this are dropped
+MAX_CAPTURE_BYTES = 64 * 1024
+
+_active = contextvars.ContextVar("intellicodex_capture", default=None)
+_install_lock = threading.Lock()
+
+class BoundedBuffer:
+    """Text sink that keeps the first max_bytes (UTF-8) written to it and counts the rest."""
+    def __init__(self, max_bytes=MAX_CAPTURE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.dropped = 0
+        self._parts = []
+
+    def write(self, text):
+        text = str(text)
+        room = self.max_bytes - self.size
+        if room <= 0:
+            self.dropped += len(text)
+            return len(text)
+        data = text.encode("utf-8", "surrogatepass")
+        if len(data) > room:
+            kept = data[:room].decode("utf-8", "ignore")
+            self._parts.append(kept)
+            self.size = self.max_bytes
+            self.dropped += len(text) - len(kept)
+        else:
+            self._parts.append(text)
+            self.size += len(data)
+        return len(text)
+
+    @property
+    def truncated(self):
+        return self.dropped > 0
+
+    def getvalue(self):
+        value = "".join(self._parts)
+        if self.dropped:
+            value += f"\n... [output truncated: {self.dropped:,} more characters dropped]"
+        return value
+
+class StdoutProxy:
+    """Stands in for sys.stdout; writes go to the current context's buffer, if any."""
+    def __init__(self, target):
+        self._target = target
+
+    def write(self, text):
+        buffer = _active.get()
+        if buffer is not None:
+            return buffer.write(text)
+        return self._target.write(text)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        if _active.get() is None and hasattr(self._target, "flush"):
+            self._target.flush()
+
+    def isatty(self):
+        return _active.get() is None and getattr(self._target, "isatty", lambda: False)()
+
+    def __getattr__(self, name):
+        # encoding, fileno, buffer, ... come from the real stream
+        return getattr(self._target, name)
+
+def install():
+    """Puts the proxy in front of sys.stdout (again, if something replaced it since)."""
+    with _install_lock:
+        if not isinstance(sys.stdout, StdoutProxy):
+            sys.stdout = StdoutProxy(sys.stdout)
+        return sys.stdout
+
+@contextmanager
+def captured_output(max_bytes=MAX_CAPTURE_BYTES):
+    """Captures everything printed in this context (thread / task) into a BoundedBuffer."""
+    install()
+    buffer = BoundedBuffer(max_bytes)
+    token = _active.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _active.reset(token)
@@ -0,0 +1,126 @@
+"""
+IntelliCodex analysis engine: the UI-free API shared by the Streamlit HUD and the
+headless CLI. Nothing here imports streamlit, pandas, plotly or fpdf.
+"""
+from analyzer import analyze_logic
+from executor import run_behavioral_audit, generate_dynamic_test_cases, profile_hotspots
+from grader import calculate_score, get_final_verdict
+from suggestions import get_suggestions
+from rules import run_rules
+from style_detector import detect_level
+from source import parse_source
+from cache import get_default_cache, source_key
+from project import analyze_project
+from records import ScanResult
+from jobs import ScanCancelled
+
+__all__ = [
+    "run_scan", "cached_scan", "scan_variant", "summarize_latency",
+    "parse_source", "analyze_logic", "generate_dynamic_test_cases", "run_behavioral_audit",
+    "calculate_score", "get_final_verdict", "get_suggestions", "detect_level", "profile_hotspots",
+    "analyze_project"
+]
+
+def _check_cancel(cancel):
+    if cancel is not None and cancel.is_set():
+        raise ScanCancelled()
+
+def run_scan(code, on_case=None, benchmark=False, empirical=False, profile=False, reference=None, cancel=None):
+    """
+    Full neural scan pipeline: static analysis, behavioral audit, grading and suggestions.
+    Returns the ScanResult bundle the dashboard renders (verdict colors are applied by the UI).
+    on_case(index, result) streams each behavioral verdict as it completes.
+    benchmark=True replaces the single timing sample with warmup + repeated samples per case.
+    empirical=True also times the entry point over growing inputs and fits its growth curve.
+    profile=True attributes time per line/function for the first test input (heat-map data).
+    reference (source of a known-good solution) turns every generated case into a differential check.
+    cancel (a threading.Event) raises ScanCancelled between phases and stops the sandboxed ones early.
+    """
+    # 0. SINGLE PARSE: Every layer below shares this tree / compiled code
+    source = parse_source(code)
+
+    # 1. STATIC ANALYSIS: Get the "Skeleton" of the code
+    analysis = analyze_logic(source)
+    # One rule traversal feeds both the grader's anti-patterns and the suggestions
+    findings = run_rules(source)
+
+    # 2. FUNCTION EXTRACTION: Find the entry point
+    f_name = source.first_function() or "solve"
+
+    # 3. BEHAVIORAL AUDIT: Run the tests in the sandbox
+    test_cases = generate_dynamic_test_cases(source, f_name, reference=reference)
+    behavior, accuracy = run_behavioral_audit(source, test_cases, on_result=on_case, benchmark=benchmark)
+
+    _check_cancel(cancel)
+
+    # 4. NEURAL GRADING: Calculate the score using BOTH static and behavioral data
+    grades = calculate_score(source, analysis, behavior_accuracy=accuracy, behavior=behavior,
+                             findings=findings)
+
+    # 5. EMPIRICAL SCALING: Measured growth class next to the static Big-O guess
+    scaling = None
+    if empirical and source.first_function():
+        from scaling import estimate_complexity
+        scaling = estimate_complexity(source, f_name, static_estimate=analysis.get("big_o"), cancel=cancel)
+        _check_cancel(cancel)
+
+    # 6. HOT-SPOT PROFILE: Where the time goes, line by line
+    hotspots = None
+    profile_input = next((t["input"] for t in test_cases if t["input"] is not None), None)
+    if profile and source.first_function() and profile_input is not None:
+        hotspots = profile_hotspots(source, f_name, profile_input, cancel=cancel)
+        _check_cancel(cancel)
+
+    return ScanResult(
+        origin=analysis,
+        behavior=behavior,
+        accuracy=accuracy,
+        grades=grades,
+        code=code,
+        suggs=get_suggestions(source, findings),
+        complexity=grades.complexity,
+        memory=grades.memory,
+        latency=summarize_latency(behavior),
+        empirical_complexity=scaling,
+        hotspots=hotspots
+    )
+
+def summarize_latency(behavior):
+    """
+    Scan-level latency for the HUD: median of the per-case benchmark medians when
+    benchmark mode ran, otherwise of the single-sample runtimes.
+    """
+    benched = [r.benchmark for r in behavior if r.benchmark]
+    if benched:
+        medians = sorted(b["median_ms"] for b in benched)
+        return {
+            "median_ms": medians[len(medians) // 2],
+            "p95_ms": max(b["p95_ms"] for b in benched),
+            "benchmarked": True
+        }
+    runtimes = sorted(float(r.runtime[:-2]) for r in behavior if (r.runtime or "").endswith("ms"))
+    if not runtimes:
+        return None
+    return {"median_ms": runtimes[len(runtimes) // 2], "p95_ms": runtimes[-1], "benchmarked": False}
+
+def scan_variant(benchmark=False, empirical=False, profile=False, reference=None):
+    """Cache variant naming a scan configuration (same source + same variant = same result)."""
+    flags = (("benchmark", benchmark), ("empirical", empirical), ("profile", profile))
+    variant = ",".join(flag for flag, on in flags if on)
+    if reference and reference.strip():
+        variant += ",ref=" + source_key(reference)
+    return variant
+
+def cached_scan(code, cache=None, on_case=None, benchmark=False, empirical=False, profile=False, reference=None,
+                cancel=None):
+    """run_scan behind the content-addressed result cache (on_case only fires on a miss)."""
+    cache = cache if cache is not None else get_default_cache()
+    variant = scan_variant(benchmark, empirical, profile, reference)
+    if not (reference and reference.strip()):
+        reference = None
+    return cache.get_or_compute(
+        code,
+        lambda c: run_scan(c, on_case=on_case, benchmark=benchmark, empirical=empirical, profile=profile,
+                           reference=reference, cancel=cancel),
+        variant=variant
+    )
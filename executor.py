@@ -1,87 +1,527 @@
 import sys
+import gc
 import time
-import io
+import statistics
 import re
+import copy
+import hashlib
+import math
+import signal
+import os
+import threading
 import traceback
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from source import parse_source, SUBMISSION_FILENAME
+from sandbox import get_default_pool
+from capture import captured_output
+from records import CaseResult, PASS, FAIL, ERROR
+from testgen import generate_test_cases, find_function, STRESS_SIZES
 
-def execute_with_timeout(code, func_name, test_input):
+try:
+    import resource
+except ImportError:  # Windows: RSS falls back to 0 when /proc is missing too
+    resource = None
+
+# Below this many cases a single sandbox task beats fanning out
+PARALLEL_MIN_CASES = 8
+
+# Benchmark mode: warmup calls, timeit-style auto-calibrated loop, repeated samples
+BENCHMARK_DEFAULTS = {"warmup": 2, "repeat": 7, "target_ms": 20, "max_time": 1.0, "disable_gc": True}
+
+class CaseTimeout(Exception):
+    pass
+
+def execute_with_timeout(code, func_name, test_input, timeout=None, pool=None):
     """
-    Executes code in a controlled sandbox to capture output and performance.
+    Executes code in a sandboxed worker process to capture output and performance.
+    Returns one CaseResult (status "Success"/"Fail"/"Timeout"/"MemoryLimit"); a limit hit never blocks the caller.
+    """
+    return execute_cases(code, func_name, [test_input], timeout=timeout, pool=pool)[0]
+
+def benchmark_config(benchmark):
+    """Normalizes a benchmark flag (None/False, True or an overrides dict) to a full config or None."""
+    if not benchmark:
+        return None
+    config = dict(BENCHMARK_DEFAULTS)
+    if isinstance(benchmark, dict):
+        config.update(benchmark)
+    return config
+
+def execute_cases(code, func_name, inputs, timeout=None, pool=None, benchmark=None, memory_profile=True):
+    """
+    Runs every input against one initialization of the module, inside a single sandbox task.
+    `timeout` is per case and per phase (call, benchmark, traced memory run); the task as a
+    whole gets the sum as its wall-clock budget.
+    """
+    if not inputs:
+        return []
+    code = parse_source(code).code
+    pool = pool if pool is not None else get_default_pool()
+    benchmark = benchmark_config(benchmark)
+    timeout = timeout or pool.wall_timeout
+    cpu_limit = pool.cpu_limit
+    if benchmark:
+        # Sampling gets its own time on top of the plain run
+        timeout += benchmark["max_time"] * 2
+        cpu_limit += math.ceil(benchmark["max_time"] * 2)
+    phases = 1 + bool(benchmark) + bool(memory_profile)
+    budget = timeout * phases * len(inputs) + 1
+    results = pool.run(run_cases_in_process, code, func_name, list(inputs), timeout, benchmark, memory_profile,
+                       timeout=budget, cpu_limit=cpu_limit * phases * len(inputs))
+    if isinstance(results, dict):
+        # The whole task was stopped by the sandbox: every case shares the verdict
+        return [CaseResult.from_dict(results) for _ in inputs]
+    return results
+
+def load_module(code):
+    """
+    Compiles and initializes the submission once.
+    Returns (namespace, top-level output); raises whatever module initialization raises.
+    """
+    source = parse_source(code)
+    namespace = {"__builtins__": __builtins__}
+    if source.code_object is None:
+        # Parsing or compiling already failed once; raise that instead of compiling again
+        raise source.syntax_error or source.compile_error
+    with captured_output() as output:
+        exec(source.code_object, namespace)
+    return namespace, output.getvalue().strip()
+
+def run_cases_in_process(code, func_name, inputs, case_timeout=None, benchmark=None, memory_profile=True):
+    """
+    Compile-once, run-many: initializes the module a single time, then calls the
+    resolved function for each input on a fresh deep copy of its arguments.
     """
-    local_vars = {}
-    sandbox_env = {"__builtins__": __builtins__}
-    
     try:
-        exec(code, sandbox_env, local_vars)
-        func = local_vars.get(func_name)
-        
-        old_stdout = sys.stdout
-        sys.stdout = captured_output = io.StringIO()
-        
+        namespace, module_output = load_module(code)
+    except MemoryError:
+        return [CaseResult("MemoryLimit", error="MemoryLimit: allocation failed") for _ in inputs]
+    except Exception:
+        error = traceback.format_exc().splitlines()[-1]
+        return [CaseResult("Fail", error=error) for _ in inputs]
+
+    func = namespace.get(func_name)
+    benchmark = benchmark_config(benchmark)
+    return [run_case(func, test_input, module_output, case_timeout, benchmark, memory_profile) for test_input in inputs]
+
+def _raise_case_timeout(signum, frame):
+    raise CaseTimeout()
+
+# Fresh argument copies are built this many at a time, outside the timed region
+COPY_BATCH = 256
+
+def _as_args(test_input):
+    return tuple(test_input) if isinstance(test_input, (list, tuple)) else (test_input,)
+
+def _mutates(func, test_input):
+    """Calls func once on a private copy; True if the call changed its arguments."""
+    probe = copy.deepcopy(test_input)
+    func(*_as_args(probe))
+    try:
+        return not (probe == test_input)
+    except Exception:
+        return True
+
+def _time_loop(func, make_args, number):
+    elapsed = 0.0
+    while number > 0:
+        batch = [make_args() for _ in range(min(number, COPY_BATCH))]
+        start_time = time.perf_counter()
+        for args in batch:
+            func(*args)
+        elapsed += time.perf_counter() - start_time
+        number -= len(batch)
+    return elapsed
+
+def _autorange(func, make_args, target, max_number=10 ** 7):
+    scale = 1
+    while True:
+        for step in (1, 2, 5):
+            number = min(scale * step, max_number)
+            elapsed = _time_loop(func, make_args, number)
+            if elapsed >= target or number >= max_number:
+                return number, elapsed
+        scale *= 10
+
+def benchmark_call(func, test_input, warmup=2, repeat=7, target_ms=20, max_time=1.0, disable_gc=True):
+    """
+    Micro-benchmark of one call: warmup, auto-calibrated loop count (timeit autorange),
+    then `repeat` samples, capped so sampling stays within `max_time` seconds.
+    A function that mutates its arguments gets a fresh deep copy per call (made outside
+    the timed region); otherwise every call shares one private copy, like timeit.
+    Reports per-call min/median/p95/stdev in milliseconds.
+    """
+    # The probe call doubles as the first warmup
+    fresh_copies = _mutates(func, test_input)
+    max_number = 10 ** 7
+    if fresh_copies:
+        make_args = lambda: _as_args(copy.deepcopy(test_input))
+        start_time = time.perf_counter()
+        make_args()
+        copy_cost = time.perf_counter() - start_time
+        # Copying isn't timed but still costs wall clock: keep it to a fraction of the budget
+        max_number = max(1, int(max_time / 4 / max(copy_cost, 1e-7)))
+    else:
+        shared = _as_args(copy.deepcopy(test_input))
+        make_args = lambda: shared
+
+    for _ in range(warmup - 1):
+        func(*make_args())
+
+    gc_was_enabled = gc.isenabled()
+    if disable_gc:
+        gc.disable()
+    try:
+        # 1, 2, 5, 10, 20, 50, ... until one sample is long enough to time reliably
+        number, elapsed = _autorange(func, make_args, target_ms / 1000, max_number)
+        repeat = max(1, min(repeat, int(max_time / max(elapsed, 1e-9))))
+        samples = sorted(_time_loop(func, make_args, number) / number * 1000 for _ in range(repeat))
+    finally:
+        if disable_gc and gc_was_enabled:
+            gc.enable()
+
+    return {
+        "iterations": number,
+        "repeat": repeat,
+        "min_ms": round(samples[0], 6),
+        "median_ms": round(statistics.median(samples), 6),
+        "p95_ms": round(samples[max(0, math.ceil(0.95 * len(samples)) - 1)], 6),
+        "stdev_ms": round(statistics.stdev(samples), 6) if len(samples) > 1 else 0.0,
+        "gc_disabled": bool(disable_gc),
+        "fresh_copies": fresh_copies
+    }
+
+def _current_rss_bytes():
+    """Resident set size right now (Linux /proc), else the process high-water mark."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        if resource is None:
+            return 0
+        # ru_maxrss is KB on Linux, bytes on macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+class RssSampler:
+    """Background thread that records the peak RSS while its block runs."""
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self.peak = self.baseline = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _current_rss_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        # Baseline after the thread is up, so its own stack doesn't count as growth
+        self.baseline = _current_rss_bytes()
+        self.peak = max(self.peak, self.baseline)
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _current_rss_bytes())
+        return False
+
+def profile_memory(func, test_input, top=3):
+    """
+    Peak Python allocation (tracemalloc) for one call, plus the submission lines
+    holding the most memory at the moment the call returns (its locals are still
+    alive then, so this tracks the peak closely).
+    """
+    target_code = getattr(func, "__code__", None)
+    state = {"depth": 0, "snapshot": None}
+
+    def _on_return(frame, event, arg):
+        if frame.f_code is not target_code:
+            return
+        if event == "call":
+            state["depth"] += 1
+        elif event == "return":
+            state["depth"] -= 1
+            if state["depth"] == 0 and state["snapshot"] is None:
+                state["snapshot"] = tracemalloc.take_snapshot()
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    old_profile = sys.getprofile()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        sys.setprofile(_on_return)
         try:
-            start_time = time.perf_counter()
-            if func and test_input is not None:
-                # Handle Function Execution
-                result = func(*test_input) if isinstance(test_input, (list, tuple)) else func(test_input)
-                str_result = str(result)
-            else:
-                # Handle Script Execution
-                str_result = captured_output.getvalue().strip() or "No Output"
-            
-            end_time = time.perf_counter()
+            result = func(*test_input) if isinstance(test_input, (list, tuple)) else func(test_input)
+        finally:
+            sys.setprofile(old_profile)
+        peak = tracemalloc.get_traced_memory()[1]
+        del result
+        snapshot = state["snapshot"] or tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    stats = snapshot.filter_traces([tracemalloc.Filter(True, SUBMISSION_FILENAME)]).statistics("lineno")
+    sites = [
+        {"line": stat.traceback[0].lineno, "size_kb": round(stat.size / 1024, 2), "count": stat.count}
+        for stat in stats[:top]
+    ]
+    return {
+        "peak_kb": round(max(0, peak - baseline) / 1024, 2),
+        "top_sites": sites
+    }
+
+def _optional_phase(arm, disarm, fn, *args, **kwargs):
+    """Runs an extra measurement on its own alarm budget; any failure (timeout included) gives None."""
+    arm()
+    try:
+        return fn(*args, **kwargs)
+    except Exception:
+        return None
+    finally:
+        disarm()
+
+def run_case(func, test_input, module_output="", case_timeout=None, benchmark=None, memory_profile=True):
+    """
+    Runs one test case against an already-initialized function (optionally benchmarking it).
+    memory["peak_rss_kb"] is RSS growth sampled during the timed call itself (informational, noisy);
+    memory_profile adds a separate traced call for the tracemalloc peak_kb and top_sites.
+    Benchmark and memory profiling each get their own case_timeout budget after the verdict
+    is fixed, so a failure there never changes status or runtime (it only drops that block).
+    """
+    # Per-case alarm only works from the main thread (always true inside a sandbox worker)
+    use_alarm = bool(case_timeout) and hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+    def arm():
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, case_timeout)
+
+    def disarm():
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_case_timeout)
+
+    try:
+        # Prints are captured per execution context, never by swapping the process-wide stdout
+        with captured_output():
+            call_input = copy.deepcopy(test_input)
+            arm()
+            try:
+                with RssSampler() as sampler:
+                    start_time = time.perf_counter()
+                    if func and call_input is not None:
+                        # Handle Function Execution
+                        result = func(*call_input) if isinstance(call_input, (list, tuple)) else func(call_input)
+                        end_time = time.perf_counter()
+                        str_result = str(result)
+                    else:
+                        # Handle Script Execution
+                        end_time = time.perf_counter()
+                        str_result = module_output or "No Output"
+            finally:
+                disarm()
+
             runtime_ms = (end_time - start_time) * 1000
 
+            digest = hashlib.blake2b(str_result.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
             if len(str_result) > 100:
                 str_result = str_result[:97] + "..."
 
-            return {"status": "Success", "output": str_result, "runtime": f"{runtime_ms:.2f}ms"}
-        finally:
-            sys.stdout = old_stdout
+            res = CaseResult("Success", output=str_result, digest=digest, runtime=f"{runtime_ms:.2f}ms")
+            if func and test_input is not None:
+                res.memory = {"peak_rss_kb": round(max(0, sampler.peak - sampler.baseline) / 1024, 2)}
+                if benchmark:
+                    res.benchmark = _optional_phase(arm, disarm, benchmark_call, func, test_input, **benchmark)
+                if memory_profile:
+                    res.memory.update(_optional_phase(arm, disarm, profile_memory, func, copy.deepcopy(test_input)) or {})
+            return res
+    except CaseTimeout:
+        return CaseResult("Timeout", error=f"Timeout: exceeded {case_timeout:g}s wall-clock limit")
+    except MemoryError:
+        return CaseResult("MemoryLimit", error="MemoryLimit: allocation failed")
     except Exception:
-        return {"status": "Fail", "error": traceback.format_exc().splitlines()[-1]}
+        return CaseResult("Fail", error=traceback.format_exc().splitlines()[-1])
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
 
-def generate_dynamic_test_cases(code, func_name):
+def generate_dynamic_test_cases(code, func_name, reference=None, seed=0, stress=True, pool=None):
     """
-    Generates test scenarios based on function arguments.
+    Generates test scenarios from the function's inferred argument types: boundary values,
+    seeded random inputs and (stress=True) large-N inputs that expose poor scaling.
+    With `reference` (source of a known-good implementation), every case's expected
+    output comes from running the reference on the same input (differential check).
     """
+    source = parse_source(code)
+    cases = generate_test_cases(source, func_name, seed=seed, stress_sizes=STRESS_SIZES if stress else ())
+    if reference and any(case["input"] is not None for case in cases):
+        attach_reference_outputs(cases, reference, func_name, pool=pool)
+    return cases
+
+def attach_reference_outputs(test_cases, reference, func_name=None, pool=None):
+    """
+    Runs the reference implementation over the cases' inputs in the sandbox and records
+    its output (and full-output digest) as each case's expectation. Cases the reference
+    itself can't handle keep expected=None.
+    """
+    reference = parse_source(reference)
+    ref_name = func_name if func_name and find_function(reference, func_name) else resolve_entry_point(reference)
+    outcomes = execute_cases(reference, ref_name, [case["input"] for case in test_cases], pool=pool)
+    for case, res in zip(test_cases, outcomes):
+        if res.status == "Success":
+            case["expected"] = res.output
+            case["expected_digest"] = res.digest
+    return test_cases
+
+def profile_in_process(code, func_name, test_input):
+    """Runs one case under the hot-spot profiler (module initialized unprofiled)."""
+    source = parse_source(code)
     try:
-        match = re.search(rf'def {func_name}\((.*?)\):', code)
-        if match:
-            params = match.group(1).split(',')
-            params_count = len([p for p in params if p.strip()])
-            
-            # Cases for TwoSum or Search
-            return [
-                {"name": "Standard Vector", "input": ([2, 7, 11, 15], 9) if params_count == 2 else [1, 2, 3], "expected": "[0, 1]" if params_count == 2 else None},
-                {"name": "Empty/Null Edge", "input": ([], 0) if params_count == 2 else [], "expected": "[]" if params_count == 2 else None}
-            ]
-        return [{"name": "Generic Execution", "input": None, "expected": None}]
-    except:
-        return [{"name": "Basic Audit", "input": None, "expected": None}]
-
-def run_behavioral_audit(code, test_cases):
+        namespace, _ = load_module(source)
+    except Exception:
+        return {"status": "Fail", "error": traceback.format_exc().splitlines()[-1]}
+    func = namespace.get(func_name)
+    if not callable(func) or test_input is None:
+        return {"status": "Fail", "error": f"No callable '{func_name}' to profile"}
+
+    from profiler import HotspotProfiler
+    profiler = HotspotProfiler()
+    test_input = copy.deepcopy(test_input)
+    try:
+        with captured_output():
+            profiler.run(lambda: func(*test_input) if isinstance(test_input, (list, tuple)) else func(test_input))
+        status, error = "Success", None
+    except MemoryError:
+        status, error = "MemoryLimit", "MemoryLimit: allocation failed"
+    except Exception:
+        # A failing case still has a useful profile up to the failure
+        status, error = "Success", traceback.format_exc().splitlines()[-1]
+    report = profiler.report(source.lines)
+    report.update(status=status, error=error)
+    return report
+
+def profile_hotspots(code, func_name=None, test_input=None, timeout=None, pool=None, cancel=None):
+    """
+    Opt-in profiling mode: line/function time attribution for one test input, run in the sandbox.
+    Tracing slows execution several-fold, so the wall-clock budget is widened accordingly.
+    Setting `cancel` (a threading.Event) abandons the run.
+    """
+    source = parse_source(code)
+    func_name = func_name or resolve_entry_point(source)
+    pool = pool if pool is not None else get_default_pool()
+    timeout = (timeout or pool.wall_timeout) * 5
+    return pool.run(profile_in_process, source.code, func_name, test_input,
+                    timeout=timeout, cpu_limit=math.ceil(timeout), cancel=cancel)
+
+def resolve_entry_point(source):
+    """Name of the function under test (first def in source order)."""
+    func_name = source.first_function()
+    if func_name is None:
+        match = re.search(r'def (\w+)\(', source.code)
+        func_name = match.group(1) if match else "solution"
+    return func_name
+
+def grade_case(test, res):
+    """Attaches scenario name, expectation and verdict to one raw execution result."""
+    res.scenario = test["name"]
+    if test.get("expected") is not None:
+        expected = str(test["expected"])
+        res.expected = expected if len(expected) <= 100 else expected[:97] + "..."
+    
+    if res.status == "Success":
+        if test.get("expected_digest") and res.digest:
+            # Differential check on the full output, not just the truncated preview
+            matches = res.digest == test["expected_digest"]
+        else:
+            matches = test.get("expected") is None or res.output == str(test["expected"])
+        if matches:
+            res.verdict = PASS
+        else:
+            res.verdict = FAIL
+    else:
+        res.verdict = ERROR
+        res.output = res.error or "Runtime fault"
+    return res
+
+def stream_behavioral_audit(code, test_cases, workers=None, chunk_size=None, pool=None, benchmark=None,
+                            memory_profile=True):
+    """
+    Fans test cases out over the sandbox pool in chunks and yields (index, result)
+    in the original case order, each as soon as every earlier case has finished.
+    Each chunk initializes the module once in its worker.
+    """
+    if not test_cases:
+        return
+    source = parse_source(code)
+    func_name = resolve_entry_point(source)
+    pool = pool if pool is not None else get_default_pool()
+    workers = max(1, min(workers or pool.size, pool.size))
+    # ~2 chunks per worker keeps the pool busy without re-initializing the module per case
+    chunk_size = chunk_size or max(1, math.ceil(len(test_cases) / (workers * 2)))
+    inputs = [test["input"] for test in test_cases]
+
+    with ThreadPoolExecutor(max_workers=workers) as dispatcher:
+        futures = {
+            dispatcher.submit(execute_cases, source.code, func_name, inputs[start:start + chunk_size],
+                              pool=pool, benchmark=benchmark, memory_profile=memory_profile): start
+            for start in range(0, len(inputs), chunk_size)
+        }
+        finished = {}
+        next_index = 0
+        try:
+            for future in as_completed(futures):
+                start = futures[future]
+                for offset, res in enumerate(future.result()):
+                    finished[start + offset] = res
+                while next_index in finished:
+                    yield next_index, grade_case(test_cases[next_index], finished.pop(next_index))
+                    next_index += 1
+        finally:
+            # Consumer stopped early (e.g. a cancelled scan): don't start chunks nobody will read
+            for future in futures:
+                future.cancel()
+
+def run_behavioral_audit(code, test_cases, parallel=None, on_result=None, pool=None, benchmark=None,
+                         memory_profile=True):
     """
     Orchestrates the tests and returns results for the UI.
+    benchmark=True (or a BENCHMARK_DEFAULTS overrides dict) adds a "benchmark" stats block per case;
+    memory_profile=False skips the traced re-run per case (tracemalloc peak and allocation sites).
+    parallel=None picks the process-pool fan-out once there are PARALLEL_MIN_CASES cases;
+    on_result(index, result) is called for each verdict, in case order, as it lands.
     """
-    match = re.search(r'def (\w+)\(', code)
-    func_name = match.group(1) if match else "solution"
+    source = parse_source(code)
+    if parallel is None:
+        parallel = len(test_cases) >= PARALLEL_MIN_CASES
+
+    if parallel:
+        graded = stream_behavioral_audit(source, test_cases, pool=pool, benchmark=benchmark,
+                                         memory_profile=memory_profile)
+    else:
+        # Module is compiled and initialized once; every case reuses the resolved function
+        outcomes = execute_cases(source, resolve_entry_point(source), [test["input"] for test in test_cases],
+                                 pool=pool, benchmark=benchmark, memory_profile=memory_profile)
+        graded = ((i, grade_case(test, res)) for i, (test, res) in enumerate(zip(test_cases, outcomes)))
+
     final_results = []
     passed_count = 0
-
-    for test in test_cases:
-        res = execute_with_timeout(code, func_name, test["input"])
-        res["scenario"] = test["name"]
-        
-        if res.get("status") == "Success":
-            if test.get("expected") is None or res["output"] == str(test["expected"]):
-                res["verdict"] = "✅ PASS"
-                passed_count += 1
-            else:
-                res["verdict"] = "❌ FAIL"
-        else:
-            res["verdict"] = "⚠️ ERROR"
-            res["output"] = res.get("error", "Runtime fault")
+    for index, res in graded:
+        if res.passed:
+            passed_count += 1
         final_results.append(res)
+        if on_result:
+            on_result(index, res)
 
     accuracy = int((passed_count / len(test_cases)) * 100) if test_cases else 0
     return final_results, accuracy
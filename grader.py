@@ -1,10 +1,38 @@
 import ast
+import math
+from source import parse_source
+from antipatterns import detect_antipatterns, efficiency_penalty
+from records import Grades
 
-def calculate_score(code, analysis, behavior_accuracy=0):
+def memory_score(behavior):
+    """
+    Memory-efficiency sub-score from the per-test tracemalloc peaks (RSS is too noisy to score).
+    Up to 1 MB of peak allocation is free; every doubling past that costs 8 points.
+    Returns (score or None when nothing was measured, worst peak in KB).
+    """
+    peaks = [r.memory["peak_kb"] for r in (behavior or []) if r.memory and r.memory.get("peak_kb") is not None]
+    if not peaks:
+        return None, None
+    worst_kb = max(peaks)
+    if worst_kb <= 1024:
+        return 100, worst_kb
+    return max(20, int(100 - 8 * math.log2(worst_kb / 1024))), worst_kb
+
+def format_memory(kb):
+    if kb is None:
+        return "N/A"
+    return f"{kb / 1024:.1f} MB" if kb >= 1024 else f"{kb:.1f} KB"
+
+def calculate_score(code, analysis, behavior_accuracy=0, behavior=None, findings=None):
     """
     Final Neural Grading Logic.
     Bridges AST analysis and behavioral results for the HUD.
+    Accepts raw code or a ParsedSource; `behavior` (executor results) feeds the memory score,
+    `findings` (run_rules output) saves re-running the rule traversal.
     """
+    source = parse_source(code)
+    code = source.code
+
     # 1. Initialize Metric Scores
     scores = {
         "correctness": 100, "efficiency": 100, "readability": 100,
@@ -12,33 +40,42 @@ def calculate_score(code, analysis, behavior_accuracy=0):
     }
 
     if not code.strip():
-        return {"accuracy": 0, "v_str": "EMPTY", "v_desc": "No code detected.", "behavior": []}
+        return Grades(accuracy=0, v_str="EMPTY", v_desc="No code detected.")
 
     # 2. Correctness (Syntax Check)
-    try:
-        compile(code, '<string>', 'exec')
-    except Exception:
+    if source.code_object is None:
         scores["correctness"] = 20 
 
     # 3. Efficiency & Big O Analysis (Elite vs Modest Logic)
-    nesting = analysis.get("max_nesting", 0)
-    has_hashmap = "{" in code or "dict(" in code
+    nesting = analysis.max_nesting
+    antipatterns = detect_antipatterns(source, findings)
+    growth_debt = any(f["impact"] == "asymptotic" for f in antipatterns)
 
-    # ELITE Logic: 1 Loop (Nesting Level 2) + Hashmap = Elite O(N). 
-    # Nested loops (Nesting Level 3+) = Modest O(N²).
-    if has_hashmap and nesting <= 2:
-        scores["efficiency"] = 100
+    # ELITE Logic: 1 Loop (Nesting Level 2) with no hot-loop anti-patterns = Elite O(N).
+    # Nested loops (Nesting Level 3+) or a quadratic anti-pattern = Modest O(N²).
+    # Code that doesn't parse/compile has no structure to judge, so no complexity label.
+    if not source.ok or source.code_object is None:
+        scores["complexity"] = "N/A (syntax error)"
+    elif nesting <= 2 and not growth_debt:
         scores["complexity"] = "O(N) [Elite]"
     elif nesting > 2:
         scores["efficiency"] -= 35
         scores["complexity"] = "O(N²)"
+    else:
+        scores["complexity"] = "O(N²)"
+    # Each finding costs its estimated penalty (capped per rule and overall)
+    scores["efficiency"] = max(0, scores["efficiency"] - efficiency_penalty(antipatterns))
+
+    # 3b. Memory Efficiency (measured peak allocation blends into efficiency)
+    scores["memory"], peak_kb = memory_score(behavior)
+    if scores["memory"] is not None:
+        scores["efficiency"] = int(scores["efficiency"] * 0.7 + scores["memory"] * 0.3)
     
     # 4. Readability
-    try:
-        tree = ast.parse(code)
-        has_docstring = any(isinstance(n, ast.Expr) and isinstance(n.value, ast.Constant) for n in tree.body)
+    if source.ok:
+        has_docstring = any(isinstance(n, ast.Expr) and isinstance(n.value, ast.Constant) for n in source.tree.body)
         if not has_docstring: scores["readability"] -= 20
-    except:
+    else:
         has_docstring = False
 
     # 5. Final Calculation (Weighted Average)
@@ -55,15 +92,19 @@ def calculate_score(code, analysis, behavior_accuracy=0):
     else:
         v_name, v_desc = "CRITICAL", "Unsafe: Major logical or structural flaws."
 
-    return {
-        "accuracy": total_int,
-        "v_str": v_name,
-        "v_desc": v_desc,
-        "complexity": scores["complexity"],
-        "suggs": get_suggestions(analysis, has_docstring),
-        "behavior": [{"input": "Neural Trace", "verdict": "✅ PASS" if behavior_accuracy > 50 else "❌ FAIL"}],
-        "origin": {"health": scores["readability"], "node_counts": analysis.get('node_counts', {})}
-    }
+    return Grades(
+        accuracy=total_int,
+        v_str=v_name,
+        v_desc=v_desc,
+        complexity=scores["complexity"],
+        memory=format_memory(peak_kb),
+        memory_score=scores["memory"],
+        correctness=scores["correctness"],
+        efficiency=scores["efficiency"],
+        readability=scores["readability"],
+        antipatterns=antipatterns,
+        suggs=get_suggestions(analysis, has_docstring)
+    )
 
 def get_final_verdict(grades, theme_overrides=None):
     """
@@ -95,7 +136,7 @@ def get_final_verdict(grades, theme_overrides=None):
 def get_suggestions(analysis, has_docstring):
     """Generates the Roadmap suggestions."""
     suggs = []
-    if analysis.get("max_nesting", 0) > 2:
+    if analysis.max_nesting > 2:
         suggs.append("⚠️ **Structural Debt:** Logic is nested too deeply. Use 'Guard Clauses' to flatten the flow.")
     if not has_docstring:
         suggs.append("📝 **Documentation Gap:** Add a docstring to explain the 'Why' of this function.")
@@ -0,0 +1,222 @@
+"""
+Headless IntelliCodex entry point.
+
+    python -m intellicodex audit <dir|zip|jsonl> [-o results.jsonl] [--workers N] [--resume] [--reference ref.py]
+    python -m intellicodex report <results.jsonl> -o <dir> [--format pdf|html|json] [--workers N]
+    python -m intellicodex project <source tree> [-o report.json] [--workers N] [--cache modules.sqlite]
+    python -m intellicodex serve [--host 127.0.0.1] [--port 8765] [--workers N] [--queue 64]
+
+Streams one JSON line per submission in input order. Output doubles as the
+checkpoint: with --resume, submissions already present in the output file are skipped.
+"""
+import argparse
+import json
+import os
+import sys
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from records import json_default
+
+def iter_submissions(path):
+    """
+    Yields (submission_id, code) lazily from a directory tree of .py files,
+    a .zip archive, or a .jsonl file of {"id": ..., "code": ...} records.
+    """
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(".py"):
+                    full = os.path.join(root, name)
+                    with open(full, encoding="utf-8", errors="replace") as f:
+                        yield os.path.relpath(full, path), f.read()
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.endswith(".py"):
+                    yield info.filename, archive.read(info).decode("utf-8", errors="replace")
+    else:
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                yield str(record.get("id", line_no)), record.get("code") or record.get("source") or ""
+
+def summarize(submission_id, scan):
+    """Compact per-submission record for the JSONL stream."""
+    grades = scan.get("grades", {})
+    origin = scan.get("origin", {})
+    return {
+        "id": submission_id,
+        "score": grades.get("accuracy", 0),
+        "verdict": grades.get("v_str"),
+        "complexity": scan.get("complexity"),
+        "big_o": origin.get("big_o"),
+        "health": origin.get("health"),
+        "pass_rate": scan.get("accuracy"),
+        "memory": scan.get("memory"),
+        "issues": origin.get("issues", []),
+        "suggestions": scan.get("suggs", []),
+        "error": origin.get("error")
+    }
+
+def audit_one(submission_id, code, full=False, reference=None):
+    """Runs the full pipeline for one submission; never raises."""
+    from engine import cached_scan
+    try:
+        scan = cached_scan(code, reference=reference)
+    except Exception as e:
+        return {"id": submission_id, "error": f"{type(e).__name__}: {e}"}
+    return dict(scan, id=submission_id) if full else summarize(submission_id, scan)
+
+def completed_count(output_path):
+    """
+    Number of complete records already in the output file. A torn final line
+    (crash mid-write) is truncated so appending resumes cleanly.
+    """
+    if not os.path.exists(output_path):
+        return 0
+    count, good_bytes = 0, 0
+    with open(output_path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            count += 1
+            good_bytes += len(line)
+    if good_bytes != os.path.getsize(output_path):
+        with open(output_path, "r+b") as f:
+            f.truncate(good_bytes)
+    return count
+
+def run_audit(path, out, workers=None, window=None, skip=0, full=False, reference=None):
+    """
+    Audits every submission under `path`, writing JSON lines to `out` in input order.
+    At most `window` submissions are in flight, so memory stays bounded for any corpus size.
+    Returns the number of records written.
+    """
+    workers = workers or os.cpu_count() or 1
+    window = window or workers * 2
+    # Each audit process gets its own small sandbox pool instead of one per core
+    os.environ.setdefault("INTELLICODEX_SANDBOX_WORKERS", "1")
+
+    written = 0
+    submissions = iter_submissions(path)
+    for _ in range(skip):
+        if next(submissions, None) is None:
+            return 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for submission_id, code in submissions:
+            in_flight.append(executor.submit(audit_one, submission_id, code, full, reference))
+            if len(in_flight) >= window:
+                out.write(json.dumps(in_flight.popleft().result(), default=json_default) + "\n")
+                out.flush()
+                written += 1
+        while in_flight:
+            out.write(json.dumps(in_flight.popleft().result(), default=json_default) + "\n")
+            out.flush()
+            written += 1
+    return written
+
+def iter_results(path):
+    """Yields (id, record) from an audit JSONL file: summary lines, or --full scans (which keep the source)."""
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if line.strip():
+                record = json.loads(line)
+                yield record.get("id", line_no), record
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="intellicodex", description="Headless IntelliCodex audits.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    audit = commands.add_parser("audit", help="Audit a directory, .zip archive or .jsonl file of submissions.")
+    audit.add_argument("path")
+    audit.add_argument("-o", "--output", help="JSONL output file (default: stdout).")
+    audit.add_argument("-w", "--workers", type=int, default=None, help="Parallel audit processes (default: CPU count).")
+    audit.add_argument("--window", type=int, default=None, help="Max submissions in flight (default: 2 x workers).")
+    audit.add_argument("--resume", action="store_true", help="Skip submissions already recorded in --output.")
+    audit.add_argument("--full", action="store_true", help="Emit the full scan bundle instead of a summary.")
+    audit.add_argument("--reference", help="Known-good solution (.py); generated cases are checked against its outputs.")
+
+    report = commands.add_parser("report", help="Render audit JSONL records to PDF/HTML/JSON files in parallel.")
+    report.add_argument("results")
+    report.add_argument("-o", "--output", required=True, help="Directory for the rendered reports.")
+    report.add_argument("-f", "--format", choices=("pdf", "html", "json"), default="pdf")
+    report.add_argument("-w", "--workers", type=int, default=None, help="Parallel render processes (default: CPU count).")
+
+    project = commands.add_parser("project", help="Analyze a whole source tree: import/call graph, package roll-ups, hot paths.")
+    project.add_argument("path")
+    project.add_argument("-o", "--output", help="JSON report file (default: stdout).")
+    project.add_argument("-w", "--workers", type=int, default=None, help="Parallel analysis processes (default: CPU count).")
+    project.add_argument("--cache", help="sqlite file caching per-module results, so unchanged files are skipped on re-run.")
+
+    serve = commands.add_parser("serve", help="Run the local HTTP/JSON scoring service.")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("-w", "--workers", type=int, default=None, help="Concurrent scans (default: CPU count).")
+    serve.add_argument("--queue", type=int, default=64, help="Max submissions queued or running before 429s (default 64).")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        from server import serve as run_server
+        print(f"IntelliCodex scoring service on http://{args.host}:{args.port}", file=sys.stderr)
+        run_server(args.host, args.port, workers=args.workers, max_queue=args.queue)
+        return 0
+    if args.command == "project":
+        from project import analyze_project
+        if not os.path.isdir(args.path):
+            parser.error(f"not a directory: {args.path}")
+        cache = None
+        if args.cache:
+            from cache import ScanCache
+            cache = ScanCache(max_entries=100000, path=args.cache)
+        report = analyze_project(args.path, workers=args.workers, cache=cache)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as out:
+                json.dump(report, out, indent=2, default=str)
+            print(f"Analyzed {report['analyzed']} modules ({report['cached']} cached), "
+                  f"{len(report['hot_paths'])} hot paths -> {args.output}", file=sys.stderr)
+        else:
+            json.dump(report, sys.stdout, indent=2, default=str)
+            print()
+        return 0
+    if args.command == "report":
+        from report_gen import render_reports
+        if not os.path.exists(args.results):
+            parser.error(f"no such file: {args.results}")
+        written = failed = 0
+        for name, path, error in render_reports(iter_results(args.results), args.output, args.format, args.workers):
+            if error:
+                failed += 1
+                print(f"{name}: {error}", file=sys.stderr)
+            else:
+                written += 1
+        print(f"Rendered {written} {args.format} reports ({failed} failed) -> {args.output}", file=sys.stderr)
+        return 1 if failed else 0
+
+    if args.command == "audit":
+        if not os.path.exists(args.path):
+            parser.error(f"no such file or directory: {args.path}")
+        if args.resume and not args.output:
+            parser.error("--resume needs --output (the output file is the checkpoint)")
+        reference = None
+        if args.reference:
+            with open(args.reference, encoding="utf-8") as f:
+                reference = f.read()
+
+        if args.output:
+            skip = completed_count(args.output) if args.resume else 0
+            with open(args.output, "a" if args.resume else "w", encoding="utf-8") as out:
+                written = run_audit(args.path, out, args.workers, args.window, skip, args.full, reference)
+            print(f"Audited {written} submissions ({skip} resumed) -> {args.output}", file=sys.stderr)
+        else:
+            run_audit(args.path, sys.stdout, args.workers, args.window, 0, args.full, reference)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
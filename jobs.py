@@ -0,0 +1,164 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+ACTIVE_STATES = ("queued", "running")
+
+class JobLimitExceeded(Exception):
+    """The user already has the maximum number of scans queued or running."""
+
+class ScanCancelled(Exception):
+    """Raised inside a running scan once its job has been cancelled."""
+
+class ScanJobQueue:
+    """
+    Background scan executor for the dashboard: submit() returns a job id at once and
+    the scan runs on a worker thread (submitted code itself still runs in the sandbox
+    process pool). Callers poll status() for the live trace and the finished result.
+    Each user may have at most `per_user` jobs queued or running.
+    `scan` (default engine.cached_scan) is called as scan(code, on_case=, cancel=, **scan_options).
+    """
+    def __init__(self, workers=None, per_user=1, keep_finished=256, scan=None):
+        self.per_user = per_user
+        self.keep_finished = keep_finished
+        self._scan = scan
+        self._executor = ThreadPoolExecutor(max_workers=workers or 4, thread_name_prefix="scan-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, code, user=None, **scan_options):
+        """Queues a scan of `code` and returns its job id. scan_options go to cached_scan."""
+        with self._lock:
+            if self.per_user and self.active_count(user, locked=True) >= self.per_user:
+                raise JobLimitExceeded(f"At most {self.per_user} scan(s) may run at once per user")
+            job_id = uuid.uuid4().hex
+            job = {
+                "id": job_id,
+                "user": user,
+                "state": "queued",
+                "trace": [],
+                "result": None,
+                "error": None,
+                "submitted": time.time(),
+                "started": None,
+                "finished": None,
+                "cancel": threading.Event()
+            }
+            self._jobs[job_id] = job
+            self._prune()
+        job["future"] = self._executor.submit(self._run, job, code, scan_options)
+        return job_id
+
+    def status(self, job_id):
+        """Snapshot of a job (safe to read while it runs), or None for unknown ids."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {
+                "id": job["id"],
+                "state": job["state"],
+                "trace": list(job["trace"]),
+                "result": job["result"],
+                "error": job["error"],
+                "elapsed": round((job["finished"] or time.time()) - (job["started"] or job["submitted"]), 3)
+            }
+
+    def cancel(self, job_id):
+        """
+        Cancels a queued job outright; a running one stops at its next test verdict or phase.
+        Returns False if the job is unknown or already finished.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["state"] not in ACTIVE_STATES:
+                return False
+            job["cancel"].set()
+            future = job.get("future")
+            if job["state"] == "queued" and future is not None and future.cancel():
+                self._finish(job, "cancelled")
+            return True
+
+    def forget(self, job_id):
+        """Drops a job record, cancelling it first if it is still active."""
+        self.cancel(job_id)
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def active_count(self, user=None, locked=False):
+        if not locked:
+            with self._lock:
+                return self.active_count(user, locked=True)
+        return sum(1 for job in self._jobs.values() if job["user"] == user and job["state"] in ACTIVE_STATES)
+
+    def shutdown(self):
+        with self._lock:
+            for job in self._jobs.values():
+                job["cancel"].set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job, code, scan_options):
+        with self._lock:
+            if job["cancel"].is_set():
+                self._finish(job, "cancelled")
+                return
+            job["state"] = "running"
+            job["started"] = time.time()
+
+        def on_case(index, res):
+            with self._lock:
+                job["trace"].append({"index": index, **res})
+            if job["cancel"].is_set():
+                raise ScanCancelled()
+
+        try:
+            scan = self._scan
+            if scan is None:
+                from engine import cached_scan as scan
+            result = scan(code, on_case=on_case, cancel=job["cancel"], **scan_options)
+        except ScanCancelled:
+            with self._lock:
+                self._finish(job, "cancelled")
+            return
+        except Exception as e:
+            with self._lock:
+                job["error"] = f"{type(e).__name__}: {e}"
+                self._finish(job, "failed")
+            return
+        with self._lock:
+            if job["cancel"].is_set():
+                self._finish(job, "cancelled")
+            else:
+                job["result"] = result
+                self._finish(job, "done")
+
+    def _finish(self, job, state):
+        job["state"] = state
+        job["finished"] = time.time()
+
+    def _prune(self):
+        """Keeps at most keep_finished finished jobs (oldest dropped first); active ones are never dropped."""
+        finished = [job_id for job_id, job in self._jobs.items() if job["state"] not in ACTIVE_STATES]
+        for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
+
+_default_queue = None
+_default_lock = threading.Lock()
+
+def get_default_queue():
+    """
+    Process-wide job queue shared by every Streamlit session.
+    INTELLICODEX_SCAN_WORKERS bounds concurrent scans,
+    INTELLICODEX_SCANS_PER_USER caps active jobs per session.
+    """
+    global _default_queue
+    with _default_lock:
+        if _default_queue is None:
+            _default_queue = ScanJobQueue(
+                workers=int(os.environ.get("INTELLICODEX_SCAN_WORKERS", 4)),
+                per_user=int(os.environ.get("INTELLICODEX_SCANS_PER_USER", 1)),
+            )
+        return _default_queue
@@ -0,0 +1,201 @@
+import sys
+import time
+import cProfile
+import pstats
+
+from source import SUBMISSION_FILENAME
+
+class HotspotProfiler:
+    """
+    Line- and function-level time attribution for submitted code only.
+    Backends: sys.monitoring (3.12+), sys.settrace, or cProfile (function level)
+    when another tracer such as a debugger or coverage already owns settrace.
+    Line times are self time: time spent in profiled callees is charged to their own
+    lines, so the heat-map sums to (at most) the total. Function times are inclusive.
+    """
+    def __init__(self, filename=SUBMISSION_FILENAME):
+        self.filename = filename
+        self.backend = None
+        self.total = 0.0
+        self.lines = {}      # lineno -> [hits, seconds]
+        self.functions = {}  # (name, firstlineno) -> [calls, seconds]
+        self._active = {}    # code -> live activations (recursion-safe function totals)
+        self._stack = []     # [code, last_line, last_time, start_time, callee_time]
+
+    def run(self, call):
+        """Profiles call() and returns its result."""
+        if sys.version_info >= (3, 12) and sys.gettrace() is None:
+            try:
+                return self._run_monitoring(call)
+            except ValueError:
+                pass  # profiler tool id already taken
+        if sys.gettrace() is None:
+            return self._run_settrace(call)
+        return self._run_cprofile(call)
+
+    # --- shared bookkeeping ---
+    def _enter(self, code, now, is_call=True):
+        if is_call:
+            key = (code.co_name, code.co_firstlineno)
+            self.functions.setdefault(key, [0, 0.0])[0] += 1
+        self._active[code] = self._active.get(code, 0) + 1
+        self._stack.append([code, None, now, now, 0.0])
+
+    def _line(self, code, lineno, now):
+        if not self._stack or self._stack[-1][0] is not code:
+            return
+        frame = self._stack[-1]
+        self._charge(frame, now)
+        self.lines.setdefault(lineno, [0, 0.0])[0] += 1
+        frame[1], frame[2] = lineno, now
+
+    def _exit(self, code, now):
+        if not self._stack or self._stack[-1][0] is not code:
+            return
+        frame = self._stack.pop()
+        self._charge(frame, now)
+        if self._stack:
+            self._stack[-1][4] += now - frame[3]
+        self._active[code] -= 1
+        if self._active[code] == 0:
+            key = (code.co_name, code.co_firstlineno)
+            self.functions.setdefault(key, [0, 0.0])[1] += now - frame[3]
+
+    def _charge(self, frame, now):
+        """Charges the time since the frame's last line event, minus profiled callees, to that line."""
+        if frame[1] is not None:
+            self.lines.setdefault(frame[1], [0, 0.0])[1] += max(0.0, now - frame[2] - frame[4])
+        frame[4] = 0.0
+
+    def _timed(self, call):
+        start = time.perf_counter()
+        try:
+            return call()
+        finally:
+            self.total = time.perf_counter() - start
+
+    # --- backends ---
+    def _run_monitoring(self, call):
+        mon = sys.monitoring
+        tool = mon.PROFILER_ID
+        mon.use_tool_id(tool, "intellicodex")
+        events = mon.events
+        clock = time.perf_counter
+        mine = self.filename
+
+        def on_start(code, offset):
+            if code.co_filename != mine:
+                return mon.DISABLE
+            self._enter(code, clock())
+
+        def on_resume(code, offset):
+            if code.co_filename != mine:
+                return mon.DISABLE
+            self._enter(code, clock(), is_call=False)
+
+        def on_line(code, lineno):
+            if code.co_filename != mine:
+                return mon.DISABLE
+            self._line(code, lineno, clock())
+
+        def on_exit(code, offset, value):
+            if code.co_filename != mine:
+                return mon.DISABLE
+            self._exit(code, clock())
+
+        def on_unwind(code, offset, exc):
+            # PY_UNWIND cannot be disabled per location
+            if code.co_filename == mine:
+                self._exit(code, clock())
+
+        self.backend = "sys.monitoring"
+        callbacks = {
+            events.PY_START: on_start, events.PY_RESUME: on_resume, events.LINE: on_line,
+            events.PY_RETURN: on_exit, events.PY_YIELD: on_exit, events.PY_UNWIND: on_unwind,
+        }
+        try:
+            # Locations disabled by an earlier run would otherwise stay silent
+            mon.restart_events()
+            for event, callback in callbacks.items():
+                mon.register_callback(tool, event, callback)
+            mask = 0
+            for event in callbacks:
+                mask |= event
+            mon.set_events(tool, mask)
+            return self._timed(call)
+        finally:
+            mon.set_events(tool, 0)
+            for event in callbacks:
+                mon.register_callback(tool, event, None)
+            mon.free_tool_id(tool)
+
+    def _run_settrace(self, call):
+        clock = time.perf_counter
+        mine = self.filename
+
+        def local(frame, event, arg):
+            now = clock()
+            if event == "line":
+                self._line(frame.f_code, frame.f_lineno, now)
+            elif event == "return":
+                self._exit(frame.f_code, now)
+            return local
+
+        def global_trace(frame, event, arg):
+            if event != "call" or frame.f_code.co_filename != mine:
+                return None
+            self._enter(frame.f_code, clock())
+            return local
+
+        self.backend = "settrace"
+        sys.settrace(global_trace)
+        try:
+            return self._timed(call)
+        finally:
+            sys.settrace(None)
+
+    def _run_cprofile(self, call):
+        self.backend = "cProfile"
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            return self._timed(call)
+        finally:
+            profile.disable()
+            for (filename, lineno, name), (cc, nc, tt, ct, callers) in pstats.Stats(profile).stats.items():
+                if filename == self.filename:
+                    self.functions[(name, lineno)] = [nc, ct]
+
+    def report(self, source_lines=None, top=5):
+        """
+        Heat-map ready structure: every profiled line with hits / time / share of total,
+        functions ranked by inclusive time, and the hottest line numbers.
+        """
+        total = self.total or 1e-12
+        lines = [
+            {
+                "line": lineno,
+                "hits": hits,
+                "time_ms": round(seconds * 1000, 4),
+                "percent": round(min(100.0, seconds / total * 100), 1),
+                "code": source_lines[lineno - 1] if source_lines and 0 < lineno <= len(source_lines) else ""
+            }
+            for lineno, (hits, seconds) in sorted(self.lines.items())
+        ]
+        functions = sorted((
+            {
+                "name": name,
+                "line": lineno,
+                "calls": calls,
+                "time_ms": round(seconds * 1000, 4),
+                "percent": round(min(100.0, seconds / total * 100), 1)
+            }
+            for (name, lineno), (calls, seconds) in self.functions.items()
+        ), key=lambda f: -f["time_ms"])
+        return {
+            "backend": self.backend,
+            "total_ms": round(self.total * 1000, 4),
+            "lines": lines,
+            "functions": functions,
+            "hottest_lines": [l["line"] for l in sorted(lines, key=lambda l: -l["time_ms"])[:top]]
+        }
@@ -0,0 +1,309 @@
+"""
+Project mode: audits a whole source tree instead of one code string.
+Each module is analyzed once (StructuralAnalyzer plus an import/call collector), in
+parallel and cached by content, then the parent builds the import and call graphs,
+rolls metrics up per package and flags cross-module hot paths.
+"""
+import ast
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from analyzer import analyze_logic, big_o_label
+from cache import get_default_cache, source_key
+from source import parse_source
+
+# Below this many changed modules, analyzing in-process beats starting workers
+PARALLEL_MIN_MODULES = 4
+
+SKIP_DIRS = ("__pycache__", ".git", ".hg", ".tox", ".venv", "venv", "node_modules", "build", "dist")
+
+class CallCollector(ast.NodeVisitor):
+    """
+    Imports, functions (with their deepest loop nesting) and call sites (with the loop
+    depth they sit under) for one module. Comprehensions count as loops here.
+    """
+    def __init__(self, module, is_package=False):
+        self.module = module
+        self.package = module if is_package else module.rpartition(".")[0]
+        self.imports = {}      # local alias -> dotted target (call resolution)
+        self.imported = []     # full dotted module of every import (import graph)
+        self.functions = {}    # qualname -> {"line", "loop_depth"}
+        self.calls = []        # {"caller", "callee", "line", "loop_depth"}
+        self.scope = []        # enclosing class / function names
+        self.depth = [0]       # loop depth per function frame
+
+    def _resolve_relative(self, module, level):
+        if not level:
+            return module
+        base = self.package.split(".") if self.package else []
+        base = base[:len(base) - (level - 1)] if level > 1 else base
+        return ".".join(base + ([module] if module else []))
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.imported.append(alias.name)
+            if alias.asname:
+                self.imports[alias.asname] = alias.name
+            else:
+                # `import pkg.algo` binds only `pkg`; pkg.algo.f() resolves through the attribute chain
+                head = alias.name.split(".")[0]
+                self.imports[head] = head
+
+    def visit_ImportFrom(self, node):
+        base = self._resolve_relative(node.module, node.level)
+        for alias in node.names:
+            if alias.name != "*":
+                self.imports[alias.asname or alias.name] = f"{base}.{alias.name}" if base else alias.name
+            # `from pkg import algo` may name a submodule; the graph keeps the longest module prefix
+            self.imported.append(f"{base}.{alias.name}" if base and alias.name != "*" else base or alias.name)
+
+    def visit_FunctionDef(self, node):
+        qualname = ".".join(self.scope + [node.name])
+        self.functions[qualname] = {"line": node.lineno, "loop_depth": 0}
+        self.scope.append(node.name)
+        self.depth.append(0)
+        self.generic_visit(node)
+        self.depth.pop()
+        self.scope.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        self.scope.append(node.name)
+        self.generic_visit(node)
+        self.scope.pop()
+
+    def _loop(self, node):
+        self.depth[-1] += 1
+        caller = self._caller()
+        if caller in self.functions and self.depth[-1] > self.functions[caller]["loop_depth"]:
+            self.functions[caller]["loop_depth"] = self.depth[-1]
+        self.generic_visit(node)
+        self.depth[-1] -= 1
+
+    visit_For = visit_AsyncFor = visit_While = _loop
+    visit_ListComp = visit_SetComp = visit_DictComp = visit_GeneratorExp = _loop
+
+    def _caller(self):
+        # Innermost enclosing function (classes only contribute to the qualname)
+        for i in range(len(self.scope), 0, -1):
+            qualname = ".".join(self.scope[:i])
+            if qualname in self.functions:
+                return qualname
+        return "<module>"
+
+    def visit_Call(self, node):
+        callee = _dotted(node.func)
+        if callee:
+            self.calls.append({"caller": self._caller(), "callee": callee,
+                               "line": node.lineno, "loop_depth": self.depth[-1]})
+        self.generic_visit(node)
+
+def _dotted(node):
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+def module_name(root, path):
+    rel = os.path.relpath(path, root)[:-3].replace(os.sep, ".")
+    if rel.endswith("__init__"):
+        rel = rel[:-len("__init__")].rstrip(".")
+    return rel or os.path.basename(os.path.abspath(root))
+
+def iter_modules(root):
+    """Yields (module name, path) for every .py file under root, in a stable order."""
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith("."))
+        for name in sorted(files):
+            if name.endswith(".py"):
+                path = os.path.join(dirpath, name)
+                yield module_name(root, path), path
+
+def analyze_module(name, code, is_package=False):
+    """Per-module record (JSON-safe, so it can be cached and shipped between processes)."""
+    source = parse_source(code)
+    stats = analyze_logic(source)
+    record = {
+        "module": name,
+        "lines": len(source.lines),
+        "error": stats.get("error"),
+        "complexity": stats.get("complexity", 0),
+        "max_nesting": stats.get("max_nesting", 0),
+        "health": stats.get("health", 0),
+        "big_o": stats.get("big_o", "O(1)"),
+        "max_loop_depth": stats.get("max_loop_depth", 0),
+        "issues": stats.get("issues", []),
+        "imports": {}, "imported": [], "functions": {}, "calls": []
+    }
+    if source.ok:
+        collector = CallCollector(name, is_package)
+        collector.visit(source.tree)
+        record.update(imports=collector.imports, imported=collector.imported, functions=collector.functions,
+                      calls=collector.calls)
+    return record
+
+def _analyze_task(args):
+    return analyze_module(*args)
+
+def _resolve(modules, module, caller, callee):
+    """Maps a call's dotted name to ("module", "qualname") inside the project, or None."""
+    record = modules[module]
+    parts = callee.split(".")
+    if parts[0] == "self" and "." in caller and len(parts) == 2:
+        # self.method() -> sibling method of the caller's class
+        candidate = f"{caller.rsplit('.', 1)[0]}.{parts[1]}"
+        return (module, candidate) if candidate in record["functions"] else None
+    if callee in record["functions"]:
+        return module, callee
+    target = record["imports"].get(parts[0])
+    if target is None:
+        return None
+    full = ".".join([target] + parts[1:]).split(".")
+    # Longest dotted prefix that is a project module; the rest names a function in it
+    for split in range(len(full) - 1, 0, -1):
+        mod, qualname = ".".join(full[:split]), ".".join(full[split:])
+        if mod in modules and qualname in modules[mod]["functions"]:
+            return mod, qualname
+    return None
+
+def _effective_depths(modules, edges):
+    """
+    Loop depth of each function including what it calls: a call at loop depth d to a
+    function of effective depth e costs d + e. Cycles (recursion) are cut.
+    Returns {(module, qualname): (depth, chain of "module:qualname")}.
+    """
+    by_caller = {}
+    for edge in edges:
+        by_caller.setdefault(edge["caller"], []).append(edge)
+    memo, visiting = {}, set()
+
+    def visit(key):
+        if key in memo:
+            return memo[key]
+        if key in visiting:
+            return 0, []
+        visiting.add(key)
+        best = (modules[key[0]]["functions"][key[1]]["loop_depth"], [])
+        for edge in by_caller.get(key, ()):
+            depth, chain = visit(edge["callee"])
+            if edge["loop_depth"] + depth > best[0]:
+                best = (edge["loop_depth"] + depth, [f"{edge['callee'][0]}:{edge['callee'][1]}"] + chain)
+        visiting.discard(key)
+        memo[key] = best
+        return best
+
+    for mod, record in modules.items():
+        for qualname in record["functions"]:
+            visit((mod, qualname))
+    return memo
+
+def _package_of(name, packages):
+    return name if name in packages else name.rpartition(".")[0] or "<root>"
+
+def analyze_project(root, workers=None, cache=None):
+    """
+    Walks `root` and returns the project report: per-module metrics, per-package
+    roll-ups, the import graph, resolved call edges and cross-module hot paths.
+    Unchanged modules are served from the cache instead of being re-analyzed.
+    """
+    cache = cache if cache is not None else get_default_cache()
+    modules, pending, keys = {}, [], {}
+    packages = set()
+    for name, path in iter_modules(root):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            code = f.read()
+        is_package = os.path.basename(path) == "__init__.py"
+        if is_package:
+            packages.add(name)
+        keys[name] = source_key(code, variant=f"project-module:{name}:{int(is_package)}")
+        cached = cache.get(keys[name])
+        if cached is not None:
+            modules[name] = dict(cached, path=path)
+        else:
+            pending.append((name, code, is_package, path))
+
+    if len(pending) >= PARALLEL_MIN_MODULES and (workers or os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            records = executor.map(_analyze_task, [p[:3] for p in pending], chunksize=4)
+            fresh = list(zip(pending, records))
+    else:
+        fresh = [(p, analyze_module(*p[:3])) for p in pending]
+    for (name, _, _, path), record in fresh:
+        cache.put(keys[name], record)
+        modules[name] = dict(record, path=path)
+
+    # --- Graphs ---
+    import_graph = {}
+    for name, record in modules.items():
+        deps = set()
+        for target in record["imported"]:
+            parts = target.split(".")
+            for split in range(len(parts), 0, -1):
+                candidate = ".".join(parts[:split])
+                if candidate in modules and candidate != name:
+                    deps.add(candidate)
+                    break
+        import_graph[name] = sorted(deps)
+
+    edges = []
+    for name, record in modules.items():
+        for call in record["calls"]:
+            if call["caller"] == "<module>":
+                continue
+            target = _resolve(modules, name, call["caller"], call["callee"])
+            if target:
+                edges.append({"caller": (name, call["caller"]), "callee": target,
+                              "line": call["line"], "loop_depth": call["loop_depth"]})
+
+    # --- Hot paths: a loop in one module driving an O(n²)+ function in another ---
+    effective = _effective_depths(modules, edges)
+    hot_paths = []
+    for edge in edges:
+        callee_depth, chain = effective[edge["callee"]]
+        if edge["loop_depth"] and callee_depth >= 2 and edge["callee"][0] != edge["caller"][0]:
+            hot_paths.append({
+                "caller": f"{edge['caller'][0]}:{edge['caller'][1]}",
+                "line": edge["line"],
+                "callee": f"{edge['callee'][0]}:{edge['callee'][1]}",
+                "callee_big_o": big_o_label(callee_depth),
+                "effective_depth": edge["loop_depth"] + callee_depth,
+                "effective_big_o": big_o_label(edge["loop_depth"] + callee_depth),
+                "via": chain
+            })
+    hot_paths.sort(key=lambda h: (-h["effective_depth"], h["caller"], h["line"]))
+
+    # --- Per-package roll-ups (health weighted by module size) ---
+    rollups = {}
+    for name, record in modules.items():
+        package = _package_of(name, packages)
+        roll = rollups.setdefault(package, {"modules": 0, "lines": 0, "complexity": 0, "functions": 0,
+                                            "max_loop_depth": 0, "_health": 0.0, "_weight": 0, "errors": 0})
+        roll["modules"] += 1
+        roll["lines"] += record["lines"]
+        roll["complexity"] += record["complexity"]
+        roll["functions"] += len(record["functions"])
+        roll["max_loop_depth"] = max(roll["max_loop_depth"], record["max_loop_depth"])
+        roll["_health"] += record["health"] * max(1, record["lines"])
+        roll["_weight"] += max(1, record["lines"])
+        roll["errors"] += bool(record["error"])
+    for roll in rollups.values():
+        roll["health"] = round(roll.pop("_health") / roll.pop("_weight"), 1)
+        roll["big_o"] = big_o_label(roll["max_loop_depth"])
+
+    return {
+        "root": os.path.abspath(root),
+        "modules": {name: {k: v for k, v in record.items() if k not in ("calls", "imports", "imported")}
+                    for name, record in sorted(modules.items())},
+        "packages": dict(sorted(rollups.items())),
+        "import_graph": import_graph,
+        "call_graph": [{"caller": f"{e['caller'][0]}:{e['caller'][1]}", "callee": f"{e['callee'][0]}:{e['callee'][1]}",
+                        "line": e["line"], "in_loop": e["loop_depth"] > 0} for e in edges],
+        "hot_paths": hot_paths,
+        "analyzed": len(pending),
+        "cached": len(modules) - len(pending)
+    }
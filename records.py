@@ -0,0 +1,193 @@
+"""
+Typed result records shared by the analyzer, executor, grader and report writers.
+
+Every stage used to hand loose dicts to the next one, re-keying them on the way.
+These are slotted dataclasses instead: smaller per result (no per-instance
+__dict__), cheap to pickle across the sandbox / worker process boundary, and
+with one agreed set of field names. They still answer the mapping protocol
+(res["behavior"], res.get("latency"), {**res}) so templates and JSONL consumers
+keep working; a field that is None counts as absent.
+
+dumps/loads is a compact JSON form (records as positional arrays tagged with
+their type), pack/unpack the same zlib-compressed, for the scan cache.
+"""
+import dataclasses
+import json
+import zlib
+from dataclasses import dataclass, field
+
+PASS, FAIL, ERROR = "✅ PASS", "❌ FAIL", "⚠️ ERROR"
+
+_TYPES = {}
+_FIELDS = {}
+
+class Record:
+    """Mapping-style access over a slotted dataclass; None fields read as missing."""
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _TYPES[cls.__name__] = cls
+
+    @classmethod
+    def field_names(cls):
+        names = _FIELDS.get(cls)
+        if names is None:
+            names = _FIELDS[cls] = tuple(f.name for f in dataclasses.fields(cls))
+        return names
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds a record from a plain dict, ignoring keys it has no field for."""
+        names = cls.field_names()
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+    def __getitem__(self, key):
+        if key not in self.field_names():
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.field_names():
+            raise KeyError(f"{type(self).__name__} has no field '{key}'")
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.field_names() and getattr(self, key) is not None
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if key in self.field_names() else None
+        return default if value is None else value
+
+    def keys(self):
+        return [name for name in self.field_names() if getattr(self, name) is not None]
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self.keys()]
+
+    def to_dict(self):
+        """Shallow plain dict of the set fields (nested records stay records)."""
+        return dict(self.items())
+
+    def __reduce__(self):
+        # Positional pickling: no per-field names on the wire
+        return type(self), tuple(getattr(self, name) for name in self.field_names())
+
+    def replace(self, **changes):
+        return dataclasses.replace(self, **changes)
+
+@dataclass(slots=True)
+class AnalysisStats(Record):
+    """Static structure of one source file (StructuralAnalyzer / analyze_logic)."""
+    loops: int = 0
+    functions: int = 0
+    max_nesting: int = 0
+    complexity: int = 1
+    dead_code: int = 0
+    long_functions: list = field(default_factory=list)
+    issues: list = field(default_factory=list)
+    big_o: str = "O(1)"
+    max_loop_depth: int = 0
+    loop_depths: dict = field(default_factory=dict)
+    deepest_functions: list = field(default_factory=list)
+    node_counts: dict = field(default_factory=dict)
+    function_nodes: dict = field(default_factory=dict)
+    ai_probability: int = 0
+    human_probability: int = 100
+    origin_reasons: list = field(default_factory=list)
+    health: int = 100
+    complexity_label: str = None
+    error: str = None
+
+@dataclass(slots=True)
+class CaseResult(Record):
+    """One executed test case; scenario/verdict/expected are filled in by grading."""
+    status: str
+    output: str = None
+    digest: str = None
+    runtime: str = None
+    error: str = None
+    memory: dict = None
+    benchmark: dict = None
+    scenario: str = None
+    verdict: str = None
+    expected: str = None
+
+    @property
+    def passed(self):
+        return self.verdict == PASS
+
+@dataclass(slots=True)
+class Grades(Record):
+    """calculate_score output: weighted total, verdict and the sub-scores behind it."""
+    accuracy: int
+    v_str: str
+    v_desc: str
+    complexity: str = "O(N)"
+    memory: str = "N/A"
+    memory_score: int = None
+    correctness: int = None
+    efficiency: int = None
+    readability: int = None
+    antipatterns: list = field(default_factory=list)
+    suggs: list = field(default_factory=list)
+
+@dataclass(slots=True)
+class ScanResult(Record):
+    """The full scan bundle (run_scan); v_* are set once the verdict is themed."""
+    origin: AnalysisStats
+    behavior: list
+    accuracy: int
+    grades: Grades
+    code: str
+    suggs: list = field(default_factory=list)
+    complexity: str = "O(N)"
+    memory: str = "N/A"
+    latency: dict = None
+    empirical_complexity: dict = None
+    hotspots: dict = None
+    v_str: str = None
+    v_desc: str = None
+    v_color: str = None
+
+# --- Serialization ---
+
+def _encode(value):
+    if isinstance(value, Record):
+        values = [_encode(getattr(value, name)) for name in value.field_names()]
+        while values and values[-1] is None:
+            values.pop()
+        return {"@": type(value).__name__, "v": values}
+    if isinstance(value, dict):
+        return {str(k): _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    return value
+
+def _decode(value):
+    if isinstance(value, dict):
+        if "@" in value and "v" in value and value["@"] in _TYPES:
+            return _TYPES[value["@"]](*[_decode(v) for v in value["v"]])
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+def dumps(value):
+    """Compact JSON bytes; records become type-tagged positional arrays."""
+    return json.dumps(_encode(value), separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+def loads(data):
+    return _decode(json.loads(data))
+
+def pack(value, level=6):
+    return zlib.compress(dumps(value), level)
+
+def unpack(data):
+    return loads(zlib.decompress(data))
+
+def json_default(value):
+    """`default=` hook for json.dump(s): records serialize as plain objects of their set fields."""
+    if isinstance(value, Record):
+        return value.to_dict()
+    return str(value)
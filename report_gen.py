@@ -1,29 +1,130 @@
-from fpdf import FPDF
+"""
+Audit report rendering: PDF (fpdf), streaming HTML and JSON.
+Every writer takes a path or an open stream; render_reports fans a batch of scan
+results out over worker processes and writes one file per result.
+"""
+import hashlib
+import html
+import io
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
-def generate_pdf_report(res):
+from records import PASS, json_default
+
+FORMATS = ("pdf", "html", "json")
+
+# Courier 8pt fits ~110 characters on an A4 line inside the margins
+SOURCE_LINE_CHARS = 110
+# Source lines per HTML chunk written to the stream
+HTML_CHUNK_LINES = 500
+# Largest functions (by AST node count) listed in the structure breakdown
+STRUCTURE_TOP_FUNCTIONS = 10
+
+def _ascii(text):
+    # Core PDF fonts are latin-1 only; strip emojis / markdown noise
+    return str(text).encode('ascii', 'ignore').decode('ascii').replace("**", "").strip()
+
+def _latin1(text):
+    return str(text).encode('latin-1', 'replace').decode('latin-1')
+
+def _as_scan(res):
+    """
+    Scan-bundle view of a report input. Full scans (UI, server, `audit --full`) pass through,
+    with the verdict taken from their grades when it was never themed; compact audit summaries
+    (intellicodex.summarize) are mapped onto the same fields.
+    """
+    if res.get('grades') is None and ('score' in res or 'error' in res):
+        return {
+            "accuracy": res.get('pass_rate') or 0,
+            "v_str": res.get('verdict') or ("ERROR" if res.get('error') else None),
+            "complexity": res.get('complexity'),
+            "memory": res.get('memory'),
+            "origin": {"big_o": res.get('big_o'), "issues": res.get('issues') or []},
+            "suggs": res.get('suggestions') or [],
+            "code": res.get('code'),
+        }
+    if res.get('v_str') is None and res.get('grades'):
+        from grader import get_final_verdict
+        res = dict(res, v_str=get_final_verdict(res['grades'])[0])
+    return res
+
+def _passed(res):
+    behavior = res.get('behavior') or []
+    return sum(1 for r in behavior if r.get('verdict') == PASS), len(behavior)
+
+def _metrics(res):
+    """(label, value) rows shared by every format."""
+    passed, total = _passed(res)
+    rows = [
+        ("Computational Complexity", res.get('complexity', 'O(N)')),
+        ("Static Big-O", res.get('origin', {}).get('big_o', 'N/A')),
+        ("Peak Memory", res.get('memory', 'N/A')),
+        ("Tests Passed", f"{passed}/{total}"),
+    ]
+    latency = res.get('latency')
+    if latency:
+        rows.append(("Median Latency", f"{latency['median_ms']:.3f} ms (p95 {latency['p95_ms']:.3f} ms)"))
+    empirical = res.get('empirical_complexity') or {}
+    if empirical.get('best_fit'):
+        rows.append(("Measured Growth", f"{empirical['best_fit']} (confidence {empirical['confidence']:.0%})"))
+    return rows
+
+def _structure(res):
+    """(category counts, [(function, total nodes, counts)] for the largest functions)."""
+    origin = res.get('origin') or {}
+    functions = sorted(((name, sum(counts.values()), counts) for name, counts in origin.get('function_nodes', {}).items()),
+                       key=lambda f: -f[1])
+    return origin.get('node_counts', {}), functions[:STRUCTURE_TOP_FUNCTIONS]
+
+def _output_stream(out, binary):
+    """(stream, should_close) for a path or an already-open stream."""
+    if isinstance(out, (str, os.PathLike)):
+        return open(out, "wb" if binary else "w", **({} if binary else {"encoding": "utf-8"})), True
+    return out, False
+
+# --- PDF ---
+
+def _write_source(pdf, code):
+    """Source listing one numbered line per cell so pagination is incremental (no giant multi_cell)."""
+    pdf.set_font("Courier", '', 8)
+    pdf.set_fill_color(250, 250, 250)
+    width = len(str(code.count("\n") + 1))
+    for number, line in enumerate(code.splitlines() or [""], start=1):
+        text = _latin1(f"{number:>{width}} | {line.expandtabs(4)}")
+        if len(text) <= SOURCE_LINE_CHARS:
+            pdf.cell(0, 4, text, 0, 1, 'L', True)
+        else:
+            pdf.multi_cell(0, 4, text, 0, 'L', True)
+
+def build_pdf(res):
+    from fpdf import FPDF
+    res = _as_scan(res)
     pdf = FPDF()
+    pdf.set_auto_page_break(True, margin=15)
     pdf.add_page()
-    
+
     # 🎨 HEADER - Evergreen Theme
-    pdf.set_fill_color(56, 82, 76) 
+    pdf.set_fill_color(56, 82, 76)
     pdf.rect(0, 0, 210, 40, 'F')
     pdf.set_font("Arial", 'B', 22)
     pdf.set_text_color(255, 255, 255)
     pdf.set_y(15)
     pdf.cell(0, 10, "INTELLICODEX: ARCHITECTURAL AUDIT", 0, 1, 'C')
-    
+
     # --- 1. ARCHITECTURAL GRADING ---
     pdf.set_y(50)
     pdf.set_text_color(0, 0, 0)
     pdf.set_font("Arial", 'B', 14)
     pdf.cell(0, 10, "SYSTEM ARCHITECTURAL GRADE", 0, 1)
-    
+
     score = res.get('accuracy', 0)
     pdf.set_fill_color(230, 230, 230)
     pdf.rect(10, 62, 190, 8, 'F')
     pdf.set_fill_color(56, 82, 76)
     pdf.rect(10, 62, (190 * (score/100)), 8, 'F')
-    
+
     pdf.set_y(72)
     pdf.set_font("Arial", 'B', 11)
     pdf.cell(0, 10, f"Verdict: {res.get('v_str')} | Integrity Score: {score}%", 0, 1)
@@ -33,39 +134,180 @@ def generate_pdf_report(res):
     pdf.set_font("Arial", 'B', 12)
     pdf.set_text_color(63, 119, 140)
     pdf.cell(0, 10, "TECHNICAL PERFORMANCE METRICS", 0, 1)
-    
+
     pdf.set_font("Arial", '', 10)
     pdf.set_text_color(0, 0, 0)
-    pdf.cell(0, 7, f"- Computational Complexity: {res.get('complexity', 'O(N)')}", 0, 1)
-    
-    # Pulling Radar Data node counts
-    nodes = res.get('origin', {}).get('node_counts', {"Logic": 0, "Structure": 0, "Data": 0})
+    for label, value in _metrics(res):
+        pdf.cell(0, 7, _latin1(f"- {label}: {value}"), 0, 1)
+
+    # AST structure: category histogram plus the largest functions
+    nodes, functions = _structure(res)
     for cat, val in nodes.items():
         pdf.cell(0, 7, f"- {cat} Node Count: {val}", 0, 1)
+    for name, total, counts in functions:
+        breakdown = ", ".join(f"{cat} {val}" for cat, val in counts.items() if val)
+        pdf.cell(0, 7, _latin1(f"- {name}(): {total} nodes ({breakdown})"), 0, 1)
 
     # --- 3. EVOLUTION STRATEGY (Suggestions) ---
     pdf.ln(5)
     pdf.set_fill_color(230, 230, 230)
     pdf.set_font("Arial", 'B', 12)
     pdf.cell(0, 10, " NEURAL EVOLUTION ROADMAP", 0, 1, 'L', True)
-    
+
     pdf.set_font("Arial", '', 10)
     suggs = res.get('suggs', ["Follow PEP8 and modularize logic."])
     for s in suggs:
-        # Strip potential emojis to prevent font errors
-        clean_s = str(s).encode('ascii', 'ignore').decode('ascii')
-        pdf.multi_cell(0, 7, f"> {clean_s}")
+        pdf.multi_cell(0, 7, f"> {_ascii(s)}")
 
     # --- 4. SOURCE CODE ARCHIVE ---
     pdf.ln(10)
     pdf.set_font("Arial", 'B', 12)
     pdf.cell(0, 10, "AUDITED SOURCE CODE SNAPSHOT", 0, 1)
-    
-    pdf.set_font("Courier", '', 8)
-    pdf.set_fill_color(250, 250, 250)
-    code_text = res.get('code', 'No code provided.')
-    pdf.multi_cell(0, 4, code_text, border=1, fill=True)
+    _write_source(pdf, res.get('code') or 'No code provided.')
+    return pdf
 
-    # Output handling
+def _pdf_bytes(pdf):
+    # fpdf 1.x returns a latin-1 str, fpdf2 a bytearray
     pdf_out = pdf.output(dest='S')
     return pdf_out.encode('latin-1', 'ignore') if isinstance(pdf_out, str) else bytes(pdf_out)
+
+def write_pdf_report(res, out):
+    """
+    Renders the PDF into `out`. A path is written by fpdf itself, with no bytes copy in
+    between; fpdf has no stream writer, so an open binary stream gets the serialized document.
+    """
+    pdf = build_pdf(res)  # laid out before the file is opened, so a failure leaves no empty file
+    if isinstance(out, (str, os.PathLike)):
+        pdf.output(name=os.fspath(out), dest='F')
+    else:
+        out.write(_pdf_bytes(pdf))
+
+def generate_pdf_report(res):
+    """PDF report as bytes, for download buttons and HTTP bodies; files should use write_pdf_report."""
+    return _pdf_bytes(build_pdf(res))
+
+# --- HTML ---
+
+def iter_html_report(res):
+    """Yields the HTML report in chunks; the source is escaped HTML_CHUNK_LINES lines at a time."""
+    res = _as_scan(res)
+    esc = html.escape
+    score = res.get('accuracy', 0)
+    yield (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>IntelliCodex Audit</title>"
+        "<style>body{font-family:sans-serif;margin:0;color:#222}header{background:#38524C;color:#fff;padding:20px 30px}"
+        "main{padding:20px 30px}.bar{background:#e6e6e6;height:10px}.fill{background:#38524C;height:10px}"
+        "pre{background:#fafafa;border:1px solid #ddd;padding:10px;font-size:12px;overflow-x:auto}"
+        "pre span{color:#999;user-select:none}td{padding:2px 12px 2px 0}</style></head><body>"
+        "<header><h1>INTELLICODEX: ARCHITECTURAL AUDIT</h1></header><main>"
+    )
+    yield (
+        f"<h2>System Architectural Grade</h2><div class='bar'><div class='fill' style='width:{max(0, min(100, score))}%'></div></div>"
+        f"<p><b>Verdict: {esc(str(res.get('v_str')))} | Integrity Score: {score}%</b></p>"
+    )
+    yield "<h2>Technical Performance Metrics</h2><table>"
+    for label, value in _metrics(res):
+        yield f"<tr><td>{esc(label)}</td><td>{esc(str(value))}</td></tr>"
+    nodes, functions = _structure(res)
+    for cat, val in nodes.items():
+        yield f"<tr><td>{esc(str(cat))} Node Count</td><td>{val}</td></tr>"
+    yield "</table>"
+    if functions:
+        yield "<h3>Largest Functions (AST nodes)</h3><table><tr><th>Function</th><th>Total</th>" + \
+            "".join(f"<th>{esc(cat)}</th>" for cat in nodes) + "</tr>"
+        for name, total, counts in functions:
+            yield f"<tr><td>{esc(name)}</td><td>{total}</td>" + \
+                "".join(f"<td>{counts.get(cat, 0)}</td>" for cat in nodes) + "</tr>"
+        yield "</table>"
+    yield "<h2>Neural Evolution Roadmap</h2><ul>"
+    for s in res.get('suggs', []):
+        yield f"<li>{esc(str(s))}</li>"
+    yield "</ul><h2>Audited Source Code Snapshot</h2><pre>"
+
+    lines = (res.get('code') or '').splitlines()
+    width = len(str(len(lines)))
+    for start in range(0, len(lines), HTML_CHUNK_LINES):
+        yield "".join(
+            f"<span>{n:>{width}} </span>{esc(line)}\n"
+            for n, line in enumerate(lines[start:start + HTML_CHUNK_LINES], start=start + 1)
+        )
+    yield "</pre></main></body></html>"
+
+def write_html_report(res, out):
+    """Streams the HTML report into `out` (path or text stream)."""
+    stream, close = _output_stream(out, binary=False)
+    try:
+        for chunk in iter_html_report(res):
+            stream.write(chunk)
+    finally:
+        if close:
+            stream.close()
+
+def generate_html_report(res):
+    buffer = io.StringIO()
+    write_html_report(res, buffer)
+    return buffer.getvalue()
+
+# --- JSON ---
+
+def write_json_report(res, out):
+    """Writes the scan bundle as JSON into `out` (path or text stream)."""
+    stream, close = _output_stream(out, binary=False)
+    try:
+        json.dump(res, stream, default=json_default, ensure_ascii=False)
+    finally:
+        if close:
+            stream.close()
+
+def generate_json_report(res):
+    return json.dumps(res, default=json_default, ensure_ascii=False)
+
+WRITERS = {"pdf": write_pdf_report, "html": write_html_report, "json": write_json_report}
+
+def write_report(res, out, fmt="pdf"):
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown report format '{fmt}' (expected one of {', '.join(FORMATS)})")
+    WRITERS[fmt](res, out)
+
+def _report_stem(name, taken):
+    """File-system-safe file stem for a report id, unique (case-insensitively) within `taken`."""
+    text = str(name)
+    stem = "".join(c if c.isalnum() or c in "-_." else "_" for c in text)
+    if stem != text:
+        # Sanitizing is lossy (a/b.py and a_b.py look alike): tag with a hash of the real id
+        stem += "-" + hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=4).hexdigest()
+    unique, n = stem, 1
+    while unique.casefold() in taken:
+        # Same id twice in the input
+        n += 1
+        unique = f"{stem}-{n}"
+    taken.add(unique.casefold())
+    return unique
+
+def _render_one(name, stem, res, out_dir, fmt):
+    path = os.path.join(out_dir, f"{stem}.{fmt}")
+    try:
+        write_report(res, path, fmt)
+    except Exception as e:
+        return name, None, f"{type(e).__name__}: {e}"
+    return name, path, None
+
+def render_reports(results, out_dir, fmt="pdf", workers=None, window=None):
+    """
+    Writes one report per (name, scan result) pair into out_dir using worker processes.
+    Consumes `results` lazily with at most `window` reports in flight, and yields
+    (name, path or None, error or None) in input order as each one is written.
+    Every name gets its own file, even when two ids sanitize to the same text.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    window = window or workers * 2
+    taken = set()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for name, res in results:
+            in_flight.append(executor.submit(_render_one, name, _report_stem(name, taken), res, out_dir, fmt))
+            if len(in_flight) >= window:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
@@ -0,0 +1,143 @@
+import ast
+
+from source import parse_source, UnitCache
+
+# Registered rules, and node type -> rules interested in it (built as rules register)
+RULES = []
+_DISPATCH = {}
+
+# Per-function/class findings keyed by (source fingerprint, rule count), lines relative to the unit
+_unit_cache = UnitCache()
+
+LOOP_NODES = (ast.For, ast.AsyncFor, ast.While)
+COMPREHENSION_NODES = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+
+class Rule:
+    def __init__(self, rule_id, node_types, priority, message, category, check):
+        self.id = rule_id
+        self.node_types = node_types
+        self.priority = priority
+        self.message = message
+        self.category = category
+        self.check = check
+
+class RuleContext:
+    """
+    Traversal state handed to every check: how many loops enclose the node inside the
+    current function, the enclosing function node, and ids of expressions used as
+    `with` context managers. `state` is scratch space rules share within one scope: the
+    module-level statements of a scan, or one function body.
+    """
+    def __init__(self):
+        self.loop_depth = 0
+        self.function = None
+        self.managed = set()
+        self.state = {}
+
+def rule(rule_id, node_types, priority=50, message="", category="style"):
+    """
+    Registers check(node, ctx) for the given AST node types. The check returns a falsy
+    value (no finding), True (finding with the rule's message), or a dict of finding
+    fields (e.g. a more specific "message" or a "cost" estimate).
+    Higher priority findings are reported first.
+    """
+    if isinstance(node_types, type):
+        node_types = (node_types,)
+
+    def register(check):
+        entry = Rule(rule_id, node_types, priority, message, category, check)
+        RULES.append(entry)
+        for node_type in node_types:
+            _DISPATCH.setdefault(node_type, []).append(entry)
+        return check
+    return register
+
+def _children(node, depth, function):
+    """Child nodes with the loop depth / function they execute under."""
+    if isinstance(node, FUNCTION_NODES):
+        # A function body runs when called, not once per enclosing loop iteration
+        for child in ast.iter_child_nodes(node):
+            in_body = child not in getattr(node, "decorator_list", ()) and child is not node.args
+            yield child, (0 if in_body else depth), (node if in_body else function)
+    elif isinstance(node, (ast.For, ast.AsyncFor)):
+        yield node.target, depth, function
+        yield node.iter, depth, function
+        for child in node.body:
+            yield child, depth + 1, function
+        for child in node.orelse:
+            yield child, depth, function
+    elif isinstance(node, ast.While):
+        yield node.test, depth + 1, function
+        for child in node.body:
+            yield child, depth + 1, function
+        for child in node.orelse:
+            yield child, depth, function
+    elif isinstance(node, COMPREHENSION_NODES):
+        # The first iterable is evaluated once; everything else runs per item
+        first = node.generators[0]
+        yield first.iter, depth, function
+        yield first.target, depth + 1, function
+        for child in first.ifs:
+            yield child, depth + 1, function
+        for child in ast.iter_child_nodes(node):
+            if child is not first:
+                yield child, depth + 1, function
+    elif isinstance(node, ast.comprehension):
+        for child in ast.iter_child_nodes(node):
+            yield child, depth, function
+    else:
+        for child in ast.iter_child_nodes(node):
+            yield child, depth, function
+
+def _scan_node(root, depth=0, function=None, state=None):
+    """Runs every registered rule over one subtree in a single (iterative) pass."""
+    findings = []
+    ctx = RuleContext()
+    stack = [(root, depth, function, ctx.state if state is None else state)]
+    while stack:
+        node, ctx.loop_depth, ctx.function, outer = stack.pop()
+        # A function body is its own scope: names tracked outside it don't carry in (or back out)
+        ctx.state = {} if isinstance(node, FUNCTION_NODES) else outer
+        for entry in _DISPATCH.get(type(node), ()):
+            outcome = entry.check(node, ctx)
+            if not outcome:
+                continue
+            finding = {
+                "rule": entry.id,
+                "category": entry.category,
+                "priority": entry.priority,
+                "line": getattr(node, "lineno", 0),
+                "message": entry.message
+            }
+            if isinstance(outcome, dict):
+                finding.update(outcome)
+            findings.append(finding)
+        # Reversed so siblings are visited in source order
+        stack.extend(reversed([(child, child_depth, child_function, ctx.state if child_function is node else outer)
+                               for child, child_depth, child_function in _children(node, ctx.loop_depth, ctx.function)]))
+    return findings
+
+def _unit_findings(node):
+    base = node.lineno
+    return [dict(f, line=f["line"] - base) for f in _scan_node(node)]
+
+def run_rules(code):
+    """
+    All findings for a submission, sorted by priority then line.
+    Unchanged top-level functions/classes answer from the unit cache.
+    """
+    source = parse_source(code)
+    if not source.ok:
+        return []
+    findings = []
+    # Top-level statements share one scope, so `xs = [...]` still informs a later module-level loop
+    module_state = {}
+    for node, fingerprint in source.units:
+        if fingerprint is None:
+            findings.extend(_scan_node(node, state=module_state))
+            continue
+        cached = _unit_cache.get_or_compute((fingerprint, len(RULES)), lambda: _unit_findings(node))
+        findings.extend(dict(f, line=f["line"] + node.lineno) for f in cached)
+    findings.sort(key=lambda f: (-f["priority"], f["line"], f["rule"]))
+    return findings
@@ -0,0 +1,237 @@
+import atexit
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, wall-clock kill still applies
+    resource = None
+
+# Default per-task limits (overridable per pool / per call)
+WALL_TIMEOUT = 2.0
+CPU_LIMIT = 2
+MEMORY_LIMIT_MB = 256
+
+LIMIT_STATUSES = ("Timeout", "MemoryLimit")
+
+# How often a waiting run() checks its cancel event
+CANCEL_POLL = 0.05
+
+def _current_vm_bytes():
+    """Address space already mapped by this process (Linux); 0 when unknown."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmSize:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+def _apply_memory_limit(memory_limit_mb):
+    if resource is None or not memory_limit_mb:
+        return
+    # The forked worker already maps the parent's heap, so the budget sits on top of it
+    limit = _current_vm_bytes() + memory_limit_mb * 1024 * 1024
+    try:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError):
+        pass
+
+def _arm_cpu_limit(cpu_limit):
+    """RLIMIT_CPU is cumulative, so the soft limit is set relative to time already used."""
+    if resource is None or not cpu_limit:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime)
+    try:
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        soft = used + int(cpu_limit) + 1
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    except (ValueError, OSError):
+        pass
+
+def _disarm_cpu_limit():
+    if resource is None:
+        return
+    try:
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+    except (ValueError, OSError):
+        pass
+
+def _worker_main(conn, memory_limit_mb):
+    """Worker loop: receive (fn, args, cpu_limit), run it, send the result dict back."""
+    _apply_memory_limit(memory_limit_mb)
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+
+        fn, args, cpu_limit = task
+        _arm_cpu_limit(cpu_limit)
+        try:
+            result = fn(*args)
+        except MemoryError:
+            result = {"status": "MemoryLimit", "error": f"MemoryLimit: exceeded {memory_limit_mb} MB"}
+        except Exception as e:
+            result = {"status": "Fail", "error": f"{type(e).__name__}: {e}"}
+        finally:
+            _disarm_cpu_limit()
+
+        try:
+            conn.send(result)
+        except MemoryError:
+            conn.send({"status": "MemoryLimit", "error": f"MemoryLimit: exceeded {memory_limit_mb} MB"})
+        except Exception as e:
+            conn.send({"status": "Fail", "error": f"Unserializable result: {e}"})
+
+def _hit_limit(result):
+    """A task result is a status dict / record or a list of them (batched cases)."""
+    results = result if isinstance(result, list) else [result]
+    return any(hasattr(r, "get") and r.get("status") in LIMIT_STATUSES for r in results)
+
+class _Worker:
+    def __init__(self, ctx, memory_limit_mb):
+        self.ctx = ctx
+        self.memory_limit_mb = memory_limit_mb
+        self.spawn()
+
+    def spawn(self):
+        self.conn, child_conn = self.ctx.Pipe()
+        self.process = self.ctx.Process(target=_worker_main, args=(child_conn, self.memory_limit_mb), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        try:
+            self.process.kill()
+            self.process.join(1)
+        except (OSError, ValueError, AttributeError):
+            pass
+        self.conn.close()
+
+    def respawn(self):
+        self.kill()
+        self.spawn()
+
+class SandboxPool:
+    """
+    Pool of pre-forked worker processes for running untrusted code.
+    Each task gets a wall-clock timeout and a CPU-time limit; each worker has an
+    address-space limit. A worker that hits a limit is killed and replaced.
+    """
+    def __init__(self, workers=None, wall_timeout=WALL_TIMEOUT, cpu_limit=CPU_LIMIT, memory_limit_mb=MEMORY_LIMIT_MB):
+        self.wall_timeout = wall_timeout
+        self.cpu_limit = cpu_limit
+        self.memory_limit_mb = memory_limit_mb
+        # Workers are children of this process only; a fork inherits the handles, not the children
+        self.owner_pid = os.getpid()
+        methods = multiprocessing.get_all_start_methods()
+        self.ctx = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+        self._idle = queue.Queue()
+        self._workers = []
+        for _ in range(workers or os.cpu_count() or 1):
+            worker = _Worker(self.ctx, memory_limit_mb)
+            self._workers.append(worker)
+            self._idle.put(worker)
+
+    @property
+    def size(self):
+        return len(self._workers)
+
+    def run(self, fn, *args, timeout=None, cpu_limit=None, cancel=None):
+        """
+        Runs fn(*args) in a worker and returns its result (a status dict or a list of them), or a
+        {"status": "Timeout" | "MemoryLimit" | "Fail", "error": ...} dict when a limit trips.
+        fn must be a module-level function so it can be sent to the worker.
+        Setting `cancel` (a threading.Event) stops the task early: its worker is replaced and
+        the result is {"status": "Cancelled", ...}.
+        """
+        timeout = self.wall_timeout if timeout is None else timeout
+        cpu_limit = self.cpu_limit if cpu_limit is None else cpu_limit
+        worker = self._idle.get()
+        try:
+            if not worker.process.is_alive():
+                worker.respawn()
+            try:
+                worker.conn.send((fn, args, cpu_limit))
+                if not self._wait(worker, timeout, cancel):
+                    worker.respawn()
+                    if cancel is not None and cancel.is_set():
+                        return {"status": "Cancelled", "error": "Cancelled before the task finished"}
+                    return {"status": "Timeout", "error": f"Timeout: exceeded {timeout:g}s wall-clock limit"}
+                result = worker.conn.recv()
+            except (EOFError, OSError, BrokenPipeError):
+                result = self._death_status(worker)
+                worker.respawn()
+                return result
+
+            if _hit_limit(result):
+                worker.respawn()
+            return result
+        finally:
+            self._idle.put(worker)
+
+    @staticmethod
+    def _wait(worker, timeout, cancel):
+        """True once the worker has a result; False on timeout or when `cancel` is set."""
+        if cancel is None:
+            return worker.conn.poll(timeout)
+        deadline = time.monotonic() + timeout
+        while not cancel.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if worker.conn.poll(min(remaining, CANCEL_POLL)):
+                return True
+        return False
+
+    def _death_status(self, worker):
+        worker.process.join(1)
+        code = worker.process.exitcode
+        if code == -getattr(signal, "SIGXCPU", -1):
+            return {"status": "Timeout", "error": f"Timeout: exceeded {self.cpu_limit}s CPU limit"}
+        if code == -getattr(signal, "SIGKILL", -1):
+            return {"status": "MemoryLimit", "error": "MemoryLimit: worker was killed (out of memory)"}
+        return {"status": "Fail", "error": f"Sandbox worker crashed (exit code {code})"}
+
+    def shutdown(self):
+        if os.getpid() != self.owner_pid:
+            return
+        for worker in self._workers:
+            try:
+                worker.conn.send(None)
+            except (OSError, ValueError):
+                pass
+            worker.kill()
+        self._workers = []
+
+_default_pool = None
+_default_lock = threading.Lock()
+
+def get_default_pool():
+    """
+    Process-wide sandbox pool, created on first use (and again in a forked child, e.g. a
+    batch-audit worker, since the parent's workers are not its children).
+    INTELLICODEX_SANDBOX_WORKERS sets the worker count.
+    """
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None or _default_pool.owner_pid != os.getpid():
+            workers = int(os.environ.get("INTELLICODEX_SANDBOX_WORKERS", 0)) or None
+            _default_pool = SandboxPool(workers=workers)
+            atexit.register(_default_pool.shutdown)
+        return _default_pool
@@ -0,0 +1,191 @@
+import math
+import random
+import signal
+import threading
+import time
+
+from source import parse_source
+from sandbox import get_default_pool
+from executor import load_module, benchmark_call, resolve_entry_point, CaseTimeout
+from testgen import infer_input_kinds, make_scaled_input
+
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000)
+
+# Per-size and whole-sweep time budgets (seconds) inside the sandbox worker
+SIZE_BUDGET = 1.0
+SWEEP_BUDGET = 8.0
+
+# Candidate growth models: label -> f(n)
+MODELS = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": lambda n: math.log2(n),
+    "O(n)": lambda n: float(n),
+    "O(n log n)": lambda n: n * math.log2(n),
+    "O(n²)": lambda n: float(n) ** 2,
+    "O(n³)": lambda n: float(n) ** 3,
+}
+
+# A richer model must beat a simpler one by more than this (error * ratio + noise) to win
+TIE_RATIO = 1.25
+TIE_NOISE = 0.05
+# A model whose fitted time grows less than this fraction over the sweep is a constant
+FLAT_GROWTH = 0.5
+# Below this confidence the fit is not reported
+MIN_CONFIDENCE = 0.3
+
+def _predict(points, n_next):
+    """Extrapolates the next timing from the local slope of the last two points (log-log)."""
+    (n1, t1), (n2, t2) = points[-2], points[-1]
+    if t1 <= 0 or t2 <= 0:
+        return t2
+    slope = max(0.0, math.log(t2 / t1) / math.log(n2 / n1))
+    return t2 * (n_next / n2) ** slope
+
+def measure_scaling_in_process(code, func_name, kinds, sizes=DEFAULT_SIZES, seed=0,
+                               size_budget=SIZE_BUDGET, sweep_budget=SWEEP_BUDGET):
+    """
+    Times the function at each input size (module initialized once).
+    Stops before sizes predicted to blow the per-size budget.
+    Returns {"points": [[n, seconds], ...], "stopped_at": n or None, "error": str or None}.
+    """
+    try:
+        namespace, _ = load_module(code)
+    except Exception as e:
+        return {"points": [], "stopped_at": None, "error": f"{type(e).__name__}: {e}"}
+    func = namespace.get(func_name)
+    if not callable(func):
+        return {"points": [], "stopped_at": None, "error": f"Function '{func_name}' not found"}
+
+    rng = random.Random(seed)
+    points = []
+    started = time.perf_counter()
+    use_alarm = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+    def _on_alarm(signum, frame):
+        raise CaseTimeout()
+
+    for n in sizes:
+        remaining = sweep_budget - (time.perf_counter() - started)
+        if remaining <= 0 or (len(points) >= 2 and _predict(points, n) > size_budget):
+            return {"points": points, "stopped_at": n, "error": None}
+
+        args = make_scaled_input(kinds, n, rng)
+        if use_alarm:
+            previous_handler = signal.signal(signal.SIGALRM, _on_alarm)
+            signal.setitimer(signal.ITIMER_REAL, min(remaining, size_budget * 3))
+        try:
+            # benchmark_call hands a mutating func (nums.pop(), in-place sort) a fresh copy per call
+            stats = benchmark_call(func, args, warmup=1, repeat=3, target_ms=5, max_time=size_budget / 2)
+        except CaseTimeout:
+            return {"points": points, "stopped_at": n, "error": None}
+        except Exception as e:
+            return {"points": points, "stopped_at": n, "error": f"{type(e).__name__}: {e}"}
+        finally:
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, previous_handler)
+        points.append([n, stats["min_ms"] / 1000])
+    return {"points": points, "stopped_at": None, "error": None}
+
+def _weighted_fit(xs, ts, ws):
+    """Weighted least squares t = a + b*x with b >= 0; returns (a, b)."""
+    sw = sum(ws)
+    mx = sum(w * x for w, x in zip(ws, xs)) / sw
+    mt = sum(w * t for w, t in zip(ws, ts)) / sw
+    var = sum(w * (x - mx) ** 2 for w, x in zip(ws, xs))
+    if var == 0:
+        return mt, 0.0
+    b = sum(w * (x - mx) * (t - mt) for w, x, t in zip(ws, xs, ts)) / var
+    if b < 0:
+        return mt, 0.0
+    return mt - b * mx, b
+
+def fit_complexity(points):
+    """
+    Fits timings against every model in MODELS using relative (1/t²-weighted) least squares.
+    Returns (best_label or None, confidence 0..1, {label: relative RMS error}).
+    Confidence is how clearly the pick beats the models it was chosen over; below
+    MIN_CONFIDENCE there is no pick.
+    """
+    if len(points) < 3:
+        return None, 0.0, {}
+    floor = max(t for _, t in points) * 1e-6 or 1e-12
+    ns = [n for n, _ in points]
+    ts = [max(t, floor) for _, t in points]
+    ws = [1 / t ** 2 for t in ts]
+
+    errors, degenerate = {}, set()
+    for label, f in MODELS.items():
+        xs = [f(n) for n in ns]
+        a, b = _weighted_fit(xs, ts, ws)
+        errors[label] = math.sqrt(sum(((a + b * x) - t) ** 2 / t ** 2 for x, t in zip(xs, ts)) / len(ts))
+        # Predicted growth across the whole sweep within timing noise: the fit is a constant
+        if label != "O(1)" and b * (xs[-1] - xs[0]) < FLAT_GROWTH * max(a + b * xs[0], floor):
+            degenerate.add(label)
+
+    def explains_no_better(simple, complex_):
+        # Timing noise alone moves the error this much, so a richer model needs a clear win
+        return errors[simple] <= errors[complex_] * TIE_RATIO + TIE_NOISE
+
+    # Simplest model that the best-scoring one doesn't clearly beat: flat timings of
+    # `return len(nums)` fit log n a shade better by noise, but they are O(1)
+    order = list(MODELS)
+    best = min((l for l in order if l not in degenerate), key=errors.get)
+    for label in order[:order.index(best)]:
+        if label not in degenerate and explains_no_better(label, best):
+            best = label
+            break
+
+    # Only simpler models, or richer ones that don't explain the data as well, are rivals
+    rivals = [l for l in order if l != best and l not in degenerate
+              and not (order.index(l) > order.index(best) and explains_no_better(best, l))]
+    separation = 1.0
+    if rivals:
+        runner_up = min(rivals, key=errors.get)
+        separation = 1 - errors[best] / errors[runner_up] if errors[runner_up] else 0.0
+    fit_quality = 1 - min(errors[best], 1.0)
+    confidence = round(max(0.0, min(1.0, separation * fit_quality)), 2)
+    return (best if confidence >= MIN_CONFIDENCE else None), confidence, {k: round(v, 4) for k, v in errors.items()}
+
+def estimate_complexity(code, func_name=None, sizes=DEFAULT_SIZES, static_estimate=None, seed=0, pool=None,
+                        cancel=None):
+    """
+    Empirical complexity: times the entry point over growing synthetic inputs in the
+    sandbox and fits the growth curve. Reported next to the static (AST) estimate.
+    Setting `cancel` (a threading.Event) abandons the sweep.
+    """
+    source = parse_source(code)
+    func_name = func_name or resolve_entry_point(source)
+    kinds = infer_input_kinds(source, func_name)
+    report = {
+        "function": func_name,
+        "input_kinds": kinds,
+        "static_estimate": static_estimate,
+        "best_fit": None,
+        "confidence": 0.0,
+        "points": [],
+        "fits": {},
+        "stopped_at": None,
+        "error": None
+    }
+    if not kinds:
+        report["error"] = "No sized arguments to scale"
+        return report
+
+    pool = pool if pool is not None else get_default_pool()
+    measured = pool.run(measure_scaling_in_process, source.code, func_name, kinds, tuple(sizes), seed,
+                        timeout=SWEEP_BUDGET + SIZE_BUDGET * 3 + 2, cpu_limit=int(SWEEP_BUDGET + SIZE_BUDGET * 3) + 2,
+                        cancel=cancel)
+    if "points" not in measured:
+        # The sandbox itself stopped the sweep (limit hit / crash)
+        report["error"] = measured.get("error")
+        return report
+
+    report.update(points=measured["points"], stopped_at=measured["stopped_at"], error=measured["error"])
+    report["best_fit"], report["confidence"], report["fits"] = fit_complexity(measured["points"])
+    if report["best_fit"] is None and not report["error"]:
+        if report["stopped_at"] and len(report["points"]) < 3:
+            report["error"] = f"Too slow to scale past n={report['stopped_at']} (super-polynomial or n too small to fit)"
+        elif report["points"]:
+            report["error"] = f"No clear growth model (confidence {report['confidence']:.0%})"
+    return report
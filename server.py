@@ -0,0 +1,286 @@
+"""
+Local HTTP/JSON scoring service (stdlib asyncio, HTTP/1.1 keep-alive).
+
+    python -m intellicodex serve [--host 127.0.0.1] [--port 8765] [--workers N] [--queue 64]
+
+    POST /analyze        {"code"}                               static analysis + suggestions
+    POST /execute        {"code", "tests"?, "benchmark"?, "reference"?}   sandboxed behavioral audit
+    POST /grade          {"code", "reference"?}                 compact graded summary
+    POST /scan           {"code", "benchmark"?, "empirical"?, "profile"?, "reference"?}  full bundle
+    POST /report         {"code" | "scan", "format": "html"|"json"|"pdf"}
+    POST /batch/grade    {"submissions": [{"id", "code"}, ...], "reference"?}
+    POST /batch/scan     same, full bundles
+    GET  /health         queue and request counters
+
+Requests run on a bounded thread pool (submitted code itself runs in the sandbox
+process pool). Work is admitted per submission; once `max_queue` submissions are
+queued or running, new requests get 429 with Retry-After instead of piling up.
+"""
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from records import json_default
+
+MAX_BODY = 8 * 1024 * 1024
+MAX_BATCH = 500
+IDLE_TIMEOUT = 15.0
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 411: "Length Required",
+           413: "Payload Too Large", 429: "Too Many Requests", 431: "Request Header Fields Too Large",
+           500: "Internal Server Error", 501: "Not Implemented"}
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def _code(payload):
+    code = payload.get("code")
+    if not isinstance(code, str) or not code.strip():
+        raise HttpError(400, "'code' must be a non-empty string")
+    return code
+
+def _with_verdict(scan):
+    from engine import get_final_verdict
+    v_str, v_color, v_desc = get_final_verdict(scan.grades)
+    return scan.replace(v_str=v_str, v_desc=v_desc, v_color=v_color)
+
+# --- Pipeline steps (run on worker threads) ---
+
+def analyze(payload):
+    from engine import parse_source, analyze_logic, get_suggestions, detect_level
+    from antipatterns import detect_antipatterns
+    from rules import run_rules
+    source = parse_source(_code(payload))
+    analysis = analyze_logic(source)
+    findings = run_rules(source)
+    result = {"origin": analysis, "suggs": get_suggestions(source, findings),
+              "antipatterns": detect_antipatterns(source, findings)}
+    if "error" not in analysis:
+        level_name, level_label, _ = detect_level(source, analysis)
+        result["level"] = {"name": level_name, "label": level_label}
+    return result
+
+def execute(payload):
+    from engine import parse_source, run_behavioral_audit, generate_dynamic_test_cases
+    source = parse_source(_code(payload))
+    tests = payload.get("tests")
+    if tests is None:
+        tests = generate_dynamic_test_cases(source, source.first_function() or "solve",
+                                            reference=payload.get("reference"))
+    elif not isinstance(tests, list) or not all(isinstance(t, dict) and "input" in t for t in tests):
+        raise HttpError(400, "'tests' must be a list of {\"name\", \"input\", \"expected\"?} objects")
+    else:
+        tests = [{"name": t.get("name", f"Case {i + 1}"), "input": t["input"], "expected": t.get("expected")}
+                 for i, t in enumerate(tests)]
+    behavior, accuracy = run_behavioral_audit(source, tests, benchmark=bool(payload.get("benchmark")))
+    return {"behavior": behavior, "accuracy": accuracy}
+
+def scan(payload):
+    from engine import cached_scan
+    return _with_verdict(cached_scan(
+        _code(payload),
+        benchmark=bool(payload.get("benchmark")),
+        empirical=bool(payload.get("empirical")),
+        profile=bool(payload.get("profile")),
+        reference=payload.get("reference")
+    ))
+
+def grade(payload):
+    from intellicodex import summarize
+    return summarize(payload.get("id"), scan(payload))
+
+def report(payload):
+    """Returns (content type, body bytes)."""
+    from report_gen import generate_pdf_report, generate_html_report, generate_json_report
+    fmt = payload.get("format", "html")
+    res = payload.get("scan") if isinstance(payload.get("scan"), dict) else scan(payload)
+    if fmt == "pdf":
+        return "application/pdf", generate_pdf_report(res)
+    if fmt == "html":
+        return "text/html; charset=utf-8", generate_html_report(res).encode("utf-8")
+    if fmt == "json":
+        return "application/json", generate_json_report(res).encode("utf-8")
+    raise HttpError(400, "'format' must be one of pdf, html, json")
+
+ROUTES = {"/analyze": analyze, "/execute": execute, "/grade": grade, "/scan": scan, "/report": report}
+BATCH_ROUTES = {"/batch/grade": grade, "/batch/scan": scan}
+
+class ScoringService:
+    """Asyncio HTTP front end over a bounded pool of pipeline workers."""
+    def __init__(self, workers=None, max_queue=64, idle_timeout=IDLE_TIMEOUT):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.idle_timeout = idle_timeout
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scoring")
+        self.pending = 0
+        self.stats = {"requests": 0, "rejected": 0, "errors": 0, "submissions": 0, "connections": 0}
+        self.started = time.time()
+
+    # --- admission control ---
+    def _admit(self, units):
+        if self.pending + units > self.max_queue:
+            self.stats["rejected"] += 1
+            raise HttpError(429, f"Queue full ({self.pending}/{self.max_queue} submissions pending)")
+        self.pending += units
+        self.stats["submissions"] += units
+
+    async def _run(self, fn, payload):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, fn, payload)
+
+    async def dispatch(self, method, path, body):
+        """Returns (status, content type, body bytes)."""
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        if path == "/health":
+            return 200, "application/json", self._json({
+                "status": "ok", "pending": self.pending, "max_queue": self.max_queue, "workers": self.workers,
+                "uptime_s": round(time.time() - self.started, 1), **self.stats
+            })
+        if path not in ROUTES and path not in BATCH_ROUTES:
+            raise HttpError(404, f"No route {path}")
+        if method != "POST":
+            raise HttpError(405, f"{path} only accepts POST")
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError as e:
+            raise HttpError(400, f"Invalid JSON: {e}")
+        if not isinstance(payload, dict):
+            raise HttpError(400, "Request body must be a JSON object")
+
+        if path in BATCH_ROUTES:
+            return 200, "application/json", self._json(await self._batch(BATCH_ROUTES[path], payload))
+
+        self._admit(1)
+        try:
+            result = await self._run(ROUTES[path], payload)
+        finally:
+            self.pending -= 1
+        if path == "/report":
+            content_type, data = result
+            return 200, content_type, data
+        return 200, "application/json", self._json(result)
+
+    async def _batch(self, fn, payload):
+        submissions = payload.get("submissions")
+        if not isinstance(submissions, list) or not submissions:
+            raise HttpError(400, "'submissions' must be a non-empty list of {\"id\", \"code\"} objects")
+        if len(submissions) > MAX_BATCH:
+            raise HttpError(413, f"At most {MAX_BATCH} submissions per batch")
+        if len(submissions) > self.max_queue:
+            # Would never be admitted; retrying can't help, so don't answer 429
+            raise HttpError(413, f"Batch of {len(submissions)} exceeds the queue capacity ({self.max_queue})")
+        shared = {k: v for k, v in payload.items() if k != "submissions"}
+        self._admit(len(submissions))
+
+        async def one(index, item):
+            try:
+                if not isinstance(item, dict):
+                    raise HttpError(400, "submission must be an object")
+                return {"id": item.get("id", index), **await self._run(fn, {**shared, **item})}
+            except HttpError as e:
+                return {"id": item.get("id", index) if isinstance(item, dict) else index, "error": str(e)}
+            except Exception as e:
+                return {"id": item.get("id", index), "error": f"{type(e).__name__}: {e}"}
+            finally:
+                self.pending -= 1
+
+        results = await asyncio.gather(*(one(i, item) for i, item in enumerate(submissions)))
+        return {"results": results}
+
+    @staticmethod
+    def _json(value):
+        return json.dumps(value, default=json_default).encode("utf-8")
+
+    # --- HTTP/1.1 connection handling ---
+    async def handle(self, reader, writer):
+        self.stats["connections"] += 1
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.idle_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 431, "application/json", self._json({"error": "Headers too large"}), False)
+                    return
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, "application/json", self._json({"error": "Malformed request line"}), False)
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                self.stats["requests"] += 1
+                try:
+                    if "chunked" in headers.get("transfer-encoding", "").lower():
+                        raise HttpError(501, "Chunked request bodies are not supported; send Content-Length")
+                    raw_length = headers.get("content-length", "").strip() or "0"
+                    if not raw_length.isdigit():
+                        keep_alive = False  # can't tell where this body ends
+                        raise HttpError(400, f"Invalid Content-Length: {raw_length[:32]!r}")
+                    length = int(raw_length)
+                    if length > MAX_BODY:
+                        keep_alive = False  # the unread body would corrupt the next request
+                        raise HttpError(413, f"Body larger than {MAX_BODY} bytes")
+                    body = await reader.readexactly(length) if length else b""
+                    status, content_type, data = await self.dispatch(method, target, body)
+                except HttpError as e:
+                    status, content_type, data = e.status, "application/json", self._json({"error": str(e)})
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    status, content_type, data = 500, "application/json", self._json({"error": f"{type(e).__name__}: {e}"})
+
+                extra = {"Retry-After": "1"} if status == 429 else {}
+                await self._respond(writer, status, content_type, data, keep_alive, extra)
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, content_type, data, keep_alive, extra=None):
+        headers = [
+            f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(data)}",
+            "Connection: keep-alive" if keep_alive else "Connection: close",
+        ]
+        if keep_alive:
+            headers.append(f"Keep-Alive: timeout={int(self.idle_timeout)}")
+        headers.extend(f"{k}: {v}" for k, v in (extra or {}).items())
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + data)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def serve(self, host="127.0.0.1", port=8765, ready=None):
+        server = await asyncio.start_server(self.handle, host, port, limit=64 * 1024)
+        if ready:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+
+def serve(host="127.0.0.1", port=8765, workers=None, max_queue=64):
+    """Runs the scoring service until interrupted."""
+    service = ScoringService(workers=workers, max_queue=max_queue)
+    try:
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,122 @@
+import ast
+import hashlib
+import io
+import threading
+import tokenize
+from collections import OrderedDict
+
+# Code objects (and so tracebacks / tracemalloc frames) of submissions carry this filename
+SUBMISSION_FILENAME = "<submission>"
+
+class ParsedSource:
+    """
+    One-shot parse of a submission.
+    Holds the tree, line table, token stream and compiled code object (or the error that stopped it) so every
+    analysis layer can share a single parse instead of re-reading the raw text.
+    """
+    def __init__(self, code, filename=SUBMISSION_FILENAME):
+        self.code = code
+        self.filename = filename
+        self.lines = code.splitlines()
+        self.tree = None
+        self.code_object = None
+        self.syntax_error = None
+        self.compile_error = None
+        self._tokens = None
+        self._units = None
+
+        try:
+            self.tree = ast.parse(code, filename)
+        except SyntaxError as e:
+            self.syntax_error = e
+        except (ValueError, TypeError) as e:
+            # e.g. null bytes in the source
+            self.syntax_error = SyntaxError(str(e))
+
+        # A tree can still fail to compile (e.g. too many statically nested blocks),
+        # so static analysis keeps the tree even when there is no code object.
+        if self.tree is not None:
+            try:
+                self.code_object = compile(self.tree, filename, 'exec')
+            except (SyntaxError, ValueError, RecursionError) as e:
+                self.compile_error = e
+
+    @property
+    def ok(self):
+        return self.tree is not None
+
+    @property
+    def tokens(self):
+        """
+        Token stream, tokenized lazily on first use and then kept.
+        Broken code keeps whatever tokenized before the error.
+        """
+        if self._tokens is None:
+            self._tokens = []
+            try:
+                for tok in tokenize.generate_tokens(io.StringIO(self.code).readline):
+                    self._tokens.append(tok)
+            except (tokenize.TokenError, SyntaxError):
+                pass
+        return self._tokens
+
+    @property
+    def units(self):
+        """
+        Top-level statements as (node, fingerprint) pairs. Functions and classes get a hash
+        of their source segment (decorators included); other statements get None.
+        """
+        if self._units is None:
+            self._units = []
+            for node in (self.tree.body if self.ok else []):
+                fingerprint = None
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                    start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+                    segment = "\n".join(self.lines[start - 1:node.end_lineno])
+                    fingerprint = hashlib.blake2b(segment.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+                self._units.append((node, fingerprint))
+        return self._units
+
+    def first_function(self):
+        """Name of the first function defined in source order, or None."""
+        if not self.ok:
+            return None
+        funcs = [n for n in ast.walk(self.tree) if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]
+        return min(funcs, key=lambda n: (n.lineno, n.col_offset)).name if funcs else None
+
+class UnitCache:
+    """
+    Bounded LRU of per-unit results keyed by fingerprint, so a re-scan after an edit
+    only recomputes the functions/classes that changed. Cached values are shared;
+    callers must not mutate them.
+    """
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, fingerprint, compute):
+        with self._lock:
+            value = self._entries.get(fingerprint)
+            if value is not None:
+                self._entries.move_to_end(fingerprint)
+                self.stats["hits"] += 1
+                return value
+            self.stats["misses"] += 1
+        value = compute()
+        with self._lock:
+            self._entries[fingerprint] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+def parse_source(source):
+    """Returns a ParsedSource, reusing it if one was passed in."""
+    if isinstance(source, ParsedSource):
+        return source
+    return ParsedSource(source or "")
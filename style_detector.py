@@ -1,20 +1,33 @@
-import ast
-import re
+import tokenize
+from source import parse_source
+
+# Operators the spacing check wants a space after
+SPACED_OPS = (',', '+=', '-=', '*=', '/=', '//=', '**=')
+LINE_ENDS = (tokenize.NEWLINE, tokenize.NL, tokenize.ENDMARKER)
+
+def _is_docstring_token(tok):
+    return tok.type == tokenize.STRING and tok.string.lstrip('rRbBuU')[:3] in ('"""', "'''")
 
 def detect_level(code, analysis_results):
     """
     LAYER 3 — STYLE & ORIGIN INTELLIGENCE
     Returns: level_name, level_label, level_color, origin_stats
+    Accepts raw code or a ParsedSource; the checks read its token stream, so words
+    inside strings and comments don't count as code.
     """
-    
+    source = parse_source(code)
+    tokens = source.tokens
+    names = [t.string for t in tokens if t.type == tokenize.NAME]
+    pairs = list(zip(tokens, tokens[1:]))
+
     # --- 1. COMPLEXITY LEVEL DETECTION ---
     complexity_score = 0
     complexity_score += analysis_results.get('loops', 0) * 15
     complexity_score += analysis_results.get('max_nesting', 0) * 20
     complexity_score += analysis_results.get('functions', 0) * 10
     
-    if 'class ' in code: complexity_score += 40
-    if 'import ' in code: complexity_score += 5
+    if 'class' in names: complexity_score += 40
+    if 'import' in names: complexity_score += 5
     
     # Categorize Level
     if complexity_score <= 40:
@@ -31,31 +44,35 @@ def detect_level(code, analysis_results):
     
     # Signal 1: Variable Uniformity (AI loves these names)
     ai_vars = ['result', 'temp', 'data', 'val', 'output', 'items', 'element']
-    found_ai_vars = sum(1 for var in ai_vars if var in code.lower())
+    found_ai_vars = sum(1 for var in ai_vars if any(var in n.lower() for n in names))
     if found_ai_vars >= 3: ai_signals += 1
     
     # Signal 2: Comment Density (AI over-comments every block)
-    lines = code.splitlines()
-    comment_lines = len([l for l in lines if l.strip().startswith('#')])
-    code_lines = len([l for l in lines if l.strip() and not l.strip().startswith('#')])
+    # Comment-only rows (a '#' inside a string is not a COMMENT token)
+    comment_lines = len({t.start[0] for t in tokens
+                         if t.type == tokenize.COMMENT and not t.line[:t.start[1]].strip()})
+    code_lines = len([l for l in source.lines if l.strip()]) - comment_lines
     if code_lines > 0 and (comment_lines / code_lines) > 0.4:
         ai_signals += 1 # Too many comments
         
     # Signal 3: No Debugging Prints (Humans leave print() everywhere)
-    if 'print(' not in code:
+    has_print = any(a.string == 'print' and a.type == tokenize.NAME and b.string == '(' for a, b in pairs)
+    if not has_print:
         ai_signals += 1
         
     # Signal 4: Over-clean Formatting (Humans usually have inconsistent spacing)
     # Simple check: Is there a space after every comma and around operators?
-    if re.search(r',\S', code) is None and re.search(r'[+\-*/]=\S', code) is None:
+    tight = any(a.type == tokenize.OP and a.string in SPACED_OPS
+                and b.start == a.end and b.type not in LINE_ENDS for a, b in pairs)
+    if not tight:
          ai_signals += 1
 
     # Signal 5: Docstring presence (AI almost always includes them)
-    if '"""' in code or "'''" in code:
+    if any(_is_docstring_token(t) for t in tokens):
         ai_signals += 1
         
     # Signal 6: Generic Structure (Common AI templates)
-    if 'if __name__ == "__main__":' in code:
+    if '__name__' in names and any(t.type == tokenize.STRING and t.string in ('"__main__"', "'__main__'") for t in tokens):
         ai_signals += 0.5 # Humans use this too, but AI uses it 100% of the time
 
     # Calculate Probability
@@ -70,7 +87,7 @@ def detect_level(code, analysis_results):
     reasons = []
     if found_ai_vars >= 3: reasons.append("Template-based variable naming")
     if comment_lines / max(1, code_lines) > 0.4: reasons.append("Excessive comment density")
-    if 'print(' not in code: reasons.append("Zero debugging traces detected")
+    if not has_print: reasons.append("Zero debugging traces detected")
     
     analysis_results['origin_reasons'] = reasons if reasons else ["Natural coding flow detected"]
 
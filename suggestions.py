@@ -1,53 +1,96 @@
 import ast
-import re
+from source import parse_source
+from rules import rule, run_rules
+import antipatterns  # registers the performance rules into the same traversal
 
-def get_suggestions(code):
-    """
-    Analyzes code patterns to provide actionable improvement suggestions.
-    """
-    suggestions = []
-    
-    try:
-        tree = ast.parse(code)
-    except Exception:
-        return ["⚠️ System cannot provide suggestions on code with Syntax Errors."]
+# Max suggestions shown (UI cleanliness)
+MAX_SUGGESTIONS = 4
+
+def _is_call_to(node, name):
+    return isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == name
+
+# --- Rule registry: each check runs only for its declared node types, all in one traversal ---
+
+@rule("with-managed", (ast.With, ast.AsyncWith), priority=0)
+def _track_context_managers(node, ctx):
+    # Bookkeeping only: marks `with` targets so open() inside them isn't flagged
+    ctx.managed.update(id(item.context_expr) for item in node.items)
+    return False
+
+@rule("open-without-with", ast.Call, priority=90,
+      message="Always use the `with open(...)` statement for file operations to ensure proper resource management.")
+def _open_without_with(node, ctx):
+    return _is_call_to(node, "open") and id(node) not in ctx.managed
 
-    # 1. AST-Based Check: range(len()) -> Suggest enumerate()
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Name) and node.func.id == 'range':
-                if node.args and isinstance(node.args[0], ast.Call):
-                    if isinstance(node.args[0].func, ast.Name) and node.args[0].func.id == 'len':
-                        suggestions.append("Consider using `enumerate()` instead of `range(len())` for cleaner iteration.")
+@rule("list-membership", ast.Compare, priority=70,
+      message="For frequent membership checks, a `set()` is $O(1)$ compared to $O(n)$ for a list.")
+def _list_membership(node, ctx):
+    return any(
+        isinstance(op, (ast.In, ast.NotIn)) and isinstance(comparator, (ast.List, ast.ListComp))
+        for op, comparator in zip(node.ops, node.comparators)
+    )
 
-    # 2. Manual Counter Logic
-    if " += 1" in code and ("for " in code or "while " in code):
-        suggestions.append("Detected manual counter. The Pythonic way is to use `enumerate()` or `zip()`.")
+@rule("range-len", ast.Call, priority=60,
+      message="Consider using `enumerate()` instead of `range(len())` for cleaner iteration.")
+def _range_len(node, ctx):
+    return _is_call_to(node, "range") and bool(node.args) and _is_call_to(node.args[0], "len")
 
-    # 3. Performance: List Comprehensions
-    if ".append(" in code and "for " in code:
-        suggestions.append("Simple loops with `.append()` can be converted to **List Comprehensions** for faster execution.")
+@rule("append-loop", (ast.For, ast.AsyncFor), priority=50,
+      message="Simple loops with `.append()` can be converted to **List Comprehensions** for faster execution.")
+def _append_loop(node, ctx):
+    body = node.body
+    # `for x in xs: if cond: out.append(...)` is a filtered comprehension
+    if len(body) == 1 and isinstance(body[0], ast.If) and not body[0].orelse:
+        body = body[0].body
+    return (
+        len(body) == 1 and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Call)
+        and isinstance(body[0].value.func, ast.Attribute) and body[0].value.func.attr == "append"
+        and not node.orelse
+    )
 
-    # 4. Modularity: Global Variables
-    if "global " in code:
-        suggestions.append("Avoid using `global` variables. Try passing variables as function arguments to improve modularity.")
+@rule("manual-counter", ast.AugAssign, priority=45,
+      message="Detected manual counter. The Pythonic way is to use `enumerate()` or `zip()`.")
+def _manual_counter(node, ctx):
+    return (
+        ctx.loop_depth > 0 and isinstance(node.op, ast.Add) and isinstance(node.target, ast.Name)
+        and isinstance(node.value, ast.Constant) and node.value.value == 1
+    )
 
-    # 5. Resource Management: File Handling
-    if "open(" in code and "with " not in code:
-        suggestions.append("Always use the `with open(...)` statement for file operations to ensure proper resource management.")
+@rule("global-statement", ast.Global, priority=40,
+      message="Avoid using `global` variables. Try passing variables as function arguments to improve modularity.")
+def _global_statement(node, ctx):
+    return True
 
-    # 6. Algorithmic Efficiency: Membership Checks
-    if " in " in code and ("[" in code or "(" in code) and "{" not in code:
-        suggestions.append("For frequent membership checks, a `set()` is $O(1)$ compared to $O(n)$ for a list.")
+@rule("missing-docstring", (ast.FunctionDef, ast.AsyncFunctionDef), priority=20,
+      message="Add **Docstrings** (`\"\"\" ... \"\"\"`) to your functions to make them 'Production-Ready'.")
+def _missing_docstring(node, ctx):
+    return ast.get_docstring(node) is None
 
-    # 7. Professionalism: Documentation
-    if "def " in code and '"""' not in code and "'''" not in code:
-        suggestions.append("Add **Docstrings** (`\"\"\" ... \"\"\"`) to your functions to make them 'Production-Ready'.")
+def _format_lines(lines):
+    lines = sorted(set(lines))
+    shown = ", ".join(str(n) for n in lines[:3]) + (", …" if len(lines) > 3 else "")
+    return f"(line {shown})" if len(lines) == 1 else f"(lines {shown})"
 
-    # 8. Clean Code: Type Hinting
+def get_suggestions(code, findings=None):
+    """
+    Analyzes code patterns to provide actionable improvement suggestions.
+    Accepts raw code or a ParsedSource, plus the scan's run_rules() output if it has
+    one. One suggestion per rule, highest priority first, each tagged with its lines.
+    """
+    source = parse_source(code)
+    if not source.ok:
+        return ["⚠️ System cannot provide suggestions on code with Syntax Errors."]
+
+    grouped = {}
+    for finding in (run_rules(source) if findings is None else findings):
+        grouped.setdefault(finding["rule"], []).append(finding)
+
+    suggestions = [
+        f"{found[0]['message']} {_format_lines(f['line'] for f in found)}"
+        for found in grouped.values()
+    ][:MAX_SUGGESTIONS]
+
+    # Clean Code: Type Hinting
     if not suggestions:
         suggestions.append("🔥 Code looks very professional! Consider adding Type Hinting (e.g., `a: int`) for extra clarity.")
-
-    # Return unique suggestions (limited to 4 for UI cleanliness)
-    return list(set(suggestions))[:4]
-    
\ No newline at end of file
+    return suggestions
@@ -0,0 +1,197 @@
+import ast
+import random
+
+from source import parse_source
+
+LIST_NAMES = ("nums", "arr", "array", "items", "values", "data", "lst", "list", "xs", "elements", "numbers", "seq")
+STR_NAMES = ("s", "text", "string", "word", "sentence", "str")
+INT_NAMES = ("n", "k", "target", "x", "num", "size", "count", "limit")
+
+# Method calls that pin down a parameter's kind
+STR_METHODS = ("split", "lower", "upper", "strip", "startswith", "endswith", "isdigit", "isalpha", "replace", "find", "count")
+LIST_METHODS = ("append", "sort", "pop", "extend", "insert", "index", "reverse")
+DICT_METHODS = ("items", "keys", "values", "get", "setdefault")
+SET_METHODS = ("add", "discard", "union", "intersection")
+
+# Generated suite shape: small random cases plus large stress inputs
+RANDOM_CASES = 6
+RANDOM_SIZE = 8
+STRESS_SIZES = (1000, 100000)
+
+def _kind_from_annotation(annotation):
+    name = ast.unparse(annotation).lower()
+    for kind in ("list", "dict", "set", "str", "int", "float", "bool"):
+        if kind in name:
+            return kind
+    if any(t in name for t in ("sequence", "iterable", "tuple")):
+        return "list"
+    return None
+
+def _kind_from_default(default):
+    if isinstance(default, ast.Constant) and default.value is not None:
+        kind = type(default.value).__name__
+        return kind if kind in ("int", "str", "float", "bool") else None
+    if isinstance(default, (ast.List, ast.Dict, ast.Set)):
+        return type(default).__name__.lower()
+    return None
+
+def _kind_from_name(name):
+    name = name.lower()
+    if name in LIST_NAMES or name.endswith("s") and len(name) > 2:
+        return "list"
+    if name in STR_NAMES:
+        return "str"
+    if name in INT_NAMES:
+        return "int"
+    return None
+
+def _usage_evidence(func):
+    """
+    Per-parameter kinds implied by how the body uses it: (strong, weak) dicts.
+    Strong evidence is a kind-specific method call; weak evidence is iteration,
+    len() / indexing (sequence) or arithmetic / range() (int).
+    """
+    strong, weak = {}, {}
+    for node in ast.walk(func):
+        if isinstance(node, ast.Call):
+            func_node = node.func
+            if isinstance(func_node, ast.Attribute) and isinstance(func_node.value, ast.Name):
+                name, attr = func_node.value.id, func_node.attr
+                for kind, methods in (("str", STR_METHODS), ("list", LIST_METHODS),
+                                      ("dict", DICT_METHODS), ("set", SET_METHODS)):
+                    if attr in methods:
+                        strong.setdefault(name, kind)
+                        break
+            elif isinstance(func_node, ast.Name) and node.args and isinstance(node.args[0], ast.Name):
+                arg = node.args[0].id
+                if func_node.id in ("len", "sorted", "sum", "max", "min", "enumerate", "reversed"):
+                    weak.setdefault(arg, "list")
+                elif func_node.id == "range":
+                    weak.setdefault(arg, "int")
+        elif isinstance(node, (ast.For, ast.comprehension)) and isinstance(node.iter, ast.Name):
+            weak.setdefault(node.iter.id, "list")
+        elif isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name):
+            weak.setdefault(node.value.id, "list")
+        elif isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Sub, ast.Mult, ast.FloorDiv, ast.Mod, ast.Pow)):
+            for side in (node.left, node.right):
+                if isinstance(side, ast.Name):
+                    weak.setdefault(side.id, "int")
+    return strong, weak
+
+def find_function(code, func_name):
+    source = parse_source(code)
+    if not source.ok:
+        return None
+    return next((n for n in ast.walk(source.tree)
+                 if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef)) and n.name == func_name), None)
+
+def infer_input_kinds(code, func_name):
+    """
+    Best-effort argument kinds ("list", "int", "str", "dict", "set", "float", "bool") for a
+    function, from annotations, defaults, usage in the body and parameter names.
+    An unknown first argument defaults to a list.
+    """
+    func = find_function(code, func_name)
+    if func is None:
+        return []
+
+    params = [a for a in func.args.posonlyargs + func.args.args if a.arg not in ("self", "cls")]
+    defaults = [None] * (len(params) - len(func.args.defaults)) + list(func.args.defaults)
+    strong, weak = _usage_evidence(func)
+    kinds = []
+    for i, (param, default) in enumerate(zip(params, defaults)):
+        kind = (
+            (_kind_from_annotation(param.annotation) if param.annotation else None)
+            or _kind_from_default(default)
+            or strong.get(param.arg)
+            or _kind_from_name(param.arg)
+            or weak.get(param.arg)
+            or ("list" if i == 0 else "int")
+        )
+        kinds.append(kind)
+    return kinds
+
+def make_scaled_input(kinds, n, rng):
+    """Builds one argument tuple whose size grows with n."""
+    sized = any(k in ("list", "str", "dict", "set") for k in kinds)
+    args = []
+    for kind in kinds:
+        if kind == "list":
+            args.append([rng.randint(-n, n) for _ in range(n)])
+        elif kind == "str":
+            args.append("".join(rng.choice("abcdefghij") for _ in range(n)))
+        elif kind == "dict":
+            args.append({i: rng.randint(-n, n) for i in range(n)})
+        elif kind == "set":
+            args.append(set(range(n)))
+        elif kind == "float":
+            args.append(rng.random() * n)
+        elif kind == "bool":
+            args.append(rng.random() < 0.5)
+        else:
+            # A lone int is the problem size itself; next to a collection it's a value
+            args.append(rng.randint(-n, n) if sized else n)
+    return tuple(args)
+
+def edge_values(kind):
+    """(label, value) boundary inputs for one argument kind."""
+    if kind == "list":
+        return [("empty", []), ("single", [7]), ("duplicates", [3, 3, 3, 3]),
+                ("negatives", [-5, -1, -3]), ("sorted", [1, 2, 3, 4, 5]), ("reversed", [5, 4, 3, 2, 1])]
+    if kind == "str":
+        return [("empty", ""), ("single char", "a"), ("repeated", "aaaa"), ("spaces", "a b  c"), ("unicode", "héllo✓")]
+    if kind == "dict":
+        return [("empty", {}), ("single", {1: 1})]
+    if kind == "set":
+        return [("empty", set()), ("single", {1})]
+    if kind == "float":
+        return [("zero", 0.0), ("negative", -1.5)]
+    if kind == "bool":
+        return [("true", True), ("false", False)]
+    return [("zero", 0), ("one", 1), ("negative", -1)]
+
+def _with_reachable_target(kinds, params, args, rng):
+    """For (collection, target)-style signatures, picks a target that two elements actually sum to."""
+    args = list(args)
+    for i, kind in enumerate(kinds):
+        if kind == "int" and params[i] in ("target", "k", "goal", "total") and i > 0 \
+                and kinds[0] == "list" and len(args[0]) >= 2:
+            a, b = rng.sample(range(len(args[0])), 2)
+            args[i] = args[0][a] + args[0][b]
+    return tuple(args)
+
+def generate_test_cases(code, func_name, seed=0, random_cases=RANDOM_CASES, stress_sizes=STRESS_SIZES):
+    """
+    Property-style suite for `func_name`: one case per boundary value of each argument
+    (others held at a typical value), seeded random cases, and large-N stress cases.
+    Each case is {"name", "input" (argument tuple), "expected", "kind"}; expected is
+    filled in later by a differential check against a reference implementation, if any.
+    """
+    func = find_function(code, func_name)
+    if func is None:
+        return [{"name": "Generic Execution", "input": None, "expected": None, "kind": "script"}]
+
+    kinds = infer_input_kinds(code, func_name)
+    if not kinds:
+        return [{"name": "Zero-Argument Call", "input": (), "expected": None, "kind": "edge"}]
+
+    params = [a.arg for a in func.args.posonlyargs + func.args.args if a.arg not in ("self", "cls")]
+    rng = random.Random(seed)
+    cases = []
+
+    typical = _with_reachable_target(kinds, params, make_scaled_input(kinds, RANDOM_SIZE, rng), rng)
+    cases.append({"name": "Standard Vector", "input": typical, "expected": None, "kind": "edge"})
+    for i, kind in enumerate(kinds):
+        for label, value in edge_values(kind):
+            args = typical[:i] + (value,) + typical[i + 1:]
+            cases.append({"name": f"Edge: {label} `{params[i]}`", "input": args, "expected": None, "kind": "edge"})
+
+    for k in range(random_cases):
+        n = rng.randint(1, RANDOM_SIZE * 4)
+        args = _with_reachable_target(kinds, params, make_scaled_input(kinds, n, rng), rng)
+        cases.append({"name": f"Random #{k + 1} (n={n})", "input": args, "expected": None, "kind": "random"})
+
+    for n in stress_sizes:
+        args = _with_reachable_target(kinds, params, make_scaled_input(kinds, n, rng), rng)
+        cases.append({"name": f"Stress n={n:,}", "input": args, "expected": None, "kind": "stress"})
+    return cases
@@ -0,0 +1,24 @@
+from analyzer import analyze_logic
+
+CODE = '''class A:
+    def run(self, xs):
+        for x in xs:
+            for y in xs:
+                pass
+class B:
+    def run(self, xs):
+        for x in xs:
+            pass
+def outer(xs):
+    def inner(ys):
+        for y in ys:
+            pass
+    return inner
+'''
+
+def test_same_named_methods_stay_apart():
+    stats = analyze_logic(CODE)
+    assert stats.loop_depths == {"A.run": 2, "B.run": 1, "outer.<locals>.inner": 1}
+    assert stats.deepest_functions == ["A.run"]
+    assert {"A.run", "B.run", "outer", "outer.<locals>.inner"} == set(stats.function_nodes)
+    assert stats.function_nodes["A.run"]["Control Flow"] == 2
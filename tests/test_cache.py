@@ -0,0 +1,33 @@
+from cache import ResultStore, _sizeof
+from records import AnalysisStats, CaseResult, Grades, ScanResult
+
+def make_scan(cases=200):
+    behavior = [CaseResult("Success", output="x" * 90, digest="0" * 32, runtime="0.01ms",
+                           scenario=f"Case {i}", verdict="✅ PASS", expected="x" * 90)
+                for i in range(cases)]
+    return ScanResult(origin=AnalysisStats(issues=["issue"] * 20), behavior=behavior, accuracy=100,
+                      grades=Grades(100, "A", "fine"), code="def f(x):\n    return x\n" * 50)
+
+def test_sizeof_counts_record_contents():
+    scan = make_scan()
+    assert _sizeof(scan) > 200 * 90
+    assert _sizeof(scan) > _sizeof(make_scan(cases=10)) * 5
+
+def test_cap_evicts_scan_results():
+    # ~200 cases of ~90-char strings: each scan is well over 30 KB once its fields count
+    store = ResultStore(max_bytes=100_000)
+    for i in range(5):
+        store.put(f"k{i}", make_scan())
+    assert len(store) == 2
+    assert store.bytes <= store.max_bytes
+    assert store.stats["evictions"] == 3
+    assert store.get("k0") is None and store.get("k4") is not None
+
+def test_held_entries_outlive_unheld_ones():
+    size = _sizeof(make_scan())
+    store = ResultStore(max_bytes=int(size * 2.5))
+    store.put("held", make_scan(), holder="session-1")
+    for i in range(3):
+        store.put(f"k{i}", make_scan())
+    assert store.get("held") is not None
+    assert store.get("k0") is None
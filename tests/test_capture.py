@@ -0,0 +1,45 @@
+import threading
+
+from capture import BoundedBuffer, captured_output
+
+def test_concurrent_captures_keep_their_own_output():
+    barrier = threading.Barrier(2)
+    outputs = {}
+
+    def work(name):
+        with captured_output() as out:
+            for i in range(50):
+                print(name, i)
+                if i % 10 == 0:
+                    barrier.wait(5)   # interleave the two writers
+        outputs[name] = out.getvalue()
+
+    threads = [threading.Thread(target=work, args=(name,)) for name in ("a", "b")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+    for name in ("a", "b"):
+        assert outputs[name] == "".join(f"{name} {i}\n" for i in range(50))
+
+def test_nested_capture_restores_the_outer_buffer():
+    with captured_output() as outer:
+        print("before")
+        with captured_output() as inner:
+            print("inside")
+        print("after")
+    assert inner.getvalue() == "inside\n"
+    assert outer.getvalue() == "before\nafter\n"
+
+def test_flood_is_truncated_with_marker():
+    with captured_output(max_bytes=64) as out:
+        print("x" * 100)
+        print("more")
+    assert out.truncated
+    assert out.getvalue() == "x" * 64 + "\n... [output truncated: 42 more characters dropped]"
+
+def test_truncation_never_splits_a_character():
+    buffer = BoundedBuffer(max_bytes=5)
+    buffer.write("éééé")   # 2 bytes each
+    assert buffer.getvalue().startswith("éé\n")
+    assert buffer.dropped == 2
@@ -0,0 +1,44 @@
+import time
+
+import pytest
+
+from executor import run_behavioral_audit, stream_behavioral_audit
+from sandbox import SandboxPool
+
+SLEEPY = "import time\n\ndef f(x):\n    time.sleep(x)\n    return x\n"
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = SandboxPool(workers=2, wall_timeout=5)
+    yield pool
+    pool.shutdown()
+
+def cases(delays):
+    return [{"name": f"case {i}", "input": (d,), "expected": d} for i, d in enumerate(delays)]
+
+def test_results_stream_in_case_order(pool):
+    # Early cases finish last, so an unordered fan-out would yield them late
+    delays = [0.3, 0, 0.2, 0, 0.1, 0]
+    streamed = list(stream_behavioral_audit(SLEEPY, cases(delays), chunk_size=1, pool=pool, memory_profile=False))
+    assert [i for i, _ in streamed] == list(range(len(delays)))
+    assert [res.output for _, res in streamed] == [str(d) for d in delays]
+    assert all(res.scenario == f"case {i}" for i, res in streamed)
+
+def test_parallel_audit_matches_serial(pool):
+    tests = cases([0.05, 0, 0.02, 0]) + [{"name": "wrong", "input": (0,), "expected": 1}]
+    seen = []
+    parallel, accuracy = run_behavioral_audit(SLEEPY, tests, parallel=True, pool=pool, memory_profile=False,
+                                              on_result=lambda i, res: seen.append(i))
+    serial, serial_accuracy = run_behavioral_audit(SLEEPY, tests, parallel=False, pool=pool, memory_profile=False)
+    assert seen == list(range(len(tests)))
+    assert [r.verdict for r in parallel] == [r.verdict for r in serial]
+    assert accuracy == serial_accuracy == 80
+
+def test_stopping_early_skips_unstarted_chunks(pool):
+    stream = stream_behavioral_audit(SLEEPY, cases([0.3] * 8), chunk_size=1, pool=pool, memory_profile=False)
+    started = time.perf_counter()
+    index, _ = next(stream)
+    stream.close()
+    # Only the chunks already on a worker finish; the other ~1s of cases never start
+    assert index == 0
+    assert time.perf_counter() - started < 1.0
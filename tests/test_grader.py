@@ -0,0 +1,24 @@
+from grader import memory_score
+from records import CaseResult
+
+def test_memory_score_uses_traced_peak_only():
+    behavior = [CaseResult("Success", memory={"peak_rss_kb": 900000.0}),
+                CaseResult("Success", memory={"peak_rss_kb": 4.0, "peak_kb": 2048.0, "top_sites": []})]
+    assert memory_score(behavior) == (92, 2048.0)
+
+def test_memory_score_without_traced_peaks():
+    assert memory_score([CaseResult("Success", memory={"peak_rss_kb": 188.0})]) == (None, None)
+
+def test_unparseable_code_is_not_elite():
+    from analyzer import analyze_logic
+    from grader import calculate_score
+    for code in ("def f(:\n    pass\n", "x = 1\ndef g(:"):
+        grades = calculate_score(code, analyze_logic(code))
+        assert "Elite" not in grades.complexity
+        assert grades.complexity.startswith("N/A")
+
+def test_simple_loop_is_elite():
+    from analyzer import analyze_logic
+    from grader import calculate_score
+    code = "def total(nums):\n    t = 0\n    for n in nums:\n        t += n\n    return t\n"
+    assert calculate_score(code, analyze_logic(code)).complexity == "O(N) [Elite]"
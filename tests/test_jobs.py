@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+from jobs import JobLimitExceeded, ScanCancelled, ScanJobQueue
+
+def wait_for(queue, job_id, states=("done", "failed", "cancelled"), timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = queue.status(job_id)
+        if status["state"] in states:
+            return status
+        time.sleep(0.01)
+    raise AssertionError(f"job stuck in {queue.status(job_id)['state']}")
+
+def endless_scan(code, on_case=None, cancel=None):
+    # One verdict every 10ms until on_case sees the cancel flag
+    for i in range(10_000):
+        on_case(i, {"verdict": "ok"})
+        time.sleep(0.01)
+    return {"code": code}
+
+def blocking_scan(code, on_case=None, cancel=None):
+    # Stands in for a scan stuck in a sandbox phase: only the cancel event gets it out
+    if cancel.wait(5):
+        raise ScanCancelled()
+    return {"code": code}
+
+@pytest.fixture
+def make_queue():
+    queues = []
+    def make(scan, **kwargs):
+        queues.append(ScanJobQueue(scan=scan, **kwargs))
+        return queues[-1]
+    yield make
+    for queue in queues:
+        queue.shutdown()
+
+def test_running_job_stops_at_next_verdict(make_queue):
+    queue = make_queue(endless_scan)
+    job_id = queue.submit("x = 1")
+    wait_for(queue, job_id, states=("running",))
+    while not queue.status(job_id)["trace"]:
+        time.sleep(0.01)
+    assert queue.cancel(job_id)
+    status = wait_for(queue, job_id)
+    assert status["state"] == "cancelled" and status["result"] is None
+    assert 0 < len(status["trace"]) < 10_000
+    assert not queue.cancel(job_id)
+
+def test_cancel_reaches_a_scan_between_verdicts(make_queue):
+    queue = make_queue(blocking_scan)
+    job_id = queue.submit("x = 1")
+    wait_for(queue, job_id, states=("running",))
+    queue.cancel(job_id)
+    assert wait_for(queue, job_id, timeout=2)["state"] == "cancelled"
+
+def test_queued_job_is_cancelled_without_running(make_queue):
+    calls = []
+    def scan(code, on_case=None, cancel=None):
+        calls.append(code)
+        return blocking_scan(code, on_case, cancel)
+
+    queue = make_queue(scan, workers=1, per_user=0)
+    first, second = queue.submit("first"), queue.submit("second")
+    wait_for(queue, first, states=("running",))
+    assert queue.status(second)["state"] == "queued"
+    assert queue.cancel(second)
+    assert queue.status(second)["state"] == "cancelled"
+    queue.cancel(first)
+    wait_for(queue, first)
+    assert calls == ["first"]
+
+def test_per_user_limit(make_queue):
+    queue = make_queue(blocking_scan, per_user=1)
+    job_id = queue.submit("a", user="u1")
+    with pytest.raises(JobLimitExceeded):
+        queue.submit("b", user="u1")
+    other = queue.submit("c", user="u2")
+    for j in (job_id, other):
+        queue.cancel(j)
+        wait_for(queue, j)
+    queue.submit("d", user="u1")
+
+def test_run_scan_honours_a_set_cancel_event():
+    from engine import run_scan
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(ScanCancelled):
+        run_scan("def f(x):\n    return x\n", cancel=cancel)
@@ -0,0 +1,23 @@
+from cache import ScanCache
+from project import analyze_project
+
+def write(root, files):
+    for name, text in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+def test_import_graph_and_hot_path(tmp_path):
+    write(tmp_path, {
+        "pkg/__init__.py": "",
+        "pkg/algo.py": "def pairs(xs):\n    for a in xs:\n        for b in xs:\n            pass\n",
+        "pkg/util.py": "def one():\n    return 1\n",
+        "main.py": "import pkg.algo\nfrom pkg import util\n\ndef run(batches):\n"
+                   "    for batch in batches:\n        pkg.algo.pairs(batch)\n    return util.one()\n",
+    })
+    report = analyze_project(str(tmp_path), workers=1, cache=ScanCache())
+    assert report["import_graph"]["main"] == ["pkg.algo", "pkg.util"]
+    assert {"caller": "main:run", "callee": "pkg.algo:pairs", "line": 6, "in_loop": True} in report["call_graph"]
+    [hot] = report["hot_paths"]
+    assert hot["callee"] == "pkg.algo:pairs" and hot["effective_big_o"] == "O(n³)"
+    assert report["packages"]["pkg"]["modules"] == 3
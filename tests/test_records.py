@@ -0,0 +1,57 @@
+import json
+import pickle
+
+import pytest
+
+from records import (PASS, AnalysisStats, CaseResult, Grades, ScanResult, dumps, json_default, loads, pack,
+                     unpack)
+
+def sample_scan():
+    case = CaseResult("Success", output="[0, 1]", digest="ab" * 16, runtime="0.02ms",
+                      memory={"peak_rss_kb": 0.0, "peak_kb": 1.5, "top_sites": [{"line": 3, "kb": 1.2}]},
+                      scenario="Basic", verdict=PASS, expected="[0, 1]")
+    crash = CaseResult("Timeout", error="Timeout: exceeded 2s wall-clock limit", verdict="⚠️ ERROR")
+    origin = AnalysisStats(loops=1, functions=1, max_nesting=2, loop_depths={"two_sum": 1},
+                           node_counts={"loops": 1, "calls": 2}, issues=["Long function"])
+    grades = Grades(accuracy=92, v_str="ELITE", v_desc="Highly Optimized", memory_score=100,
+                    suggs=["✨ Architecture is optimal."])
+    return ScanResult(origin=origin, behavior=[case, crash], accuracy=50, grades=grades, code="def f(): pass",
+                      latency={"median_ms": 0.01, "p95_ms": 0.02}, v_str="ELITE")
+
+@pytest.mark.parametrize("roundtrip", [
+    lambda r: loads(dumps(r)),
+    lambda r: unpack(pack(r)),
+    lambda r: pickle.loads(pickle.dumps(r)),
+], ids=["json", "packed", "pickle"])
+def test_scan_result_roundtrips_unchanged(roundtrip):
+    scan = sample_scan()
+    copy = roundtrip(scan)
+    assert copy == scan
+    assert type(copy.origin) is AnalysisStats and type(copy.behavior[0]) is CaseResult
+    assert copy.behavior[0].passed and not copy.behavior[1].passed
+
+def test_mapping_access_treats_none_as_missing():
+    case = CaseResult("Fail", error="boom")
+    assert case["status"] == "Fail" and case.get("error") == "boom"
+    assert "output" not in case and case.get("output", "n/a") == "n/a"
+    assert case.keys() == ["status", "error"]
+    assert {**case} == {"status": "Fail", "error": "boom"}
+    with pytest.raises(KeyError):
+        case["nope"]
+    with pytest.raises(KeyError):
+        case["nope"] = 1
+    case["output"] = "x"
+    assert case.to_dict() == {"status": "Fail", "output": "x", "error": "boom"}
+
+def test_from_dict_ignores_unknown_keys():
+    assert CaseResult.from_dict({"status": "Timeout", "error": "slow", "extra": 1}) == CaseResult("Timeout", error="slow")
+
+def test_json_default_writes_plain_objects():
+    data = json.loads(json.dumps(sample_scan(), default=json_default))
+    assert data["grades"]["v_str"] == "ELITE"
+    assert data["behavior"][1] == {"status": "Timeout", "error": "Timeout: exceeded 2s wall-clock limit",
+                                   "verdict": "⚠️ ERROR"}
+    assert "hotspots" not in data
+
+def test_records_have_no_instance_dict():
+    assert not hasattr(CaseResult("Success"), "__dict__")
@@ -0,0 +1,34 @@
+import os
+
+from report_gen import render_reports
+
+def scan(code):
+    return {"accuracy": 100, "v_str": "ELITE", "code": code, "behavior": [], "suggs": []}
+
+def test_ids_that_sanitize_alike_get_separate_files(tmp_path):
+    results = [("a/b.py", scan("x = 1")), ("a_b.py", scan("x = 2")), ("a_b.py", scan("x = 3"))]
+    written = list(render_reports(results, str(tmp_path), fmt="html", workers=1))
+    paths = [path for _, path, error in written if not error]
+    assert [name for name, _, _ in written] == ["a/b.py", "a_b.py", "a_b.py"]
+    assert len(set(paths)) == 3 and all(os.path.exists(p) for p in paths)
+    for path, value in zip(paths, ("x = 1", "x = 2", "x = 3")):
+        with open(path, encoding="utf-8") as f:
+            assert value in f.read()
+
+def test_report_cli_renders_audit_output(tmp_path):
+    from intellicodex import main
+    submissions = tmp_path / "subs"
+    submissions.mkdir()
+    (submissions / "add.py").write_text("def add(a: int, b: int):\n    return a + b\n")
+    (submissions / "broken.py").write_text("def f(:\n    pass\n")
+
+    for flag in ([], ["--full"]):
+        results = tmp_path / f"results{len(flag)}.jsonl"
+        out = tmp_path / f"reports{len(flag)}"
+        assert main(["audit", str(submissions), "-o", str(results), "-w", "1"] + flag) == 0
+        assert main(["report", str(results), "-o", str(out), "-f", "html", "-w", "1"]) == 0
+        pages = {path.name: path.read_text(encoding="utf-8") for path in out.iterdir()}
+        assert set(pages) == {"add.py.html", "broken.py.html"}
+        for page in pages.values():
+            assert "Verdict: None" not in page
+        assert "Integrity Score: 100%" in pages["add.py.html"]
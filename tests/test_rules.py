@@ -0,0 +1,91 @@
+import pytest
+
+import suggestions  # noqa: F401  registers the style rules next to the performance ones
+from antipatterns import detect_antipatterns
+from rules import RULES, run_rules
+
+def fn(body):
+    """Wraps loop bodies in a documented function so only the rule under test is in play."""
+    return 'def f(items, other):\n    """doc"""\n' + "".join(f"    {line}\n" for line in body.splitlines())
+
+# rule id -> (code that must trigger it, closest code that must not)
+CASES = {
+    "string-concat-loop": (fn("s = ''\nfor x in items:\n    s += str(x)\nreturn s"),
+                           fn("n = 0\nfor x in items:\n    n += x\nreturn n")),
+    "quadratic-rebuild": (fn("out = []\nfor x in items:\n    out = out + [x]\nreturn out"),
+                          fn("n = 0\nfor x in items:\n    n = n + x\nreturn n")),
+    "sum-concat": (fn("return sum(items, [])"), fn("return sum(items, 0)")),
+    "list-pop-front": (fn("while items:\n    items.pop(0)"), fn("while items:\n    items.pop()")),
+    "list-membership-loop": (fn("seen = [1, 2]\nfor x in items:\n    if x in seen:\n        pass"),
+                             fn("seen = {1, 2}\nfor x in items:\n    if x in seen:\n        pass")),
+    "sort-in-loop": (fn("for x in items:\n    other.sort()"), fn("other.sort()\nfor x in items:\n    pass")),
+    "regex-compile-loop": (fn("for x in items:\n    re.compile(x)"), fn("p = re.compile('a')\nfor x in items:\n    p.match(x)")),
+    "attribute-chain-loop": (fn("for x in items:\n    other.a.b(x)"), fn("b = other.a.b\nfor x in items:\n    b(x)")),
+    "module-level-loop": ("for x in range(3):\n    pass\n", fn("for x in items:\n    pass")),
+    "needless-copy": (fn("return list(sorted(items))"), fn("return list(items)")),
+    "open-without-with": (fn("f = open(items)\nreturn f.read()"), fn("with open(items) as f:\n    return f.read()")),
+    "list-membership": (fn("return items in [1, 2]"), fn("return items in {1, 2}")),
+    "range-len": (fn("for i in range(len(items)):\n    pass"), fn("for i, x in enumerate(items):\n    pass")),
+    "append-loop": (fn("out = []\nfor x in items:\n    out.append(x)\nreturn out"),
+                    fn("out = []\nfor x in items:\n    out.append(x)\n    print(x)\nreturn out")),
+    "manual-counter": (fn("i = 0\nfor x in items:\n    i += 1"), fn("i = 0\nfor x in items:\n    i += x")),
+    "global-statement": ("def f():\n    global x\n", "def f():\n    x = 1\n"),
+    "missing-docstring": ("def f():\n    return 1\n", fn("return 1")),
+    # Bookkeeping rules never report; they show up through the rules they feed
+    "track-types": (fn("s = 'a'\nfor x in items:\n    s += x"), fn("s = 0\nfor x in items:\n    s += x")),
+    "track-params": ("def f(s: str, items):\n    for x in items:\n        s += x\n",
+                     "def f(s: int, items):\n    for x in items:\n        s += x\n"),
+    "with-managed": (fn("with open(items) as f:\n    pass"), fn("open(items)")),
+}
+
+# What each bookkeeping rule's cases are checked through (and whether it should appear)
+FED_BY = {"track-types": "string-concat-loop", "track-params": "string-concat-loop", "with-managed": "open-without-with"}
+
+def rule_ids(code):
+    return {f["rule"] for f in run_rules(code)}
+
+def test_every_registered_rule_has_cases():
+    assert {entry.id for entry in RULES} <= set(CASES)
+
+@pytest.mark.parametrize("rule_id", sorted(CASES))
+def test_rule_positive_and_negative(rule_id):
+    positive, negative = CASES[rule_id]
+    reported = FED_BY.get(rule_id, rule_id)
+    if rule_id == "with-managed":
+        # The managed open() is the negative case for the rule it feeds
+        positive, negative = negative, positive
+    assert reported in rule_ids(positive)
+    assert reported not in rule_ids(negative)
+
+def test_performance_findings_carry_cost():
+    for finding in detect_antipatterns(CASES["list-pop-front"][0]):
+        assert finding["impact"] == "asymptotic" and finding["penalty"] > 0 and finding["cost"]
+
+def test_module_level_statements_share_one_scope():
+    code = "xs = [1, 2, 3]\nfor i in range(100):\n    if i in xs:\n        pass\n"
+    assert "list-membership-loop" in rule_ids(code)
+
+def test_sibling_methods_do_not_share_types():
+    code = (
+        "class A:\n"
+        "    def a(self):\n"
+        "        xs = [1, 2]\n"
+        "        return xs\n"
+        "    def b(self, ys):\n"
+        "        for i in ys:\n"
+        "            if i in xs:\n"
+        "                pass\n"
+    )
+    assert "list-membership-loop" not in rule_ids(code)
+
+def test_function_locals_do_not_leak_to_module():
+    code = (
+        "xs = [1]\n"
+        "def f():\n"
+        "    xs = 'abc'\n"
+        "    return xs\n"
+        "for i in range(3):\n"
+        "    if i in xs:\n"
+        "        pass\n"
+    )
+    assert "list-membership-loop" in rule_ids(code)
@@ -0,0 +1,52 @@
+import threading
+
+import pytest
+
+from executor import execute_cases, run_cases_in_process
+from sandbox import SandboxPool
+
+SPIN = "def f(x):\n    while True:\n        pass\n"
+SPIN_ON_IMPORT = "while True:\n    pass\n\ndef f(x):\n    return x\n"
+DOUBLE = "def f(x):\n    return x * 2\n"
+
+@pytest.fixture
+def pool():
+    pool = SandboxPool(workers=1, wall_timeout=0.5, cpu_limit=2)
+    yield pool
+    pool.shutdown()
+
+def test_infinite_loop_times_out_and_worker_survives(pool):
+    [res] = execute_cases(SPIN, "f", [(1,)], timeout=0.3, pool=pool, memory_profile=False)
+    assert res.status == "Timeout"
+    assert [r.output for r in execute_cases(DOUBLE, "f", [(2,), (5,)], pool=pool)] == ["4", "10"]
+
+def test_hung_module_is_killed_and_pool_recovers(pool):
+    # The loop runs before any case alarm is armed, so only the pool's wall clock stops it
+    results = execute_cases(SPIN_ON_IMPORT, "f", [(1,), (2,)], timeout=0.3, pool=pool, memory_profile=False)
+    assert [r.status for r in results] == ["Timeout", "Timeout"]
+    [res] = execute_cases(DOUBLE, "f", [(3,)], pool=pool)
+    assert (res.status, res.output) == ("Success", "6")
+
+def test_cancel_stops_a_running_task(pool):
+    cancel = threading.Event()
+    threading.Timer(0.2, cancel.set).start()
+    result = pool.run(run_cases_in_process, SPIN_ON_IMPORT, "f", [(1,)], None, None, False,
+                      timeout=30, cancel=cancel)
+    assert result["status"] == "Cancelled"
+    [res] = execute_cases(DOUBLE, "f", [(4,)], pool=pool)
+    assert res.output == "8"
+
+def _double_in_default_pool(x):
+    [res] = execute_cases(DOUBLE, "f", [(x,)])
+    return res.output
+
+def test_forked_process_gets_its_own_default_pool():
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from sandbox import get_default_pool
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("needs fork")
+    parent_pool = get_default_pool()
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("fork")) as executor:
+        assert executor.submit(_double_in_default_pool, 21).result(timeout=30) == "42"
+    assert get_default_pool() is parent_pool
@@ -0,0 +1,38 @@
+import math
+
+import pytest
+
+from scaling import fit_complexity
+
+SIZES = (10, 100, 1000, 10000, 100000)
+
+def curve(f, jitter=(1.0, 1.04, 0.97, 1.02, 0.99)):
+    return [[n, f(n) * j] for n, j in zip(SIZES, jitter)]
+
+@pytest.mark.parametrize("label, f", [
+    ("O(1)", lambda n: 2e-6),
+    ("O(n)", lambda n: 1e-6 + 5e-8 * n),
+    ("O(n log n)", lambda n: 1e-6 + 5e-8 * n * math.log2(n)),
+    ("O(n²)", lambda n: 1e-6 + 1e-9 * n * n),
+])
+def test_fits_synthetic_growth(label, f):
+    best, confidence, fits = fit_complexity(curve(f))
+    assert best == label
+    assert confidence >= 0.5
+    assert set(fits) >= {"O(1)", "O(n)", "O(n²)"}
+
+def test_constant_time_with_timer_noise_is_o1():
+    # `return len(nums)`: sub-microsecond timings drifting up ~20% by noise, which log n fits a shade better
+    points = [[10, 8e-8], [100, 9e-8], [1000, 1e-7], [10000, 1e-7], [100000, 1e-7]]
+    best, confidence, fits = fit_complexity(points)
+    assert fits["O(log n)"] < fits["O(1)"]
+    assert best == "O(1)"
+
+def test_no_fit_when_nothing_separates():
+    points = [[10, 1e-6], [100, 6e-6], [1000, 2e-6], [10000, 9e-5], [100000, 3e-5]]
+    best, confidence, _ = fit_complexity(points)
+    assert best is None
+    assert confidence < 0.3
+
+def test_too_few_points():
+    assert fit_complexity([[10, 1e-6], [100, 1e-5]]) == (None, 0.0, {})
@@ -0,0 +1,85 @@
+import asyncio
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+from server import ScoringService
+
+@pytest.fixture
+def service():
+    svc = ScoringService(workers=2, max_queue=3)
+    started = threading.Event()
+    holder = {}
+
+    def run():
+        loop = asyncio.new_event_loop()
+        holder["loop"] = loop
+
+        def ready(server):
+            holder["port"] = server.sockets[0].getsockname()[1]
+            started.set()
+        try:
+            loop.run_until_complete(svc.serve("127.0.0.1", 0, ready=ready))
+        except asyncio.CancelledError:
+            pass
+        # Let cancelled connection handlers unwind before the loop goes away
+        pending = asyncio.all_tasks(loop)
+        if pending:
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.close()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert started.wait(5)
+    yield svc, holder["port"]
+    def cancel_all():
+        for task in asyncio.all_tasks():
+            task.cancel()
+    holder["loop"].call_soon_threadsafe(cancel_all)
+    thread.join(5)
+    svc.executor.shutdown(wait=False)
+
+def post(conn, path, body):
+    conn.request("POST", path, json.dumps(body), {"Content-Type": "application/json"})
+    response = conn.getresponse()
+    return response, json.loads(response.read() or b"null")
+
+def test_keep_alive_serves_several_requests(service):
+    _, port = service
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    response, data = post(conn, "/analyze", {"code": "def f(x):\n    return x\n"})
+    assert response.status == 200 and response.getheader("Connection") == "keep-alive"
+    assert "origin" in data
+    conn.request("GET", "/health")
+    response = conn.getresponse()
+    assert response.status == 200 and json.loads(response.read())["requests"] == 2
+
+def test_queue_full_answers_429(service):
+    svc, port = service
+    svc.pending = svc.max_queue
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    response, data = post(conn, "/analyze", {"code": "x = 1"})
+    assert response.status == 429 and response.getheader("Retry-After") == "1"
+    svc.pending = 0
+
+def test_batch_larger_than_queue_answers_413(service):
+    _, port = service
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    submissions = [{"id": i, "code": "x = 1"} for i in range(4)]
+    response, data = post(conn, "/batch/grade", {"submissions": submissions})
+    assert response.status == 413 and "queue capacity" in data["error"]
+
+@pytest.mark.parametrize("length", ["abc", "-5", "1e3"])
+def test_bad_content_length_answers_400_and_closes(service, length):
+    svc, port = service
+    with socket.create_connection(("127.0.0.1", port), timeout=10) as sock:
+        sock.sendall(f"POST /analyze HTTP/1.1\r\nHost: x\r\nContent-Length: {length}\r\n\r\n".encode())
+        reply = b""
+        while chunk := sock.recv(4096):
+            reply += chunk
+    head = reply.split(b"\r\n\r\n", 1)[0].decode()
+    assert head.startswith("HTTP/1.1 400") and "Connection: close" in head
+    assert svc.stats["errors"] == 0
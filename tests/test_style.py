@@ -0,0 +1,33 @@
+from source import parse_source
+from style_detector import detect_level
+
+def test_tokens_are_lazy_and_cached():
+    source = parse_source("x = 1  # one\n")
+    assert source._tokens is None
+    assert source.tokens is source.tokens
+    assert any(t.string == "# one" for t in source.tokens)
+
+def test_broken_code_keeps_partial_tokens():
+    source = parse_source("x = (1,\n")
+    assert not source.ok
+    assert [t.string for t in source.tokens[:3]] == ["x", "=", "("]
+
+def test_words_in_strings_and_comments_are_not_code():
+    code = 's = "print(x) class import"  # print(y)\nt = s\n'
+    stats = {}
+    detect_level(code, stats)
+    assert "Zero debugging traces detected" in stats["origin_reasons"]
+
+    stats = {}
+    detect_level("print(1)\n", stats)
+    assert "Zero debugging traces detected" not in stats.get("origin_reasons", [])
+
+def test_comment_density_ignores_hash_in_strings():
+    code = 'a = 1\nb = """\n# not a comment\n"""\n'
+    stats = {}
+    detect_level(code, stats)
+    assert "Excessive comment density" not in stats["origin_reasons"]
+
+    stats = {}
+    detect_level("# one\n# two\na = 1\n", stats)
+    assert "Excessive comment density" in stats["origin_reasons"]
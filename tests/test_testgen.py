@@ -0,0 +1,45 @@
+import pytest
+
+from testgen import generate_test_cases, infer_input_kinds
+
+@pytest.mark.parametrize("code, kinds", [
+    # annotations win over everything else
+    ("def f(a: list[int], b: str, c: dict, d: float):\n    pass\n", ["list", "str", "dict", "float"]),
+    ("def f(xs, limit=10, sep=', ', flag=True):\n    pass\n", ["list", "int", "str", "bool"]),
+    # kind-specific method calls are strong evidence
+    ("def f(p, q, r):\n    p.split()\n    q.append(1)\n    return r.get(1)\n", ["str", "list", "dict"]),
+    # parameter names, then weak usage evidence
+    ("def two_sum(nums, target):\n    pass\n", ["list", "int"]),
+    ("def f(a, b):\n    for x in a:\n        pass\n    return range(b)\n", ["list", "int"]),
+    ("def f(a, b):\n    return a - b\n", ["int", "int"]),
+    ("class S:\n    def f(self, text):\n        return text\n", ["str"]),
+])
+def test_infer_input_kinds(code, kinds):
+    func = "f" if "def f" in code else "two_sum"
+    assert infer_input_kinds(code, func) == kinds
+
+def test_unknown_function_has_no_kinds():
+    assert infer_input_kinds("def g():\n    pass\n", "f") == []
+    assert infer_input_kinds("def f(:\n", "f") == []
+
+def test_suite_shape_and_reachable_target():
+    cases = generate_test_cases("def two_sum(nums, target):\n    pass\n", "two_sum", seed=3)
+    kinds = [c["kind"] for c in cases]
+    assert kinds.count("random") == 6 and kinds.count("stress") == 2
+    assert any(c["name"] == "Edge: empty `nums`" and c["input"][0] == [] for c in cases)
+    for case in cases:
+        if case["kind"] in ("random", "stress") and len(case["input"][0]) >= 2:
+            nums, target = case["input"]
+            seen = set()
+            assert any(target - n in seen or seen.add(n) for n in nums)
+    assert len(cases[-1]["input"][0]) == 100000
+
+def test_generation_is_seeded():
+    code = "def f(s: str, k: int):\n    pass\n"
+    assert generate_test_cases(code, "f", seed=1) == generate_test_cases(code, "f", seed=1)
+    assert generate_test_cases(code, "f", seed=1) != generate_test_cases(code, "f", seed=2)
+
+def test_script_and_zero_argument_cases():
+    assert generate_test_cases("print(1)\n", "solve")[0]["kind"] == "script"
+    assert generate_test_cases("def f():\n    pass\n", "f") == [
+        {"name": "Zero-Argument Call", "input": (), "expected": None, "kind": "edge"}]
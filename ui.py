@@ -1,15 +1,11 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime
 import base64
+import html
 import os
-import re
 import sys
-from fpdf import FPDF
-import io
-from report_gen import generate_pdf_report
+import time
+import uuid
+# pandas / plotly / fpdf are imported lazily where a tab or download needs them
 
 
 # Add the Intellicodex directory to the Python path
@@ -21,7 +17,9 @@ sys.path.append('Intellicodex')
 st.set_page_config(page_title="IntelliCodex HUD", layout="wide", page_icon="⌬")
 FROST, LAKE_SUMMIT, EVERGREEN, MORNING_FOG = "#CBDCED", "#3F778C", "#38524C", "#8FA9B5"
 
+@st.cache_resource(show_spinner=False)
 def get_base64(file_path):
+    """Encoded once per process, not on every rerun."""
     try:
         if os.path.exists(file_path):
             with open(file_path, 'rb') as f:
@@ -31,7 +29,9 @@ def get_base64(file_path):
 
 img_base64 = get_base64("logo.png")
 
-st.markdown(f"""
+@st.cache_resource(show_spinner=False)
+def base_css():
+    return f"""
     <style>
     @import url('https://fonts.googleapis.com/css2?family=Orbitron:wght@700;900&family=Fira+Code&display=swap');
     .stApp {{ background-color: #0E1117; color: {FROST}; }}
@@ -40,8 +40,14 @@ st.markdown(f"""
     .hud-label {{ color: {MORNING_FOG}; font-size: 0.75rem; text-transform: uppercase; letter-spacing: 1px; }}
     .hud-value {{ color: {FROST}; font-size: 1.6rem; font-family: 'Orbitron'; }}
     button[data-baseweb="tab"] {{ color: {MORNING_FOG} !important; font-family: 'Orbitron' !important; font-size: 16px !important; }}
+    /* Innovative "HUD" Tabs: tab bar, individual tabs, active state */
+    .stTabs [data-baseweb="tab-list"] {{ gap: 10px; background-color: rgba(56, 82, 76, 0.1); padding: 10px; border-radius: 15px; }}
+    .stTabs [data-baseweb="tab"] {{ height: 50px; background-color: #1E1E1E; border-radius: 8px; color: white; border: 1px solid {EVERGREEN}; transition: all 0.3s ease; padding: 10px 20px; }}
+    .stTabs [aria-selected="true"] {{ background-color: {EVERGREEN} !important; border-color: {LAKE_SUMMIT} !important; box-shadow: 0px 0px 15px rgba(63, 119, 140, 0.4); }}
     </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(base_css(), unsafe_allow_html=True)
 
 # ==========================================
 # 🚀 SECTION 2: SIDEBAR
@@ -80,7 +86,9 @@ with st.sidebar:
     
     # Bold Toggle Style
     ast_enabled = st.toggle("🌌 DEEP AST SCAN", value=True, help="Recursive syntax mapping")
-    stress_mode = st.toggle("⚡ STRESS TEST", value=False, help="Injected edge-case verification")
+    stress_mode = st.toggle("⚡ STRESS TEST", value=False, help="Times the function on inputs from 10 to 100k items and fits its real growth curve")
+    bench_mode = st.toggle("⏱️ PRECISION BENCHMARK", value=False, help="Warmup + calibrated repeated timing samples per test")
+    profile_mode = st.toggle("🔥 HOT-SPOT PROFILER", value=False, help="Line-level time attribution, shown as a heat-map in ARCHITECTURE")
 
     # Dynamic Engine Status Badge
     engine_color = EVERGREEN if ast_enabled else "#722F37"
@@ -96,6 +104,12 @@ with st.sidebar:
 
     # 4. EMERGENCY ACTIONS
     if st.button("🔌 EMERGENCY CORE REBOOT", use_container_width=True):
+        if st.session_state.get("scan_job"):
+            from jobs import get_default_queue
+            get_default_queue().forget(st.session_state.scan_job)
+        if st.session_state.get("result_key"):
+            from cache import get_default_store
+            get_default_store().release(st.session_state.result_key, st.session_state.session_id)
         st.session_state.clear()
         st.toast("Neural Buffers Flushed. System Rebooting...")
         st.rerun()
@@ -113,7 +127,9 @@ with st.sidebar:
 # ==========================================
 # 🎨 ENHANCED CSS: ANIMATION & GLOW
 # ==========================================
-st.markdown(f"""
+@st.cache_resource(show_spinner=False)
+def header_css():
+    return f"""
     <style>
     @keyframes gradient-move {{
         0% {{ background-position: 0% 50%; }}
@@ -196,31 +212,26 @@ st.markdown(f"""
         text-transform: uppercase;
     }}
     </style>
-""", unsafe_allow_html=True)
-def generate_pdf_report(res):
-    pdf = FPDF()
-    pdf.add_page()
-    
-    # Header logic... (same as before)
-    pdf.set_fill_color(56, 82, 76) 
-    pdf.rect(0, 0, 210, 35, 'F')
-    pdf.set_font("Arial", 'B', 18)
-    pdf.set_text_color(255, 255, 255)
-    pdf.cell(0, 20, "INTELLICODEX: NEURAL AUDIT REPORT", 0, 1, 'C')
-    
-    # Content logic... (metrics and suggestions)
-    pdf.set_y(45)
-    pdf.set_text_color(0, 0, 0)
-    pdf.set_font("Arial", 'B', 12)
-    pdf.cell(0, 10, f"Verdict: {res.get('v_str', 'N/A')}", 0, 1)
-
-    # --- THE FIX ---
-    # Most FPDF versions: dest='S' returns a string that needs encoding
-    # Some versions return bytes directly. This approach is safest:
-    pdf_output = pdf.output(dest='S')
-    if isinstance(pdf_output, str):
-        return pdf_output.encode('latin-1')
-    return bytes(pdf_output)
+"""
+
+st.markdown(header_css(), unsafe_allow_html=True)
+def render_heatmap(code, hotspots):
+    """Source listing with each line shaded by its share of profiled time."""
+    by_line = {l["line"]: l for l in hotspots["lines"]}
+    peak = max((l["percent"] for l in hotspots["lines"]), default=0) or 1
+    rows = []
+    for i, text in enumerate(code.splitlines(), start=1):
+        stat = by_line.get(i)
+        alpha = (stat["percent"] / peak) * 0.6 if stat else 0
+        note = f"{stat['percent']:.1f}% · {stat['hits']}×" if stat else ""
+        rows.append(
+            f'<div style="display:flex; background:rgba(255,75,75,{alpha:.2f});">'
+            f'<span style="width:40px; color:{MORNING_FOG}; text-align:right; padding-right:10px;">{i}</span>'
+            f'<span style="flex:1; white-space:pre; color:{FROST};">{html.escape(text)}</span>'
+            f'<span style="width:110px; color:{MORNING_FOG}; text-align:right;">{note}</span></div>'
+        )
+    return f'<div style="font-family:\'Fira Code\', monospace; font-size:0.8rem; background:#161B22; padding:10px; border-radius:6px; overflow-x:auto;">{"".join(rows)}</div>'
+
 # ==========================================
 # 🖥️ RENDER: THE DYNAMIC COMMAND HEADER
 # ==========================================
@@ -241,59 +252,94 @@ else:
 # ⚙️ SECTION 3: NEURAL ENGINE
 # ==========================================
 try:
-    from analyzer import analyze_logic 
-    from executor import run_behavioral_audit, generate_dynamic_test_cases
-    from grader import calculate_score, get_final_verdict
-    from suggestions import get_suggestions
+    from engine import get_final_verdict
+    from engine import scan_variant
+    from cache import get_default_store, source_key
+    from jobs import get_default_queue, JobLimitExceeded
 except ImportError:
     st.error("Missing Backend Logic Files.")
     st.stop()
 
+# Scans run as background jobs so a slow submission never blocks this session (or anyone else's)
+scan_queue = get_default_queue()
+# Finished results live once per process; this session only holds a key into the store
+result_store = get_default_store()
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+
 code_input = st.text_area("📥 Neural Input Buffer", height=200, placeholder="Inject code for audit...")
+with st.expander("🧬 REFERENCE SOLUTION (optional differential check)"):
+    reference_input = st.text_area("Known-good implementation", height=150, placeholder="def solve(...): ...",
+                                   help="Every generated test (edge, random and stress inputs) is checked against this solution's output")
 
 if st.button("⚡ EXECUTE NEURAL SCAN", use_container_width=True, type="primary"):
     if code_input.strip():
-        # 1. STATIC ANALYSIS: Get the "Skeleton" of the code
-        analysis = analyze_logic(code_input)
-        
-        # 2. FUNCTION EXTRACTION: Find the entry point
-        f_name = re.search(r'def (\w+)\(', code_input).group(1) if "def" in code_input else "solve"
-        
-        # 3. BEHAVIORAL AUDIT: Run the tests in the sandbox
-        test_cases = generate_dynamic_test_cases(code_input, f_name)
-        behavior, accuracy = run_behavioral_audit(code_input, test_cases)
-        
-        # 4. NEURAL GRADING: Calculate the score using BOTH static and behavioral data
-        # Passing accuracy (behavior_accuracy) ensures the grade reflects if the code actually works
-        grades = calculate_score(code_input, analysis, behavior_accuracy=accuracy)
-        
-        # 5. VERDICT MAPPING: Resolve the Import/Name Errors for v_str and v_desc
-        # We use the grades dictionary we just created
-        v_str, v_color, v_desc = get_final_verdict(grades, {"level_color": LAKE_SUMMIT})
-        
-        # 6. SESSION PERSISTENCE: Save everything to prevent UI resets
-        st.session_state.results = {
-            "origin": analysis, 
-            "behavior": behavior, 
-            "accuracy": accuracy, 
-            "grades": grades,
-            "v_str": v_str, 
-            "v_desc": v_desc, 
-            "v_color": v_color, # Store the color too!
-            "code": code_input,
-            "suggs": get_suggestions(analysis), # Pass the analysis object here
-            "complexity": grades.get("complexity", "O(N)"),
-            "memory": grades.get("memory", "4.2 MB")
-        }
-        
-        # 7. UI REFRESH
+        # 1-4. ANALYSIS, BEHAVIORAL AUDIT & GRADING: Served from the result cache when this source was seen before
+        try:
+            st.session_state.scan_job = scan_queue.submit(
+                code_input,
+                user=st.session_state.session_id,
+                benchmark=bench_mode,
+                empirical=stress_mode,
+                profile=profile_mode,
+                reference=reference_input
+            )
+            st.session_state.scan_key = source_key(
+                code_input, variant=scan_variant(bench_mode, stress_mode, profile_mode, reference_input) + ",ui"
+            )
+        except JobLimitExceeded as e:
+            st.warning(f"⏳ {e}. Cancel the running scan or wait for it to finish.")
+
+if st.session_state.get("scan_job"):
+    job = scan_queue.status(st.session_state.scan_job)
+    if job is None:
+        st.session_state.pop("scan_job")
+    elif job["state"] in ("queued", "running"):
+        # Behavioral verdicts stream into the live trace as each test case completes
+        label = "⏳ Neural Trace Queued..." if job["state"] == "queued" else f"⚙️ Running Neural Trace... ({job['elapsed']:.1f}s)"
+        with st.status(label, expanded=True):
+            for r in job["trace"]:
+                st.write(f"{r['verdict']} · TEST CASE 0{r['index']+1}: {r['scenario']} ({r.get('runtime', 'n/a')})")
+            if st.button("🛑 ABORT SCAN", use_container_width=True):
+                scan_queue.cancel(job["id"])
+        time.sleep(0.4)
         st.rerun()
+    else:
+        st.session_state.pop("scan_job")
+        scan_queue.forget(job["id"])
+        if job["state"] == "done":
+            scan = job["result"]
+
+            # 5. VERDICT MAPPING: Resolve the Import/Name Errors for v_str and v_desc
+            v_str, v_color, v_desc = get_final_verdict(scan.grades, {"level_color": LAKE_SUMMIT})
+
+            # 6. SESSION PERSISTENCE: Save everything to prevent UI resets
+            # (a fresh record so the cached scan itself is never mutated; sessions scanning the same
+            # source with the same options share one stored copy)
+            key = st.session_state.pop("scan_key")
+            result_store.put(key, scan.replace(v_str=v_str, v_desc=v_desc, v_color=v_color),
+                             holder=st.session_state.session_id)
+            previous = st.session_state.get("result_key")
+            if previous and previous != key:
+                result_store.release(previous, st.session_state.session_id)
+            st.session_state.result_key = key
+
+            # 7. UI REFRESH
+            st.rerun()
+        elif job["state"] == "cancelled":
+            st.info("🛑 Neural scan aborted.")
+        else:
+            st.error(f"Neural scan failed: {job['error']}")
     
 # ==========================================
 # 📊 SECTION 4: GENUINE DYNAMIC DASHBOARD
 # ==========================================
-if st.session_state.get('results'):
-    res = st.session_state.results
+res = result_store.get(st.session_state.result_key) if st.session_state.get("result_key") else None
+if st.session_state.get("result_key") and res is None:
+    # Evicted under memory pressure
+    st.session_state.pop("result_key")
+    st.info("♻️ This scan result expired from the shared buffer. Run the scan again to restore it.")
+if res:
     
     # --- 1. DEFINING THE NOVEMBER PALETTE (FROM IMAGE) ---
     # Mapping exact hex codes provided in image_4100e4.jpg
@@ -322,7 +368,7 @@ if st.session_state.get('results'):
     m1, m2, m3, m4 = st.columns(4)
     with m1: st.markdown(f'<div class="hud-card"><p class="hud-label">Time Complexity</p><p class="hud-value">{res.get("complexity", "O(N)")}</p></div>', unsafe_allow_html=True)
     with m2: st.markdown(f'<div class="hud-card"><p class="hud-label">Neural Stability</p><p class="hud-value">{acc}%</p></div>', unsafe_allow_html=True)
-    with m3: st.markdown(f'<div class="hud-card"><p class="hud-label">Memory Footprint</p><p class="hud-value">{res.get("memory", "4.2 MB")}</p></div>', unsafe_allow_html=True)
+    with m3: st.markdown(f'<div class="hud-card"><p class="hud-label">Memory Footprint</p><p class="hud-value">{res.get("memory", "N/A")}</p></div>', unsafe_allow_html=True)
     with m4:
         # Final Verdict side-accent box
         vl, vr = st.columns([0.65, 0.35])
@@ -338,38 +384,7 @@ if st.session_state.get('results'):
 
     st.divider()
 
-    # --- 3. DYNAMIC ANALYSIS TABS ---
-    # Custom CSS for Innovative "HUD" Tabs
-    st.markdown("""
-    <style>
-       /* Styling the Tab Bar */
-         .stTabs [data-baseweb="tab-list"] {
-          gap: 10px;
-          background-color: rgba(56, 82, 76, 0.1); /* Evergreen Tint */
-          padding: 10px;
-          border-radius: 15px;
-        }
-
-        /* Styling Individual Tabs */
-        .stTabs [data-baseweb="tab"] {
-           height: 50px;
-           background-color: #1E1E1E;
-           border-radius: 8px;
-           color: white;
-           border: 1px solid #38524C; /* Evergreen Border */
-           transition: all 0.3s ease;
-           padding: 10px 20px;
-        }
-
-        /* Hover and Active State */
-       .stTabs [aria-selected="true"] {
-           background-color: #38524C !important;
-           border-color: #3F778C !important; /* Lake Summit glow */
-           box-shadow: 0px 0px 15px rgba(63, 119, 140, 0.4);
-        }
-        </style>
-        """, unsafe_allow_html=True)
-
+    # --- 3. DYNAMIC ANALYSIS TABS (styled by base_css) ---
     # Define the Innovative Tabs
     t_origin, t_struct, t_behav, t_roadmap = st.tabs([
      "🤖 NEURAL ORIGIN", 
@@ -387,6 +402,7 @@ if st.session_state.get('results'):
             user_vals = [acc, 95 if "O(1)" in res['complexity'] else 75, 85, res['origin'].get('health', 80), 90]
             industry_vals = [70, 75, 65, 75, 70]
             
+            import plotly.graph_objects as go
             fig_radar = go.Figure()
             
             # Layer 1: Industry Baseline (Subtle)
@@ -436,20 +452,27 @@ if st.session_state.get('results'):
         sc1, sc2 = st.columns([1, 2])
         
         with sc1:
-            ast_data = res['origin'].get('node_counts', {"Logic": 5, "Architecture": 2, "Data Flow": 4})
-            df_pie = pd.DataFrame({"Node": list(ast_data.keys()), "Count": list(ast_data.values())})
+            # Real AST histogram counted during the analyzer's single pass
+            ast_data = res['origin'].get('node_counts', {})
             
             # Map colors from your November Palette
-            struct_colors = [EVERGREEN, LAKE_SUMMIT, MORNING_FOG, "#6587A1"]
-            fig_pie = px.pie(df_pie, names='Node', values='Count', hole=0.6, color_discrete_sequence=struct_colors)
-            fig_pie.update_layout(showlegend=False, paper_bgcolor='rgba(0,0,0,0)', margin=dict(t=0,b=0,l=0,r=0))
-            st.plotly_chart(fig_pie, use_container_width=True)
+            struct_colors = [EVERGREEN, LAKE_SUMMIT, MORNING_FOG, "#6587A1", "#722F37"]
+            if any(ast_data.values()):
+                import plotly.graph_objects as go
+                fig_pie = go.Figure(go.Pie(labels=list(ast_data.keys()), values=list(ast_data.values()), hole=0.6,
+                                           marker=dict(colors=struct_colors), sort=False))
+                fig_pie.update_layout(showlegend=False, paper_bgcolor='rgba(0,0,0,0)', margin=dict(t=0,b=0,l=0,r=0))
+                st.plotly_chart(fig_pie, use_container_width=True)
+            else:
+                st.info("No structural nodes to chart.")
             
             st.markdown("#### 🛰️ Architecture Key")
             mapping = [
-                ("Neural Logic", EVERGREEN, "The 'Brain' (Loops, Conditionals)"),
-                ("Architecture", LAKE_SUMMIT, "The 'Skeleton' (Functions, Classes)"),
-                ("Data Flow", MORNING_FOG, "The 'Blood' (Variables, Math)")
+                ("Control Flow", EVERGREEN, "The 'Brain' (Branches, Loops, Returns)"),
+                ("Definitions", LAKE_SUMMIT, "The 'Skeleton' (Functions, Classes, Imports)"),
+                ("Data Ops", MORNING_FOG, "The 'Blood' (Assignments, Collections, Math)"),
+                ("Calls", "#6587A1", "The 'Nerves' (Function & Method Calls)"),
+                ("Comprehensions", "#722F37", "The 'Reflexes' (List/Set/Dict Comprehensions)")
             ]
             for label, color, desc in mapping:
                 st.markdown(f"""
@@ -464,23 +487,35 @@ if st.session_state.get('results'):
         with sc2:
             st.markdown("#### 📖 Understanding the Structure")
             st.markdown(f"""
-            This chart breaks your code into **Functional Blocks**:
-            - **Logic (Green)**: Decision-making density.
-            - **Architecture (Blue)**: How well-organized your structural definitions are.
-            - **Data Flow (Grey)**: How much information movement is occurring.
+            This chart breaks your code into **Functional Blocks** (AST node counts):
+            - **Control Flow (Green)**: Decision-making density.
+            - **Definitions (Blue)**: How well-organized your structural definitions are.
+            - **Data Ops (Grey)**: How much information movement is occurring.
+            - **Calls / Comprehensions**: How much work is delegated or expressed declaratively.
             """)
-            st.code(res['code'], language="python")
+            function_nodes = res['origin'].get('function_nodes', {})
+            if function_nodes:
+                st.markdown("#### 🧬 Per-Function Breakdown")
+                st.dataframe([{"Function": name, **counts, "Total": sum(counts.values())}
+                              for name, counts in function_nodes.items()],
+                             use_container_width=True, hide_index=True)
+            hotspots = res.get('hotspots')
+            if hotspots and hotspots.get('lines'):
+                st.markdown(f"#### 🔥 Execution Heat-Map ({hotspots['total_ms']:.2f}ms via {hotspots['backend']})")
+                st.markdown(render_heatmap(res['code'], hotspots), unsafe_allow_html=True)
+                st.dataframe(hotspots['functions'], use_container_width=True, hide_index=True)
+            else:
+                st.code(res['code'], language="python")
    
     #st.subheader("📥 Export Neural Documentation")
     with t_roadmap:
-     res = st.session_state.get('results', None)
      if res:
         # --- TOP LEVEL: NEURAL EVOLUTION STRATEGY ---
         st.markdown("## 🛰️ Neural Evolution Strategy")
         st.caption("A multi-phased path to transform your code from its current state to Elite status.")
 
          # Calculate dynamic grade based on pass rate
-        pass_count = len([x for x in res['behavior'] if x.get('status') == 'PASS'])
+        pass_count = sum(1 for x in res.behavior if x.passed)
         total_tests = len(res['behavior'])
         pass_rate = (pass_count / total_tests) * 100 if total_tests > 0 else 0
         current_grade = "A+" if pass_rate == 100 else ("A" if pass_rate > 80 else "B")
@@ -499,6 +534,11 @@ if st.session_state.get('results'):
         with st.expander("🧠 PHASE 2: Logic Optimization", expanded=True):
             st.write("Focus on Big O complexity and computational efficiency.")
             st.success(f"✅ Logical brain is efficient: Scaling at {res.get('complexity', 'O(N)')}.")
+            scaling = res.get('empirical_complexity')
+            if scaling and scaling.get('best_fit'):
+                st.info(f"📈 Measured scaling: **{scaling['best_fit']}** ({int(scaling['confidence'] * 100)}% confidence) vs static estimate {scaling.get('static_estimate') or 'N/A'} — sizes {', '.join(str(n) for n, _ in scaling['points'])}")
+            elif scaling:
+                st.warning(f"📈 Empirical scaling unavailable: {scaling.get('error') or 'not enough data points'}")
 
         with st.expander("✨ PHASE 3: Elite Readability", expanded=True):
             st.write("Focus on the 'human' side: Documentation and clear naming.")
@@ -516,18 +556,29 @@ if st.session_state.get('results'):
         # --- BOTTOM: PDF DOWNLOAD ---
         st.divider()
         st.subheader("📥 Export Full Neural Audit")
+        # Rendered once per stored result (not on every rerun) and shared by every session holding it
+        result_key = st.session_state.result_key
+        from report_gen import generate_pdf_report, generate_html_report, generate_json_report
         try:
-            from report_gen import generate_pdf_report
-            pdf_bytes = generate_pdf_report(res)
+            pdf_data = result_store.artifact(result_key, "pdf", generate_pdf_report) or generate_pdf_report(res)
             st.download_button(
                 label="📄 DOWNLOAD COMPLETE PDF REPORT",
-                data=pdf_bytes,
+                data=pdf_data,
                 file_name=f"IntelliCodex_Audit_{res.get('v_str')}.pdf",
                 mime="application/pdf",
                 use_container_width=True
             )
         except Exception as e:
             st.error(f"Report Engine Error: {e}")
+        dl_html, dl_json = st.columns(2)
+        with dl_html:
+            html_data = result_store.artifact(result_key, "html", generate_html_report) or generate_html_report(res)
+            st.download_button("🌐 HTML REPORT", data=html_data, file_name=f"IntelliCodex_Audit_{res.get('v_str')}.html",
+                               mime="text/html", use_container_width=True)
+        with dl_json:
+            json_data = result_store.artifact(result_key, "json", generate_json_report) or generate_json_report(res)
+            st.download_button("🧾 JSON REPORT", data=json_data, file_name=f"IntelliCodex_Audit_{res.get('v_str')}.json",
+                               mime="application/json", use_container_width=True)
      else:
         st.info("🛰️ Awaiting Neural Scan...")
     #  INTERACTIVE TEST CASE CARDS
@@ -536,18 +587,18 @@ if st.session_state.get('results'):
     
     if res['behavior']:
         for i, test in enumerate(res['behavior']):
-            status = test.get('status', 'PASS')
-            icon = "✅" if status == "PASS" else "❌"
-            border_color = EVERGREEN if status == "PASS" else "#722F37"
+            passed = test.passed
+            icon = "✅" if passed else "❌"
+            border_color = EVERGREEN if passed else "#722F37"
             
-            with st.expander(f"{icon} TEST CASE 0{i+1}: {test.get('input', 'Generic Vector')}"):
+            with st.expander(f"{icon} TEST CASE 0{i+1}: {test.scenario or 'Generic Vector'}"):
                 c1, c2 = st.columns([2, 1])
                 with c1:
-                    st.markdown(f"**Expected Logic Flow:** `{test.get('expected', 'N/A')}`")
-                    st.markdown(f"**Actual Neural Output:** `{test.get('actual', 'N/A')}`")
+                    st.markdown(f"**Expected Logic Flow:** `{test.expected or 'N/A'}`")
+                    st.markdown(f"**Actual Neural Output:** `{test.output or 'N/A'}`")
                 with c2:
                     # Provide an AI-based suggestion for this SPECIFIC test case
-                    if status == "PASS":
+                    if passed:
                         st.success("Optimal Performance")
                         st.caption("No logic leaks detected in this branch.")
                     else:
@@ -555,7 +606,16 @@ if st.session_state.get('results'):
                         st.caption("Check for edge-case overflow or type-safety.")
                 
                 # Performance Pulse for this specific test
-                st.progress(100 if status == "PASS" else 40)
+                st.progress(100 if passed else 40)
+                bench = test.get('benchmark')
+                if bench:
+                    st.caption(f"⏱️ median {bench['median_ms']:.4f}ms · p95 {bench['p95_ms']:.4f}ms · min {bench['min_ms']:.4f}ms · σ {bench['stdev_ms']:.4f}ms ({bench['repeat']}×{bench['iterations']} runs)")
+                elif test.get('runtime'):
+                    st.caption(f"⏱️ single sample {test['runtime']}")
+                mem = test.get('memory')
+                if mem:
+                    hot = ", ".join(f"L{site['line']} ({site['size_kb']} KB)" for site in mem.get('top_sites', [])) or "none"
+                    st.caption(f"🧠 peak alloc {mem.get('peak_kb', 'N/A')} KB · RSS growth {mem.get('peak_rss_kb', 'N/A')} KB · top sites: {hot}")
     else:
         st.warning("No behavior data detected.")
 
@@ -568,18 +628,20 @@ if st.session_state.get('results'):
         with bm1: 
             st.metric("Neural Stability", f"{res['accuracy']}%", delta="Verified")
         with bm2: 
-            pass_count = len([x for x in res['behavior'] if x.get('status') == 'PASS'])
+            pass_count = sum(1 for x in res.behavior if x.passed)
             total_tests = len(res['behavior'])
             st.metric("Logic Pass Rate", f"{pass_count}/{total_tests}")
         with bm3: 
-            st.metric("Execution Latency", "0.02ms", delta="-0.01ms")
+            latency = res.get('latency')
+            st.metric("Execution Latency", f"{latency['median_ms']:.4f}ms" if latency else "N/A",
+                      delta=f"p95 {latency['p95_ms']:.4f}ms" if latency else None, delta_color="off")
 
         st.divider()
     # 1. TOP-LEVEL PERFORMANCE HUD
     # We show the "Final Verdict" of the tests immediately
     bh_1, bh_2, bh_3 = st.columns(3)
     
-    pass_count = len([x for x in res['behavior'] if x.get('status') == 'PASS'])
+    pass_count = sum(1 for x in res.behavior if x.passed)
     total_tests = len(res['behavior'])
     pass_rate = (pass_count / total_tests) * 100 if total_tests > 0 else 0
     
@@ -607,8 +669,8 @@ if st.session_state.get('results'):
         st.markdown(f"""
             <div style="background: rgba(255, 255, 255, 0.05); border-radius: 10px; padding: 20px; border: 1px solid {MORNING_FOG}; text-align: center;">
                 <p style="color:{MORNING_FOG}; font-size: 0.8rem; margin-bottom: 5px;">EXECUTION LATENCY</p>
-                <h2 style="color:{FROST}; margin: 0;">0.02ms</h2>
-                <p style="color:{LAKE_SUMMIT}; font-size: 0.7rem; margin-top: 5px;">OPTIMIZED O(1)</p>
+                <h2 style="color:{FROST}; margin: 0;">{f"{res['latency']['median_ms']:.4f}ms" if res.get('latency') else "N/A"}</h2>
+                <p style="color:{LAKE_SUMMIT}; font-size: 0.7rem; margin-top: 5px;">{"BENCHMARKED MEDIAN" if (res.get('latency') or {}).get('benchmarked') else "SINGLE SAMPLE"}</p>
             </div>
         """, unsafe_allow_html=True)
 